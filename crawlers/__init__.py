@@ -1,8 +1,22 @@
 # 爬虫模块
-from .base import BaseCrawler, Article
-from .sogou_wechat import SogouWechatCrawler
-from .xhs_crawler import XHSCrawler
-from .wechat_mp import WechatMPCrawler
+from .base import BaseCrawler, Article, ArticleBatch
 
-__all__ = ['BaseCrawler', 'Article', 'SogouWechatCrawler', 'XHSCrawler', 'WechatMPCrawler']
+# 具体爬虫按需导入（PEP 562），避免只用到其中一个时也加载 lxml / Playwright
+_LAZY_CRAWLERS = {
+    'SogouWechatCrawler': '.sogou_wechat',
+    'XHSCrawler': '.xhs_crawler',
+    'WechatMPCrawler': '.wechat_mp',
+}
 
+
+def __getattr__(name):
+    if name in _LAZY_CRAWLERS:
+        import importlib
+        module = importlib.import_module(_LAZY_CRAWLERS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['BaseCrawler', 'Article', 'ArticleBatch', 'SogouWechatCrawler', 'XHSCrawler', 'WechatMPCrawler']
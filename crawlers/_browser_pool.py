@@ -0,0 +1,81 @@
+"""
+Playwright 浏览器复用池
+同一线程内的多个爬虫实例共享一个已启动的 Chromium，每个爬虫只创建自己的 BrowserContext
+
+Playwright 同步API的对象只能在创建它的线程中使用，因此按线程分别维护
+"""
+import atexit
+import logging
+import threading
+
+from playwright.sync_api import sync_playwright, Browser
+
+logger = logging.getLogger(__name__)
+
+LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+]
+
+
+class _BrowserRegistry:
+    """按 (线程, headless/CDP地址) 缓存已启动或已连接的浏览器"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 线程ID -> {"playwright": Playwright, "browsers": {headless 或 CDP地址: Browser}}
+        self._entries = {}
+
+    def get_browser(self, headless: bool, cdp_endpoint: str = None) -> Browser:
+        """
+        获取当前线程下的共享浏览器，不存在或已断开时启动（或连接）一个
+
+        Args:
+            headless: 是否无头模式
+            cdp_endpoint: 外部常驻 Chromium 的 CDP 地址，设置后通过 connect_over_cdp 连接而不是启动新进程
+        """
+        thread_id = threading.get_ident()
+        with self._lock:
+            entry = self._entries.get(thread_id)
+
+        if entry is None:
+            entry = {"playwright": sync_playwright().start(), "browsers": {}}
+            with self._lock:
+                self._entries[thread_id] = entry
+
+        key = cdp_endpoint or headless
+        browser = entry["browsers"].get(key)
+        if browser is None or not browser.is_connected():
+            if cdp_endpoint:
+                browser = entry["playwright"].chromium.connect_over_cdp(cdp_endpoint)
+            else:
+                browser = entry["playwright"].chromium.launch(headless=headless, args=LAUNCH_ARGS)
+            entry["browsers"][key] = browser
+        return browser
+
+    def release_current_thread(self):
+        """关闭当前线程的所有浏览器并停止 Playwright（后台线程结束前调用；CDP 连接只断开，不关闭外部浏览器）"""
+        with self._lock:
+            entry = self._entries.pop(threading.get_ident(), None)
+        if entry is None:
+            return
+
+        for browser in entry["browsers"].values():
+            try:
+                browser.close()
+            except Exception as e:
+                logger.debug(f"关闭浏览器失败: {e}")
+        try:
+            entry["playwright"].stop()
+        except Exception as e:
+            logger.debug(f"停止Playwright失败: {e}")
+
+
+_registry = _BrowserRegistry()
+
+get_browser = _registry.get_browser
+release_browsers = _registry.release_current_thread
+
+# 进程退出时关闭主线程的浏览器；其他线程的浏览器随 Playwright 驱动进程一起退出
+atexit.register(release_browsers)
@@ -0,0 +1,25 @@
+"""
+Cookie 文件读写
+以紧凑JSON保存 Playwright 的 cookies，优先使用 orjson
+"""
+import json
+
+# 可选依赖：更快的JSON序列化
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_cookies(cookies: list) -> bytes:
+    """序列化cookies（紧凑JSON，优先使用orjson）"""
+    if orjson is not None:
+        return orjson.dumps(cookies)
+    return json.dumps(cookies, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads_cookies(data: bytes) -> list:
+    """反序列化cookies（兼容旧版带缩进的JSON文件）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
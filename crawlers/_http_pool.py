@@ -0,0 +1,30 @@
+"""
+HTTP 连接池复用
+进程内所有爬虫的 requests.Session 挂载同一个 HTTPAdapter，
+每次采集新建爬虫实例时仍可复用已建立的 TCP/TLS 长连接（cookies 仍按会话各自维护）
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# urllib3 的连接池本身线程安全，可在多个会话、多个线程间共享
+_adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+    ),
+)
+
+
+def mount_shared_pool(session: requests.Session) -> requests.Session:
+    """
+    为会话挂载共享连接池（限流/服务端错误自动重试）
+
+    挂载后不要调用 session.close()，否则会关闭其他会话正在复用的连接
+    """
+    session.mount("http://", _adapter)
+    session.mount("https://", _adapter)
+    return session
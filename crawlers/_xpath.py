@@ -0,0 +1,55 @@
+"""
+lxml XPath 辅助工具
+供基于搜狗微信搜索结果页的爬虫共用
+"""
+from lxml import etree
+
+
+def _has_class(name: str) -> str:
+    """XPath 版的 CSS 类选择器（.name）"""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+class _PrioritySelector:
+    """
+    多个按优先级排列的元素条件合并成一次子树遍历
+    
+    先用所有条件的并集一次性取出候选元素（文档顺序），
+    再按优先级逐个条件在候选中找第一个匹配项，
+    结果与"依次对每个选择器执行 select_one"一致。
+    """
+    
+    def __init__(self, tests):
+        """
+        Args:
+            tests: 以当前元素为上下文的 XPath 条件（self::...），按优先级排列
+        """
+        self.tests = tuple(tests)
+        self.combined = etree.XPath(
+            ".//*[" + " or ".join(f"({t})" for t in self.tests) + "]"
+        )
+        self._tests = tuple(etree.XPath(f"boolean({t})") for t in self.tests)
+    
+    def candidates(self, item):
+        """按优先级依次产出 (条件, 该条件匹配的第一个元素)"""
+        found = self.combined(item)
+        if not found:
+            return
+        for test, matches in zip(self.tests, self._tests):
+            elem = next((e for e in found if matches(e)), None)
+            if elem is not None:
+                yield test, elem
+
+
+def _first(item, xpaths):
+    """按优先级返回第一个匹配的元素"""
+    for xpath in xpaths:
+        found = xpath(item)
+        if found:
+            return found[0]
+    return None
+
+
+def _text(elem) -> str:
+    """等价于 BeautifulSoup 的 get_text(strip=True)"""
+    return "".join(part.strip() for part in elem.itertext())
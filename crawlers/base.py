@@ -3,9 +3,12 @@
 定义所有爬虫的通用接口和方法
 """
 from abc import ABC, abstractmethod
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterator, List, Optional
+import math
 import time
 import logging
 
@@ -13,7 +16,8 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# slots 需要 Python 3.10+（项目最低支持版本）
+@dataclass(slots=True)
 class Article:
     """文章/帖子数据模型"""
     title: str                          # 标题
@@ -47,11 +51,77 @@ class Article:
             "comments": self.comments,
             "shares": self.shares,
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "Article":
+        """从 to_dict 的结果还原文章对象"""
+        data = dict(data)
+        published_at = data.get("published_at")
+        data["published_at"] = datetime.fromisoformat(published_at) if published_at else None
+        crawled_at = data.pop("crawled_at", None)
+        if crawled_at:
+            data["crawled_at"] = datetime.fromisoformat(crawled_at)
+        return cls(**data)
+
+
+class ArticleBatch:
+    """
+    文章的列式（结构数组）视图
+    
+    把批量处理时需要逐列访问的字段存为连续数组，
+    例如发布时间统一转换为时间戳数组，时间过滤只需比较浮点数。
+    """
+    
+    __slots__ = ("articles", "published_ts")
+    
+    def __init__(self, articles: List[Article]):
+        """
+        Args:
+            articles: 文章列表
+        """
+        self.articles = list(articles)
+        # 无发布时间的文章记为 NaN
+        self.published_ts = array("d", (
+            a.published_at.timestamp() if a.published_at else math.nan
+            for a in self.articles
+        ))
+    
+    def __len__(self) -> int:
+        return len(self.articles)
+    
+    def missing_published_count(self) -> int:
+        """无发布时间的文章数"""
+        return sum(1 for ts in self.published_ts if ts != ts)
+    
+    def published_after_mask(self, cutoff: datetime, keep_missing: bool = True) -> List[bool]:
+        """
+        生成"发布时间晚于cutoff"的掩码
+        
+        Args:
+            cutoff: 截止时间
+            keep_missing: 无发布时间的文章是否保留
+        """
+        cutoff_ts = cutoff.timestamp()
+        return [
+            keep_missing if ts != ts else ts > cutoff_ts
+            for ts in self.published_ts
+        ]
+    
+    def select(self, mask: List[bool]) -> List[Article]:
+        """按掩码取出文章"""
+        return [a for a, keep in zip(self.articles, mask) if keep]
+    
+    def to_article_list(self) -> List[Article]:
+        """转换回文章列表"""
+        return list(self.articles)
 
 
 class BaseCrawler(ABC):
     """爬虫基类"""
     
+    # search_multiple 的关键词并发数，基于浏览器的爬虫（Playwright同步API非线程安全）保持为1
+    max_concurrency: int = 1
+    
     def __init__(self, request_delay: float = 3.0):
         """
         初始化爬虫
@@ -86,6 +156,9 @@ class BaseCrawler(ABC):
         """
         搜索多个关键词
         
+        max_concurrency > 1 时各关键词在线程池中并发搜索，
+        结果按关键词顺序合并后统一去重。
+        
         Args:
             keywords: 关键词列表
             max_pages: 每个关键词的最大搜索页数
@@ -93,28 +166,87 @@ class BaseCrawler(ABC):
         Returns:
             所有文章列表（已去重）
         """
-        all_articles = []
+        workers = min(self.max_concurrency, len(keywords))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    lambda kw: self._search_keyword(kw, max_pages), keywords
+                ))
+        else:
+            results = [self._search_keyword(kw, max_pages) for kw in keywords]
+        
+        return self._merge_results(results)
+    
+    def iter_search_multiple(self, keywords: List[str], max_pages: int = 3) -> Iterator[List[Article]]:
+        """
+        按关键词顺序逐批产出搜索结果，供调用方边采集边处理
+        
+        max_concurrency > 1 时所有关键词提交到线程池，调用方处理当前批次时后续关键词仍在采集；
+        否则在调用方线程中依次搜索（基于浏览器的爬虫不能跨线程使用）。
+        每批只包含之前批次未出现过的文章，全部产出后的并集与 search_multiple 的结果相同
+        
+        Args:
+            keywords: 关键词列表
+            max_pages: 每个关键词的最大搜索页数
+            
+        Yields:
+            每个关键词新增的文章列表
+        """
         seen_urls = set()
+        total = 0
+        
+        workers = min(self.max_concurrency, len(keywords))
+        if workers > 1:
+            executor = ThreadPoolExecutor(max_workers=workers)
+            futures = [executor.submit(self._search_keyword, kw, max_pages) for kw in keywords]
+            results = (future.result() for future in futures)
+        else:
+            executor = None
+            results = (self._search_keyword(kw, max_pages) for kw in keywords)
         
-        for keyword in keywords:
-            self.logger.info(f"正在搜索关键词: {keyword}")
-            try:
-                articles = self.search(keyword, max_pages)
-                for article in articles:
-                    if article.url not in seen_urls:
-                        seen_urls.add(article.url)
-                        all_articles.append(article)
-                        
-                # 关键词之间的间隔
-                time.sleep(self.request_delay)
-                
-            except Exception as e:
-                self.logger.error(f"搜索关键词 '{keyword}' 时出错: {e}")
-                continue
+        try:
+            for articles in results:
+                batch = self._dedup_batch(articles, seen_urls)
+                total += len(batch)
+                yield batch
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+        
+        self.logger.info(f"共采集到 {total} 条不重复内容")
+    
+    def _merge_results(self, results: List[List[Article]]) -> List[Article]:
+        """按关键词顺序合并各关键词的结果并按URL去重"""
+        all_articles = []
+        seen_urls = set()
+        for articles in results:
+            all_articles.extend(self._dedup_batch(articles, seen_urls))
         
         self.logger.info(f"共采集到 {len(all_articles)} 条不重复内容")
         return all_articles
     
+    @staticmethod
+    def _dedup_batch(articles: List[Article], seen_urls: set) -> List[Article]:
+        """过滤掉本次已出现过的文章（URL记入 seen_urls）"""
+        batch = []
+        for article in articles:
+            if article.url not in seen_urls:
+                seen_urls.add(article.url)
+                batch.append(article)
+        return batch
+    
+    def _search_keyword(self, keyword: str, max_pages: int) -> List[Article]:
+        """搜索单个关键词，出错时返回空列表"""
+        self.logger.info(f"正在搜索关键词: {keyword}")
+        try:
+            articles = self.search(keyword, max_pages)
+            # 关键词之间的间隔
+            self._sleep()
+            return articles
+        except Exception as e:
+            self.logger.error(f"搜索关键词 '{keyword}' 时出错: {e}")
+            return []
+    
     def _sleep(self):
         """请求间隔"""
         time.sleep(self.request_delay)
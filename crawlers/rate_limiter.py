@@ -0,0 +1,46 @@
+"""
+自适应速率限制器
+按 AIMD 策略调整请求速率：请求正常时缓慢提速，被限流时减半
+"""
+import threading
+import time
+
+
+class AdaptiveRateLimiter:
+    """线程安全的自适应速率限制器（令牌桶容量为1，即请求均匀间隔）"""
+
+    def __init__(self, rate: float, min_rate: float = None, max_rate: float = None):
+        """
+        初始化速率限制器
+
+        Args:
+            rate: 初始速率（次/秒）
+            min_rate: 速率下限，默认为初始速率的1/8
+            max_rate: 速率上限，默认为初始速率的2倍
+        """
+        self.rate = rate
+        self.min_rate = min_rate or rate / 8
+        self.max_rate = max_rate or rate * 2
+        # 每次成功请求的加性增量，约20次成功请求提速一倍
+        self.increase = rate / 20
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def acquire(self):
+        """等待直到允许发出下一个请求"""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next_time - now)
+            self._next_time = max(now, self._next_time) + 1.0 / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self):
+        """请求正常，加性提速"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        """被限流或请求失败，乘性降速"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
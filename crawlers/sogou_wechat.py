@@ -2,17 +2,119 @@
 搜狗微信搜索爬虫
 通过搜狗微信搜索获取公众号文章
 """
+import hashlib
+import logging
 import re
 import time
-import random
-from datetime import datetime
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+from http.cookiejar import LWPCookieJar
+from pathlib import Path
+from typing import Iterator, List, Optional
 from urllib.parse import quote, urljoin
 
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 
 from .base import BaseCrawler, Article
+from ._http_pool import mount_shared_pool
+from ._xpath import _has_class, _PrioritySelector, _first, _text
+from .rate_limiter import AdaptiveRateLimiter
+from utils.runtime_dir import get_runtime_data_dir
+
+logger = logging.getLogger(__name__)
+
+
+_DIGITS_RE = re.compile(r'\d+')
+# 时间字符串特征（小时前/天前/分钟前/秒前/年/月/日/-），单次扫描匹配全部
+_TIME_STRING_RE = re.compile(r'小时前|天前|分钟前|秒前|[年月日-]')
+# 日期分隔符统一为"-"：YYYY年MM月DD日 / YYYY/MM/DD -> YYYY-MM-DD
+_DATE_SEP_NORM = str.maketrans({'年': '-', '月': '-', '日': '', '/': '-'})
+_ABS_DATE_RE = re.compile(r'(?:(\d{4})-)?(\d{1,2})-(\d{1,2})')
+
+# 相对时间后缀 -> timedelta 参数名
+_RELATIVE_UNITS = {
+    "秒前": "seconds",
+    "分钟前": "minutes",
+    "小时前": "hours",
+    "天前": "days",
+}
+
+# 搜索结果列表（XPath 在 libxml2 中执行，不构建 Python 层的 DOM 对象）
+_NEWS_ITEMS_XPATH = etree.XPath(f'//ul[{_has_class("news-list")}]/li')
+_TXT_BOX_XPATH = etree.XPath(f'//div[{_has_class("txt-box")}]')
+
+# 标题链接：h3 a，其次 a.tit
+_TITLE_XPATHS = (
+    etree.XPath('.//h3//a'),
+    etree.XPath(f'.//a[{_has_class("tit")}]'),
+)
+
+# 摘要：p.txt-info，其次 p.content
+_CONTENT_XPATHS = (
+    etree.XPath(f'.//p[{_has_class("txt-info")}]'),
+    etree.XPath(f'.//p[{_has_class("content")}]'),
+)
+
+# 公众号名称选择器，按优先级排列
+_AUTHOR_SELECTOR = _PrioritySelector((
+    f'self::a[{_has_class("account")}]',                                    # a.account 最常见的公众号链接
+    f'self::a[ancestor::div[{_has_class("s-p")}]][not(preceding-sibling::a)]',  # div.s-p a:first-of-type（更精确）
+    f'self::a[ancestor::p[{_has_class("s-p")}]][not(preceding-sibling::a)]',    # p.s-p a:first-of-type 可能在p标签内
+    f'self::*[{_has_class("account")}]',                                    # .account 任意account类
+    'self::a[contains(@uigs, "account")]',                                  # 带account属性的链接
+    f'self::a[ancestor::div[{_has_class("s-p")}]]',                         # div.s-p a 区域的任意链接
+    f'self::span[{_has_class("all-time-y2")}]',                             # 时间旁边可能有公众号名
+    'self::a[@data-z]',                                                     # 带data-z属性的链接
+))
+
+# 发布时间选择器，按优先级排列
+_TIME_SELECTOR = _PrioritySelector((
+    f'self::span[{_has_class("s2")}]',                                      # span.s2 常见的时间选择器
+    f'self::span[ancestor::div[{_has_class("s-p")}]][not(following-sibling::*)]',  # div.s-p span:last-child
+    f'self::span[{_has_class("time")}]',                                    # span.time 时间类
+    'self::span[@data-lastmodified]',                                       # 带时间戳属性
+))
+
+
+@lru_cache(maxsize=256)
+def _search_url_template(search_url: str, keyword: str) -> str:
+    """
+    构建搜索URL模板（每个关键词只编码一次，翻页时只替换 {page}）
+    type=2 表示搜索文章；搜狗微信搜索不支持按时间排序，需要在爬取后使用时间过滤器
+    """
+    return f"{search_url}?type=2&query={quote(str(keyword), safe='')}&page={{page}}"
+
+
+@lru_cache(maxsize=4096)
+def _parse_time_cached(time_str: str, now_bucket: int) -> Optional[datetime]:
+    """解析时间字符串（now_bucket 为当前分钟数，仅用于使缓存按分钟失效）"""
+    now = datetime.now()
+    time_str = time_str.translate(_DATE_SEP_NORM).strip()
+    
+    try:
+        # 相对时间格式
+        unit = next((u for suffix, u in _RELATIVE_UNITS.items() if suffix in time_str), None)
+        if unit:
+            match = _DIGITS_RE.search(time_str)
+            if match:
+                return now - timedelta(**{unit: int(match.group())})
+        elif "昨天" in time_str:
+            return now - timedelta(days=1)
+        elif "前天" in time_str:
+            return now - timedelta(days=2)
+        else:
+            # 绝对日期格式：YYYY-MM-DD / YYYY年MM月DD日 / YYYY/MM/DD / MM-DD / MM月DD日
+            match = _ABS_DATE_RE.fullmatch(time_str)
+            if match:
+                year, month, day = match.groups()
+                # 对于只有月日的格式，补上当前年份
+                return datetime(int(year) if year else now.year, int(month), int(day))
+    except Exception as e:
+        logger.debug(f"时间解析失败: {time_str}, 错误: {e}")
+    
+    return None
 
 
 class SogouWechatCrawler(BaseCrawler):
@@ -21,6 +123,9 @@ class SogouWechatCrawler(BaseCrawler):
     BASE_URL = "https://weixin.sogou.com"
     SEARCH_URL = "https://weixin.sogou.com/weixin"
     
+    # 纯HTTP爬虫，多个关键词可并发搜索
+    max_concurrency = 4
+    
     # 请求头，模拟浏览器
     HEADERS = {
         "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -31,27 +136,87 @@ class SogouWechatCrawler(BaseCrawler):
         "Referer": "https://weixin.sogou.com/",
     }
     
-    def __init__(self, request_delay: float = 3.0):
+    def __init__(
+        self,
+        request_delay: float = 3.0,
+        cache_dir: str = None,
+        cache_ttl: int = 3600,
+        page_concurrency: int = 1,
+        cookie_file: str = None
+    ):
         """
         初始化搜狗微信爬虫
         
         Args:
             request_delay: 请求间隔（秒）
+            cache_dir: 搜索结果页缓存目录，默认为运行时数据目录下的 sogou_cache
+            cache_ttl: 缓存有效期（秒），0 表示不使用缓存
+            page_concurrency: 同一关键词的翻页并发数，1 为逐页请求（最不易触发反爬）
+            cookie_file: Session cookies 持久化文件，默认为运行时数据目录下的 sogou_cookies.txt
         """
         super().__init__(request_delay)
+        self.cache_dir = Path(cache_dir) if cache_dir else get_runtime_data_dir() / "sogou_cache"
+        self.cache_ttl = cache_ttl
+        self.page_concurrency = page_concurrency
+        # 请求间隔由自适应限速器控制（初始平均间隔与原先 delay + 随机0.5~1.5秒一致）
+        self.rate_limiter = AdaptiveRateLimiter(rate=1.0 / (request_delay + 1.0))
         self.session = requests.Session()
         self.session.headers.update(self.HEADERS)
-        # 访问首页获取cookies
-        self._init_session()
+        # 挂载进程内共享的连接池（覆盖 get_real_urls 与多关键词并发，跨爬虫实例复用长连接），并对限流/服务端错误自动重试
+        mount_shared_pool(self.session)
+        
+        # 优先复用上次保存的cookies，没有有效cookies时才访问首页获取
+        self.cookie_file = Path(cookie_file) if cookie_file else get_runtime_data_dir() / "sogou_cookies.txt"
+        self.session.cookies = LWPCookieJar(str(self.cookie_file))
+        if not self._load_cookies():
+            self._init_session()
     
     def _init_session(self):
         """初始化session，获取必要的cookies"""
         try:
             self.session.get(self.BASE_URL, timeout=10)
             self.logger.info("Session初始化成功")
+            self._save_cookies()
         except Exception as e:
             self.logger.warning(f"Session初始化失败: {e}")
     
+    def _load_cookies(self) -> bool:
+        """加载未过期的cookies，返回是否加载到"""
+        if not self.cookie_file.exists():
+            return False
+        try:
+            self.session.cookies.load(ignore_discard=True)
+        except Exception as e:
+            self.logger.debug(f"加载Cookies失败: {e}")
+            return False
+        if len(self.session.cookies) == 0:
+            return False
+        self.logger.info("已复用保存的Session Cookies")
+        return True
+    
+    def _save_cookies(self):
+        """保存cookies，失败时忽略（如只读文件系统）"""
+        try:
+            self.cookie_file.parent.mkdir(parents=True, exist_ok=True)
+            self.session.cookies.save(ignore_discard=True)
+        except Exception as e:
+            self.logger.debug(f"保存Cookies失败: {e}")
+    
+    def _sleep(self):
+        """请求间隔由 rate_limiter 在每次请求前控制，这里无需固定等待"""
+        pass
+    
+    def search_multiple(self, keywords: List[str], max_pages: int = 3) -> List[Article]:
+        """搜索多个关键词，结束后保存搜索过程中更新的cookies"""
+        articles = super().search_multiple(keywords, max_pages)
+        self._save_cookies()
+        return articles
+    
+    def iter_search_multiple(self, keywords: List[str], max_pages: int = 3) -> Iterator[List[Article]]:
+        """逐批产出多个关键词的搜索结果，全部产出后保存cookies"""
+        yield from super().iter_search_multiple(keywords, max_pages)
+        self._save_cookies()
+    
     @property
     def platform_name(self) -> str:
         return "微信公众号"
@@ -67,6 +232,9 @@ class SogouWechatCrawler(BaseCrawler):
         Returns:
             文章列表
         """
+        if self.page_concurrency > 1 and max_pages > 1:
+            return self._search_pages_concurrently(keyword, max_pages)
+        
         articles = []
         
         for page in range(1, max_pages + 1):
@@ -81,57 +249,113 @@ class SogouWechatCrawler(BaseCrawler):
                 articles.extend(page_articles)
                 self.logger.info(f"第 {page} 页获取到 {len(page_articles)} 篇文章")
                 
-                # 页面之间的间隔，添加随机因子避免被封
-                if page < max_pages:
-                    delay = self.request_delay + random.uniform(0.5, 1.5)
-                    time.sleep(delay)
-                    
             except Exception as e:
                 self.logger.error(f"搜索第 {page} 页时出错: {e}")
                 break
         
         return articles
     
+    def _search_pages_concurrently(self, keyword: str, max_pages: int) -> List[Article]:
+        """
+        并发请求所有页（复用同一连接池），再按页序合并
+        遇到空页时丢弃其后的结果，与逐页搜索的结果一致
+        """
+        self.logger.info(f"正在并发搜索 '{keyword}' 第 1-{max_pages} 页")
+        workers = min(self.page_concurrency, max_pages)
+        articles = []
+        
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pages = list(executor.map(
+                    lambda page: self._search_page(keyword, page),
+                    range(1, max_pages + 1)
+                ))
+        except Exception as e:
+            self.logger.error(f"并发搜索 '{keyword}' 时出错: {e}")
+            return articles
+        
+        for page, page_articles in enumerate(pages, 1):
+            if not page_articles:
+                self.logger.info(f"第 {page} 页没有更多结果")
+                break
+            articles.extend(page_articles)
+            self.logger.info(f"第 {page} 页获取到 {len(page_articles)} 篇文章")
+        
+        return articles
+    
     def _search_page(self, keyword: str, page: int = 1) -> List[Article]:
         """搜索单页"""
-        params = {
-            "type": "2",      # 2表示搜索文章
-            "query": keyword,
-            "page": page,
-            # 注意：搜狗微信搜索不支持按时间排序，需要在爬取后使用时间过滤器
-        }
+        url = _search_url_template(self.SEARCH_URL, keyword).format(page=page)
+        
+        cached = self._load_cached_page(keyword, page)
+        if cached is not None:
+            self.logger.debug(f"命中缓存: '{keyword}' 第 {page} 页")
+            return self._parse_search_results(cached, keyword)
         
         try:
-            response = self.session.get(
-                self.SEARCH_URL,
-                params=params,
-                timeout=15
-            )
+            self.rate_limiter.acquire()
+            response = self.session.get(url, timeout=15)
             response.raise_for_status()
             
             # 检查是否需要验证码
             if "antispider" in response.url or "验证" in response.text:
+                self.rate_limiter.on_throttle()
                 self.logger.warning("触发反爬机制，需要手动输入验证码")
                 self.logger.warning(f"请访问: {response.url}")
                 return []
             
+            self.rate_limiter.on_success()
+            # 只缓存正常的结果页，反爬页面不缓存
+            self._save_cached_page(keyword, page, response.text)
             return self._parse_search_results(response.text, keyword)
             
         except requests.RequestException as e:
+            # 限流(429)重试耗尽或网络异常，都降低请求速率
+            self.rate_limiter.on_throttle()
             self.logger.error(f"请求失败: {e}")
             return []
     
+    def _cache_path(self, keyword: str, page: int) -> Path:
+        """搜索结果页缓存文件路径"""
+        key = hashlib.sha1(f"{keyword}\0{page}".encode()).hexdigest()
+        return self.cache_dir / f"{key}.html"
+    
+    def _load_cached_page(self, keyword: str, page: int) -> Optional[str]:
+        """读取未过期的缓存页面，没有则返回None"""
+        if self.cache_ttl <= 0:
+            return None
+        path = self._cache_path(keyword, page)
+        try:
+            if time.time() - path.stat().st_mtime < self.cache_ttl:
+                return path.read_text(encoding='utf-8')
+        except OSError:
+            pass
+        return None
+    
+    def _save_cached_page(self, keyword: str, page: int, html: str):
+        """写入缓存页面，失败时忽略（如只读文件系统）"""
+        if self.cache_ttl <= 0:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._cache_path(keyword, page).write_text(html, encoding='utf-8')
+        except OSError as e:
+            self.logger.debug(f"写入缓存失败: {e}")
+    
     def _parse_search_results(self, html: str, keyword: str) -> List[Article]:
         """解析搜索结果页面"""
         articles = []
-        soup = BeautifulSoup(html, 'lxml')
+        if not html or not html.strip():
+            return articles
+        
+        tree = lxml_html.fromstring(html)
         
         # 搜狗微信搜索结果的文章列表
-        news_list = soup.select('ul.news-list > li')
+        news_list = _NEWS_ITEMS_XPATH(tree)
         
         if not news_list:
             # 尝试其他选择器
-            news_list = soup.select('div.txt-box')
+            news_list = _TXT_BOX_XPATH(tree)
         
         for item in news_list:
             try:
@@ -147,11 +371,11 @@ class SogouWechatCrawler(BaseCrawler):
     def _parse_article_item(self, item, keyword: str) -> Optional[Article]:
         """解析单个文章项"""
         # 标题和链接
-        title_elem = item.select_one('h3 a') or item.select_one('a.tit')
-        if not title_elem:
+        title_elem = _first(item, _TITLE_XPATHS)
+        if title_elem is None:
             return None
         
-        title = title_elem.get_text(strip=True)
+        title = _text(title_elem)
         # 搜狗返回的是加密链接，需要访问后重定向到真实微信文章
         href = title_elem.get('href', '')
         if href and not href.startswith('http'):
@@ -161,8 +385,8 @@ class SogouWechatCrawler(BaseCrawler):
         author = self._extract_author(item)
         
         # 摘要内容
-        content_elem = item.select_one('p.txt-info') or item.select_one('p.content')
-        content = content_elem.get_text(strip=True) if content_elem else ""
+        content_elem = _first(item, _CONTENT_XPATHS)
+        content = _text(content_elem) if content_elem is not None else ""
         
         # 发布时间（尝试多种选择器）
         published_at = self._extract_publish_time(item)
@@ -182,110 +406,40 @@ class SogouWechatCrawler(BaseCrawler):
         )
     
     def _extract_author(self, item) -> str:
-        """提取公众号名称，尝试多种CSS选择器"""
+        """提取公众号名称，尝试多种选择器"""
         # 按优先级尝试不同的选择器
-        selectors = [
-            'a.account',              # 最常见的公众号链接
-            'div.s-p a:first-of-type',   # s-p区域的第一个链接（更精确）
-            'p.s-p a:first-of-type',     # 可能在p标签内
-            '.account',               # 任意account类
-            'a[uigs*="account"]',     # 带account属性的链接
-            'div.s-p a',              # s-p区域的任意链接
-            'span.all-time-y2',       # 时间旁边可能有公众号名
-            'a[data-z]',              # 带data-z属性的链接
-        ]
-        
-        for selector in selectors:
-            elem = item.select_one(selector)
-            if elem:
-                text = elem.get_text(strip=True)
-                # 过滤掉明显不是公众号名称的内容
-                if text and not self._is_time_string(text) and len(text) < 50:
-                    self.logger.debug(f"找到作者: {text} (选择器: {selector})")
-                    return text
+        for selector, elem in _AUTHOR_SELECTOR.candidates(item):
+            text = _text(elem)
+            # 过滤掉明显不是公众号名称的内容
+            if text and not self._is_time_string(text) and len(text) < 50:
+                self.logger.debug(f"找到作者: {text} (选择器: {selector})")
+                return text
         
         return "未知公众号"
     
     def _is_time_string(self, text: str) -> bool:
         """判断字符串是否为时间格式"""
-        time_patterns = ['小时前', '天前', '分钟前', '秒前', '年', '月', '日', '-']
-        return any(p in text for p in time_patterns)
+        return _TIME_STRING_RE.search(text) is not None
     
     def _extract_publish_time(self, item) -> Optional[datetime]:
-        """提取发布时间，尝试多种CSS选择器"""
-        selectors = [
-            'span.s2',             # 常见的时间选择器
-            'div.s-p span:last-child',  # s-p区域最后一个span
-            'span.time',           # 时间类
-            'span[data-lastmodified]',  # 带时间戳属性
-        ]
-        
-        for selector in selectors:
-            elem = item.select_one(selector)
-            if elem:
-                time_str = elem.get_text(strip=True)
-                parsed = self._parse_time(time_str)
-                if parsed:
-                    return parsed
+        """提取发布时间，尝试多种选择器"""
+        for _, elem in _TIME_SELECTOR.candidates(item):
+            parsed = self._parse_time(_text(elem))
+            if parsed:
+                return parsed
         
         return None
     
     def _parse_time(self, time_str: str) -> Optional[datetime]:
-        """解析时间字符串，支持多种格式"""
+        """
+        解析时间字符串，支持多种格式
+        
+        同一页面中相同的时间字符串（如"3小时前"）很常见，
+        结果按分钟粒度缓存，相对时间最多偏差一分钟
+        """
         if not time_str:
             return None
-        
-        from datetime import timedelta
-        now = datetime.now()
-        
-        try:
-            # 相对时间格式
-            if "秒前" in time_str:
-                match = re.search(r'(\d+)', time_str)
-                if match:
-                    seconds = int(match.group(1))
-                    return now - timedelta(seconds=seconds)
-            elif "分钟前" in time_str:
-                match = re.search(r'(\d+)', time_str)
-                if match:
-                    minutes = int(match.group(1))
-                    return now - timedelta(minutes=minutes)
-            elif "小时前" in time_str:
-                match = re.search(r'(\d+)', time_str)
-                if match:
-                    hours = int(match.group(1))
-                    return now - timedelta(hours=hours)
-            elif "天前" in time_str:
-                match = re.search(r'(\d+)', time_str)
-                if match:
-                    days = int(match.group(1))
-                    return now - timedelta(days=days)
-            elif "昨天" in time_str:
-                return now - timedelta(days=1)
-            elif "前天" in time_str:
-                return now - timedelta(days=2)
-            else:
-                # 绝对日期格式
-                formats = [
-                    "%Y-%m-%d",
-                    "%Y年%m月%d日",
-                    "%Y/%m/%d",
-                    "%m-%d",
-                    "%m月%d日",
-                ]
-                for fmt in formats:
-                    try:
-                        parsed = datetime.strptime(time_str.strip(), fmt)
-                        # 对于只有月日的格式，补上当前年份
-                        if fmt in ["%m-%d", "%m月%d日"]:
-                            parsed = parsed.replace(year=now.year)
-                        return parsed
-                    except ValueError:
-                        continue
-        except Exception as e:
-            self.logger.debug(f"时间解析失败: {time_str}, 错误: {e}")
-        
-        return None
+        return _parse_time_cached(time_str, int(time.time()) // 60)
     
     def get_real_url(self, sogou_url: str) -> Optional[str]:
         """
@@ -306,6 +460,36 @@ class SogouWechatCrawler(BaseCrawler):
         except Exception as e:
             self.logger.error(f"获取真实URL失败: {e}")
             return sogou_url
+    
+    def get_real_urls(self, sogou_urls: List[str], max_workers: int = 20) -> List[str]:
+        """
+        并发获取多个真实的微信文章URL
+        
+        Args:
+            sogou_urls: 搜狗返回的加密链接列表
+            max_workers: 并发线程数
+            
+        Returns:
+            真实的微信文章URL列表（与输入顺序一致）
+        """
+        if not sogou_urls:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(sogou_urls))) as executor:
+            return list(executor.map(self._resolve_redirect, sogou_urls))
+    
+    def _resolve_redirect(self, sogou_url: str) -> str:
+        """用HEAD请求解析重定向（不下载正文），服务端不支持HEAD时回退到GET"""
+        try:
+            response = self.session.head(sogou_url, allow_redirects=False, timeout=10)
+            if response.status_code in [301, 302]:
+                return response.headers.get('Location') or sogou_url
+            if response.status_code in [405, 501]:
+                return self.get_real_url(sogou_url)
+            return sogou_url
+        except Exception as e:
+            self.logger.error(f"获取真实URL失败: {e}")
+            return sogou_url
 
 
 # 测试代码
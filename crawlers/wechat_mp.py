@@ -3,18 +3,28 @@
 通过微信公众号平台网页版获取文章
 需要用户登录获取cookie，支持按时间排序
 """
-import json
+import hashlib
 import os
+import queue
 import re
 import time
+import warnings
+from contextlib import contextmanager, ExitStack
 from datetime import datetime, timedelta
 from typing import List, Optional, Callable
+from urllib.parse import quote
 from pathlib import Path
 import logging
 
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
+import requests
+from lxml import etree, html as lxml_html
+from playwright.sync_api import Page, Browser, BrowserContext, TimeoutError as PlaywrightTimeoutError
 
 from .base import BaseCrawler, Article
+from ._browser_pool import get_browser
+from ._cookies import dumps_cookies, loads_cookies
+from ._http_pool import mount_shared_pool
+from ._xpath import _has_class, _PrioritySelector
 
 # 导入路径管理
 try:
@@ -25,6 +35,76 @@ except ImportError:
 
 logging.basicConfig(level=logging.INFO)
 
+# 外部常驻 Chromium 的 CDP 地址（如 http://127.0.0.1:9222），
+# 通过 chromium --remote-debugging-port=9222 --user-data-dir=... 预先启动
+WECHAT_MP_CDP_ENDPOINT = os.getenv("WECHAT_MP_CDP_ENDPOINT")
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# 页面元素选择器（在 _init_browser 中编译为 Locator，跨调用复用）
+_QRCODE_SELECTOR = 'img.login__type__container__scan__qrcode, img[class*="qrcode"]'
+_SEARCH_ENTRY_SELECTOR = 'a[href*="websearch"], .search-icon, [class*="search"]'
+_NEXT_PAGE_SELECTOR = 'a#sogou_next, .p-next, a:has-text("下一页")'
+
+# 已登录判断：URL包含首页特征，或页面上有用户昵称/头像区域
+_CHECK_LOGIN_JS = """
+() => location.pathname.includes('/cgi-bin/home')
+    || !!document.querySelector('.weui-desktop-account__nickname, .account__header__info, [class*="nickname"]')
+"""
+
+# 搜索时不需要加载的资源类型（不影响提取的文本）
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
+# 搜狗微信搜索结果：ul.news-list > li，没有时退回 div.txt-box
+# （txt-box 嵌在 li 内，两者一起取会让每篇文章出现两次）
+_NEWS_ITEMS_XPATH = etree.XPath(f'//ul[{_has_class("news-list")}]/li')
+_TXT_BOX_XPATH = etree.XPath(f'//div[{_has_class("txt-box")}]')
+# 标题链接（h3 a, a.tit）
+_TITLE_XPATH = etree.XPath(f'(.//h3//a | .//a[{_has_class("tit")}])[1]')
+# 摘要（p.txt-info, p.content）
+_CONTENT_XPATH = etree.XPath(
+    f'(.//p[{_has_class("txt-info")}] | .//p[{_has_class("content")}])[1]'
+)
+
+# 公众号名称选择器，按优先级排列
+_AUTHOR_SELECTOR = _PrioritySelector((
+    f'self::a[{_has_class("account")}]',                                    # a.account 公众号链接
+    f'self::a[ancestor::div[{_has_class("s-p")}]][not(preceding-sibling::a)]',  # div.s-p a:first-of-type
+    f'self::a[ancestor::p[{_has_class("s-p")}]]',                           # p.s-p a 可能在p标签内
+    f'self::*[{_has_class("account")}]',                                    # .account 任意标签的account类
+    'self::a[contains(@uigs, "account")]',                                  # 带account属性的链接
+))
+
+# 发布时间选择器，按优先级排列
+_TIME_SELECTOR = _PrioritySelector((
+    f'self::span[{_has_class("s2")}]',                                      # span.s2 搜狗旧版
+    f'self::span[ancestor::div[{_has_class("s-p")}]]',                      # div.s-p span 搜狗新版
+    f'self::span[{_has_class("time")}]',                                    # span.time 通用
+    'self::span[contains(@class, "time")]',                                 # span[class*="time"]
+    f'self::span[parent::*[{_has_class("s-p")}]][not(following-sibling::*)]',  # .s-p > span:last-child
+))
+
+# 时间解析用到的正则与日期格式（模块级预编译，避免每篇文章重复构造）
+_RE_REL = re.compile(r'(\d+)\s*(分钟|小时|天)前')
+_UNIT = {"分钟": "minutes", "小时": "hours", "天": "days"}
+# 固定说法 -> 距今天数，按出现频率排列
+_FAST_CASES = (
+    ("刚刚", 0),
+    ("刚发布", 0),
+    ("昨天", 1),
+    ("前天", 2),
+)
+_RE_FULLDATE = re.compile(r'(\d{4})[年/-](\d{1,2})[月/-](\d{1,2})')
+_RE_MD = re.compile(r'(\d{1,2})[月/-](\d{1,2})')
+# (格式, 是否缺少年份)
+_DATE_FORMATS = (
+    ("%Y-%m-%d", False),        # 2026-01-10
+    ("%Y年%m月%d日", False),     # 2026年01月10日
+    ("%Y/%m/%d", False),        # 2026/01/10
+    ("%m-%d", True),            # 01-10
+    ("%m月%d日", True),          # 01月10日
+)
+
 
 class WechatMPCrawler(BaseCrawler):
     """
@@ -45,7 +125,9 @@ class WechatMPCrawler(BaseCrawler):
         request_delay: float = 3.0,
         headless: bool = True,
         cookie_file: str = None,
-        data_dir: str = None
+        data_dir: str = None,
+        page_concurrency: int = 1,
+        http_fast_path: bool = True
     ):
         """
         初始化微信公众号平台爬虫
@@ -55,9 +137,14 @@ class WechatMPCrawler(BaseCrawler):
             headless: 是否无头模式
             cookie_file: cookie文件路径
             data_dir: 数据目录（已弃用，使用path_manager）
+            page_concurrency: 搜索结果翻页并发数（同一浏览器上下文中同时打开的页面数），1 为逐页点击翻页
+            http_fast_path: 是否先用HTTP直接请求搜狗结果页，被反爬拦截时再用浏览器
         """
         super().__init__(request_delay)
         self.headless = headless
+        self.page_concurrency = page_concurrency
+        self.http_fast_path = http_fast_path
+        self._http_session: Optional[requests.Session] = None
         
         # 使用新的路径管理系统
         if cookie_file:
@@ -73,7 +160,14 @@ class WechatMPCrawler(BaseCrawler):
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
-        self._playwright = None
+        # 同一上下文内的页面池（self.page 为其中第一个），供并发翻页复用
+        self._page_pool: "queue.Queue[Page]" = queue.Queue()
+        self._pool_pages: List[Page] = []
+        self._max_pages = 4
+        # 连接外部浏览器时复用其默认上下文，关闭时不能关掉
+        self._owns_context = True
+        # 上次读写的cookie文件内容摘要，内容未变化时跳过写盘
+        self._last_cookie_hash: Optional[bytes] = None
         
         self._logged_in = False
     
@@ -81,50 +175,64 @@ class WechatMPCrawler(BaseCrawler):
     def platform_name(self) -> str:
         return "微信公众号"
     
-    def _init_browser(self, headless: bool = None):
-        """初始化浏览器"""
-        if self.browser:
+    def _init_browser(self, headless: bool = None, block_resources: bool = True):
+        """
+        初始化浏览器上下文（浏览器进程在同一线程内的爬虫间共享）
+        
+        Args:
+            headless: 是否无头模式，默认使用实例配置
+            block_resources: 是否拦截图片/字体/媒体/样式表（扫码登录需要显示二维码，应关闭）
+        """
+        if self.context:
             return
         
         use_headless = headless if headless is not None else self.headless
         
-        try:
-            self._playwright = sync_playwright().start()
-            self.browser = self._playwright.chromium.launch(
-                headless=use_headless,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--no-sandbox',
-                ]
-            )
-            
+        self.browser = get_browser(use_headless, cdp_endpoint=WECHAT_MP_CDP_ENDPOINT)
+        if WECHAT_MP_CDP_ENDPOINT and self.browser.contexts:
+            self.context = self.browser.contexts[0]
+            self._owns_context = False
+        else:
             self.context = self.browser.new_context(
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+                user_agent=USER_AGENT,
                 viewport={"width": 1280, "height": 800},
                 locale="zh-CN",
             )
-            
-            # 加载cookies
-            self._load_cookies()
-            
-            self.page = self.context.new_page()
-        except Exception as e:
-            raise
+            self._owns_context = True
+            # 外部浏览器的默认上下文可能被其他程序使用，只在自建上下文中拦截
+            if block_resources:
+                self.context.route("**/*", self._route_resources)
+        
+        # 加载cookies
+        self._load_cookies()
+        
+        self.page = self.context.new_page()
+        self._pool_pages.append(self.page)
+        self._page_pool.put(self.page)
+        self._qrcode = self.page.locator(_QRCODE_SELECTOR).first
+        self._search_entry = self.page.locator(_SEARCH_ENTRY_SELECTOR).first
+        self._next_btn = self.page.locator(_NEXT_PAGE_SELECTOR).first
+    
+    @staticmethod
+    def _route_resources(route):
+        """在浏览器网络层直接丢弃搜索页的图片、字体等资源"""
+        if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        else:
+            route.continue_()
     
     def _close_browser(self):
-        """关闭浏览器"""
-        if hasattr(self, 'page') and self.page:
-            self.page.close()
-            self.page = None
-        if hasattr(self, 'context') and self.context:
-            self.context.close()
+        """关闭浏览器上下文（共享的浏览器进程不关闭）"""
+        for page in getattr(self, '_pool_pages', ()):
+            page.close()
+        self._pool_pages = []
+        self._page_pool = queue.Queue()
+        self.page = None
+        if getattr(self, 'context', None):
+            if self._owns_context:
+                self.context.close()
             self.context = None
-        if hasattr(self, 'browser') and self.browser:
-            self.browser.close()
-            self.browser = None
-        if hasattr(self, '_playwright') and self._playwright:
-            self._playwright.stop()
-            self._playwright = None
+        self.browser = None
     
     def _load_cookies(self) -> bool:
         """加载Cookies"""
@@ -133,8 +241,9 @@ class WechatMPCrawler(BaseCrawler):
         
         try:
             if os.path.exists(self.cookie_file):
-                with open(self.cookie_file, 'r', encoding='utf-8') as f:
-                    cookies = json.load(f)
+                data = Path(self.cookie_file).read_bytes()
+                cookies = loads_cookies(data)
+                self._last_cookie_hash = hashlib.blake2b(data, digest_size=16).digest()
                 self.context.add_cookies(cookies)
                 self.logger.info(f"已加载微信公众号Cookies")
                 self._logged_in = True
@@ -150,28 +259,31 @@ class WechatMPCrawler(BaseCrawler):
             return
         
         try:
-            cookies = self.context.cookies()
-            with open(self.cookie_file, 'w', encoding='utf-8') as f:
-                json.dump(cookies, f, ensure_ascii=False, indent=2)
+            data = dumps_cookies(self.context.cookies())
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if digest == self._last_cookie_hash and os.path.exists(self.cookie_file):
+                return
+            
+            # 先写临时文件再替换，避免中途中断损坏cookie文件
+            tmp_path = f"{self.cookie_file}.tmp"
+            Path(tmp_path).write_bytes(data)
+            os.replace(tmp_path, self.cookie_file)
+            self._last_cookie_hash = digest
             self.logger.info(f"Cookies已保存: {self.cookie_file}")
         except Exception as e:
             self.logger.error(f"保存Cookies失败: {e}")
     
     def is_logged_in(self) -> bool:
-        """检查是否已登录"""
+        """检查是否已登录（只读取cookie文件，不启动浏览器；需要浏览器时由 _init_browser 加载cookies）"""
         # 如果已经标记为登录，直接返回
         if self._logged_in:
             return True
         
-        # 否则检查cookie文件是否存在
-        if os.path.exists(self.cookie_file):
-            # 尝试加载cookies
-            if not self.browser:
-                self._init_browser()
-            if self._load_cookies():
-                return True
-        
-        return False
+        # 否则检查cookie文件是否存在且可以解析
+        try:
+            return bool(loads_cookies(Path(self.cookie_file).read_bytes()))
+        except (OSError, ValueError):
+            return False
     
     def login_by_qrcode(self, callback: Callable[[str], None] = None, timeout: int = 120) -> bool:
         """
@@ -187,15 +299,15 @@ class WechatMPCrawler(BaseCrawler):
         self._close_browser()
         
         try:
-            self._init_browser(headless=False)
+            self._init_browser(headless=False, block_resources=False)
         except Exception as e:
             self.logger.error(f"微信公众号平台登录失败: {e}")
+            self._close_browser()
             return False
         
         try:
             # 访问公众号平台
-            self.page.goto(self.BASE_URL, wait_until="networkidle", timeout=30000)
-            time.sleep(2)
+            self.page.goto(self.BASE_URL, wait_until="domcontentloaded", timeout=30000)
             
             # 检查是否已登录
             if self._check_login_status():
@@ -211,59 +323,39 @@ class WechatMPCrawler(BaseCrawler):
             
             # 等待二维码
             try:
-                qr_selector = 'img.login__type__container__scan__qrcode, img[class*="qrcode"]'
-                self.page.wait_for_selector(qr_selector, timeout=10000)
+                self._qrcode.wait_for(timeout=10000)
                 
                 if callback:
-                    qr_elem = self.page.query_selector(qr_selector)
-                    if qr_elem:
-                        qr_url = qr_elem.get_attribute('src')
-                        if qr_url:
-                            callback(qr_url)
+                    qr_url = self._qrcode.get_attribute('src')
+                    if qr_url:
+                        callback(qr_url)
             except Exception:
                 self.logger.info("等待用户扫码...")
             
-            # 等待登录成功
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                if self._check_login_status():
-                    self.logger.info("登录成功！")
-                    self.save_cookies()
-                    self._logged_in = True
-                    return True
-                time.sleep(2)
-            
-            self.logger.error("登录超时")
-            return False
+            # 等待登录成功（扫码后页面会跳转到首页）
+            try:
+                self.page.wait_for_url("**/cgi-bin/home**", timeout=timeout * 1000)
+            except PlaywrightTimeoutError:
+                self.logger.error("登录超时")
+                return False
+            
+            self.logger.info("登录成功！")
+            self.save_cookies()
+            self._logged_in = True
+            return True
             
         except Exception as e:
             self.logger.error(f"登录失败: {e}")
             return False
         finally:
-            if self._logged_in:
-                self._close_browser()
+            # 登录用的是可见且不拦截资源的上下文，无论成功与否都关闭；
+            # 之后的搜索会按实例配置重建上下文，并从文件加载刚保存的cookies
+            self._close_browser()
     
     def _check_login_status(self) -> bool:
-        """检查登录状态"""
+        """检查登录状态（URL 与用户信息元素在页面内一次性判断）"""
         try:
-            # 检查URL是否包含首页特征
-            if "/cgi-bin/home" in self.page.url:
-                return True
-            
-            # 检查是否有用户头像
-            user_selectors = [
-                '.weui-desktop-account__nickname',
-                '.account__header__info',
-                '[class*="nickname"]',
-            ]
-            
-            for selector in user_selectors:
-                elem = self.page.query_selector(selector)
-                if elem:
-                    return True
-            
-            return False
-            
+            return self.page.evaluate(_CHECK_LOGIN_JS)
         except Exception:
             return False
     
@@ -290,58 +382,66 @@ class WechatMPCrawler(BaseCrawler):
             self.logger.warning("未登录，请先执行扫码登录")
             return []
         
-        self._init_browser()
         articles = []
+        seen_urls: set[str] = set()
+        
+        def add_page(page_articles: List[Article]) -> int:
+            """合并一页结果（按URL去重），返回新增数量"""
+            new_count = 0
+            for article in page_articles:
+                if article.url not in seen_urls:
+                    seen_urls.add(article.url)
+                    articles.append(article)
+                    new_count += 1
+            return new_count
+        
+        self.logger.info(f"搜索关键词: {keyword}")
+        
+        # 由于微信公众号后台的搜索主要是搜索自己的文章
+        # 这里我们使用备用方案：通过搜狗微信搜索
+        # sort=1 表示按时间排序（最新优先）
+        sort_param = "&sort=1" if sort_by_time else ""
+        sogou_url = f"https://weixin.sogou.com/weixin?type=2&query={quote(str(keyword), safe='')}{sort_param}"
+        self.logger.info(f"搜索URL: {sogou_url} (按时间排序: {sort_by_time})")
         
         try:
-            # 访问素材搜索页面
-            # 注意：微信公众号平台的搜索功能需要登录
-            search_url = f"{self.BASE_URL}/cgi-bin/appmsg?action=list_ex&begin=0&count=5&fakeid=&type=9&query={keyword}&token="
-            
-            # 先访问首页获取token
-            self.page.goto(f"{self.BASE_URL}/cgi-bin/home", wait_until="networkidle", timeout=30000)
-            time.sleep(2)
-            
-            # 使用搜一搜功能搜索全网文章
-            # 进入搜一搜
-            search_entry = self.page.query_selector('a[href*="websearch"], .search-icon, [class*="search"]')
-            if search_entry:
-                search_entry.click()
-                time.sleep(1)
-            
-            # 由于微信公众号后台的搜索主要是搜索自己的文章
-            # 这里我们使用备用方案：通过搜狗微信搜索
-            # 或者使用微信读书等渠道
-            
-            # 这是一个简化实现，实际使用时可能需要更复杂的逻辑
-            self.logger.info(f"搜索关键词: {keyword}")
-            
-            # 尝试使用微信搜一搜
-            # sort=1 表示按时间排序（最新优先）
-            sort_param = "&sort=1" if sort_by_time else ""
-            sogou_url = f"https://weixin.sogou.com/weixin?type=2&query={keyword}{sort_param}"
-            self.logger.info(f"搜索URL: {sogou_url} (按时间排序: {sort_by_time})")
-            self.page.goto(sogou_url, wait_until="networkidle", timeout=30000)
-            time.sleep(2)
+            # 搜狗结果页是服务端渲染的，先直接用HTTP请求，被反爬拦截时再启动浏览器
+            http_pages = self._search_pages_http(keyword, sogou_url, max_pages) if self.http_fast_path else None
+            if http_pages is not None:
+                for page_articles in http_pages:
+                    add_page(page_articles)
+                max_pages = 0  # 已通过HTTP采集完毕，跳过浏览器翻页
+            else:
+                self._init_browser()
+                
+                # 先访问首页获取token（微信公众号平台的搜索功能需要登录）
+                self.page.goto(f"{self.BASE_URL}/cgi-bin/home", wait_until="domcontentloaded", timeout=30000)
+                
+                # 使用搜一搜功能搜索全网文章
+                # 进入搜一搜
+                if self._search_entry.count():
+                    self._search_entry.click()
+                    self.page.wait_for_load_state("domcontentloaded")
+                
+                if self.page_concurrency > 1 and max_pages > 1:
+                    for page_articles in self._search_pages_concurrently(keyword, sogou_url, max_pages):
+                        add_page(page_articles)
+                    max_pages = 0  # 已并发采集完毕，跳过逐页翻页
+                else:
+                    self.page.goto(sogou_url, wait_until="domcontentloaded", timeout=30000)
             
             for page_num in range(max_pages):
                 self.logger.info(f"正在采集第 {page_num + 1} 页...")
                 
                 page_articles = self._parse_search_results(keyword)
                 
-                existing_urls = {a.url for a in articles}
-                new_count = 0
-                for article in page_articles:
-                    if article.url not in existing_urls:
-                        articles.append(article)
-                        new_count += 1
+                new_count = add_page(page_articles)
                 
                 self.logger.info(f"本页新增 {new_count} 篇，共 {len(articles)} 篇")
                 
                 # 翻页
-                next_btn = self.page.query_selector('a#sogou_next, .p-next, a:has-text("下一页")')
-                if next_btn and page_num < max_pages - 1:
-                    next_btn.click()
+                if page_num < max_pages - 1 and self._next_btn.count():
+                    self._next_btn.click()
                     time.sleep(self.request_delay)
                 else:
                     break
@@ -358,91 +458,186 @@ class WechatMPCrawler(BaseCrawler):
         
         return articles
     
-    def _parse_search_results(self, keyword: str) -> List[Article]:
-        """解析搜索结果"""
+    @contextmanager
+    def _acquire_page(self):
+        """从页面池取一个空闲页面（不足时新建，最多 _max_pages 个），用完放回"""
+        try:
+            page = self._page_pool.get_nowait()
+        except queue.Empty:
+            if len(self._pool_pages) < self._max_pages:
+                page = self.context.new_page()
+                self._pool_pages.append(page)
+            else:
+                page = self._page_pool.get(timeout=30)
+        try:
+            yield page
+        finally:
+            self._page_pool.put(page)
+    
+    def _get_http_session(self) -> requests.Session:
+        """获取HTTP会话（带上cookie文件中搜狗域名下的cookies）"""
+        if self._http_session is None:
+            session = mount_shared_pool(requests.Session())
+            session.headers.update({
+                "User-Agent": USER_AGENT,
+                "Accept-Language": "zh-CN,zh;q=0.9",
+            })
+            try:
+                cookies = loads_cookies(Path(self.cookie_file).read_bytes())
+            except (OSError, ValueError):
+                cookies = []
+            for cookie in cookies:
+                domain = cookie.get("domain", "")
+                if domain.endswith("sogou.com"):
+                    session.cookies.set(cookie["name"], cookie["value"], domain=domain, path=cookie.get("path", "/"))
+            self._http_session = session
+        return self._http_session
+    
+    def _search_pages_http(self, keyword: str, search_url: str, max_pages: int) -> Optional[List[List[Article]]]:
+        """
+        直接通过HTTP请求搜狗结果页（服务端渲染，无需执行JS）
+        
+        Returns:
+            按页序排列的每页文章列表；请求失败或遇到反爬验证页时返回 None，由浏览器重新采集
+        """
+        session = self._get_http_session()
+        results = []
+        
+        for page_num in range(1, max_pages + 1):
+            if page_num > 1:
+                time.sleep(self.request_delay)
+            try:
+                response = session.get(f"{search_url}&page={page_num}", timeout=10)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                self.logger.info(f"HTTP请求失败，改用浏览器采集: {e}")
+                return None
+            
+            # 反爬验证页会跳转到 antispider，或只返回很短的页面
+            if "antispider" in response.url or "antispider" in response.text or len(response.content) < 5 * 1024:
+                self.logger.info("HTTP请求被反爬拦截，改用浏览器采集")
+                return None
+            
+            page_articles = self._parse_html(response.text, keyword)
+            if not page_articles:
+                break
+            results.append(page_articles)
+            self.logger.info(f"第 {page_num} 页采集到 {len(page_articles)} 篇（HTTP）")
+        
+        return results
+    
+    def _search_pages_concurrently(self, keyword: str, search_url: str, max_pages: int) -> List[List[Article]]:
+        """
+        在同一浏览器上下文中用页面池中的多个页面并发加载搜索结果页
+        
+        同步API下每次调用都会阻塞，因此先让一批页面同时开始导航（wait_until="commit"），
+        再逐个等待加载完成并解析，页面资源的下载在浏览器内并行进行
+        
+        Returns:
+            按页序排列的每页文章列表，遇到空页时截止
+        """
+        urls = [f"{search_url}&page={n}" for n in range(1, max_pages + 1)]
+        workers = min(self.page_concurrency, max_pages, self._max_pages)
+        results = []
+        
+        with ExitStack() as stack:
+            pages = [stack.enter_context(self._acquire_page()) for _ in range(workers)]
+            for start in range(0, len(urls), workers):
+                batch = list(zip(pages, urls[start:start + workers]))
+                for page, url in batch:
+                    page.goto(url, wait_until="commit", timeout=30000)
+                for page, _ in batch:
+                    page.wait_for_load_state("domcontentloaded", timeout=30000)
+                    page_articles = self._parse_search_results(keyword, page)
+                    if not page_articles:
+                        return results
+                    results.append(page_articles)
+                    self.logger.info(f"第 {len(results)} 页采集到 {len(page_articles)} 篇")
+                if start + workers < len(urls):
+                    time.sleep(self.request_delay)
+        
+        return results
+    
+    def _parse_search_results(self, keyword: str, page: Page = None) -> List[Article]:
+        """解析搜索结果（取一次页面HTML，在本地用 lxml 解析，避免逐元素往返浏览器）"""
         articles = []
+        page = page or self.page
         
         try:
-            # 搜狗微信搜索结果
-            items = self.page.query_selector_all('ul.news-list > li, div.txt-box')
-            
-            for item in items:
-                try:
-                    # 标题
-                    title_elem = item.query_selector('h3 a, a.tit')
-                    if not title_elem:
-                        continue
-                    
-                    title = title_elem.inner_text().strip()
-                    href = title_elem.get_attribute('href') or ""
-                    
-                    if href and not href.startswith('http'):
-                        href = f"https://weixin.sogou.com{href}"
-                    
-                    # 作者 - 尝试多种选择器
-                    author = "未知公众号"
-                    author_selectors = [
-                        'a.account',           # 公众号链接
-                        'div.s-p a:first-of-type',  # s-p区域的第一个链接
-                        'p.s-p a',            # 可能在p标签内
-                        '.account',           # 任意标签的account类
-                        'a[uigs*="account"]', # 带account属性的链接
-                    ]
-                    
-                    for sel in author_selectors:
-                        author_elem = item.query_selector(sel)
-                        if author_elem:
-                            author_text = author_elem.inner_text().strip()
-                            if author_text and author_text != "" and len(author_text) < 50:
-                                author = author_text
-                                self.logger.debug(f"找到作者: {author} (选择器: {sel})")
-                                break
-                    
-                    # 摘要
-                    content_elem = item.query_selector('p.txt-info, p.content')
-                    content = content_elem.inner_text().strip() if content_elem else ""
-                    
-                    # 时间 - 尝试多种选择器
-                    time_elem = None
-                    time_selectors = [
-                        'span.s2',           # 搜狗旧版
-                        'div.s-p span',      # 搜狗新版
-                        'span.time',         # 通用
-                        'span[class*="time"]',
-                        '.s-p > span:last-child',  # 时间通常在最后
-                    ]
-                    for sel in time_selectors:
-                        time_elem = item.query_selector(sel)
-                        if time_elem:
-                            break
-                    
-                    published_at = None
-                    if time_elem:
-                        time_text = time_elem.inner_text().strip()
-                        published_at = self._parse_time(time_text)
-                        if published_at:
-                            self.logger.debug(f"解析时间: '{time_text}' -> {published_at}")
-                    
-                    if title:
-                        articles.append(Article(
-                            title=title,
-                            author=author,
-                            content=content,
-                            url=href,
-                            platform=self.platform_name,
-                            keyword=keyword,
-                            published_at=published_at,
-                        ))
-                        
-                except Exception as e:
-                    self.logger.debug(f"解析文章失败: {e}")
-                    continue
-            
+            html = page.content()
         except Exception as e:
             self.logger.error(f"解析结果失败: {e}")
+            return articles
+        
+        return self._parse_html(html, keyword)
+    
+    def _parse_html(self, html: str, keyword: str) -> List[Article]:
+        """用 lxml 解析搜狗微信搜索结果页HTML"""
+        articles = []
+        if not html.strip():
+            return articles
+        
+        tree = lxml_html.fromstring(html)
+        items = _NEWS_ITEMS_XPATH(tree) or _TXT_BOX_XPATH(tree)
+        
+        for item in items:
+            try:
+                article = self._parse_article_item(item, keyword)
+                if article:
+                    articles.append(article)
+            except Exception as e:
+                self.logger.debug(f"解析文章失败: {e}")
+                continue
         
         return articles
     
+    def _parse_article_item(self, item, keyword: str) -> Optional[Article]:
+        """解析单个搜索结果"""
+        # 标题
+        found = _TITLE_XPATH(item)
+        if not found:
+            return None
+        title_elem = found[0]
+        title = title_elem.text_content().strip()
+        if not title:
+            return None
+        
+        href = title_elem.get('href') or ""
+        if href and not href.startswith('http'):
+            href = f"https://weixin.sogou.com{href}"
+        
+        # 作者 - 按优先级尝试多种选择器
+        author = "未知公众号"
+        for selector, elem in _AUTHOR_SELECTOR.candidates(item):
+            author_text = elem.text_content().strip()
+            if author_text and len(author_text) < 50:
+                author = author_text
+                self.logger.debug(f"找到作者: {author} (选择器: {selector})")
+                break
+        
+        # 摘要
+        found = _CONTENT_XPATH(item)
+        content = found[0].text_content().strip() if found else ""
+        
+        # 时间 - 取优先级最高的选择器匹配到的元素
+        published_at = None
+        time_elem = next((elem for _, elem in _TIME_SELECTOR.candidates(item)), None)
+        if time_elem is not None:
+            time_text = time_elem.text_content().strip()
+            published_at = self._parse_time(time_text)
+            if published_at:
+                self.logger.debug(f"解析时间: '{time_text}' -> {published_at}")
+        
+        return Article(
+            title=title,
+            author=author,
+            content=content,
+            url=href,
+            platform=self.platform_name,
+            keyword=keyword,
+            published_at=published_at,
+        )
+    
     def _parse_time(self, time_str: str) -> Optional[datetime]:
         """
         解析时间字符串
@@ -465,87 +660,69 @@ class WechatMPCrawler(BaseCrawler):
         time_str = time_str.strip()
         now = datetime.now()
         
+        # 刚刚 / 昨天 / 前天
+        for marker, days_ago in _FAST_CASES:
+            if marker in time_str:
+                return now - timedelta(days=days_ago)
+        
+        # X分钟前 / X小时前 / X天前
+        match = _RE_REL.search(time_str)
+        if match:
+            try:
+                return now - timedelta(**{_UNIT[match.group(2)]: int(match.group(1))})
+            except OverflowError:
+                return None
+        
+        # 尝试解析日期格式
+        for fmt, missing_year in _DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(time_str, fmt)
+            except ValueError:
+                continue
+            # 如果只有月-日，添加当前年份
+            if missing_year:
+                parsed = parsed.replace(year=now.year)
+                # 如果解析出的日期在未来，说明是去年的
+                if parsed > now:
+                    parsed = parsed.replace(year=now.year - 1)
+            return parsed
+        
         try:
-            # 刚刚
-            if "刚刚" in time_str or "刚发布" in time_str:
-                return now
-            
-            # X分钟前
-            if "分钟前" in time_str:
-                match = re.search(r'(\d+)', time_str)
-                if match:
-                    minutes = int(match.group(1))
-                    return now - timedelta(minutes=minutes)
-            
-            # X小时前
-            if "小时前" in time_str:
-                match = re.search(r'(\d+)', time_str)
-                if match:
-                    hours = int(match.group(1))
-                    return now - timedelta(hours=hours)
-            
-            # X天前
-            if "天前" in time_str:
-                match = re.search(r'(\d+)', time_str)
-                if match:
-                    days = int(match.group(1))
-                    return now - timedelta(days=days)
-            
-            # 昨天
-            if "昨天" in time_str:
-                return now - timedelta(days=1)
-            
-            # 前天
-            if "前天" in time_str:
-                return now - timedelta(days=2)
-            
-            # 尝试解析日期格式
-            date_formats = [
-                "%Y-%m-%d",        # 2026-01-10
-                "%Y年%m月%d日",     # 2026年01月10日
-                "%Y/%m/%d",        # 2026/01/10
-                "%m-%d",           # 01-10
-                "%m月%d日",         # 01月10日
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    parsed = datetime.strptime(time_str, fmt)
-                    # 如果只有月-日，添加当前年份
-                    if fmt in ["%m-%d", "%m月%d日"]:
-                        parsed = parsed.replace(year=now.year)
-                        # 如果解析出的日期在未来，说明是去年的
-                        if parsed > now:
-                            parsed = parsed.replace(year=now.year - 1)
-                    return parsed
-                except ValueError:
-                    continue
-            
             # 尝试从字符串中提取日期
-            date_match = re.search(r'(\d{4})[年/-](\d{1,2})[月/-](\d{1,2})', time_str)
+            date_match = _RE_FULLDATE.search(time_str)
             if date_match:
                 year, month, day = int(date_match.group(1)), int(date_match.group(2)), int(date_match.group(3))
                 return datetime(year, month, day)
             
             # 只有月日的情况
-            date_match = re.search(r'(\d{1,2})[月/-](\d{1,2})', time_str)
+            date_match = _RE_MD.search(time_str)
             if date_match:
                 month, day = int(date_match.group(1)), int(date_match.group(2))
                 result = datetime(now.year, month, day)
                 if result > now:
                     result = result.replace(year=now.year - 1)
                 return result
-                
-        except Exception as e:
-            self.logger.debug(f"时间解析失败: '{time_str}' - {e}")
-        
-        return None
+        except ValueError:
+            # 数字不构成合法日期（如 13月40日）
+            self.logger.debug(f"时间解析失败: '{time_str}'")
         
         return None
     
-    def __del__(self):
-        """析构时关闭浏览器"""
+    def close(self):
+        """关闭本爬虫的浏览器上下文（当前线程共享的浏览器进程保留，供后续任务复用）"""
         self._close_browser()
+    
+    def __enter__(self):
+        self._init_browser()
+        return self
+    
+    def __exit__(self, *exc):
+        self._close_browser()
+    
+    def __del__(self):
+        """析构时不再关闭浏览器（解释器退出时 Playwright 可能已被回收，调用会卡住或报错）"""
+        if getattr(self, 'context', None) is not None:
+            warnings.warn("WechatMPCrawler 未显式关闭，请使用 with 语句或调用 _close_browser()", ResourceWarning)
 
 
 # 测试代码
@@ -558,18 +735,15 @@ if __name__ == "__main__":
     parser.add_argument("--pages", "-p", type=int, default=2, help="搜索页数")
     args = parser.parse_args()
     
-    crawler = WechatMPCrawler(headless=False)
-    
-    if args.login:
-        success = crawler.login_by_qrcode()
-        print(f"登录{'成功' if success else '失败'}")
-    else:
-        articles = crawler.search(args.keyword, max_pages=args.pages)
-        print(f"\n采集到 {len(articles)} 篇文章:")
-        for i, article in enumerate(articles[:10], 1):
-            print(f"[{i}] {article.title}")
-            print(f"    作者: {article.author}")
-            print(f"    链接: {article.url}")
-            print()
-
-
+    with WechatMPCrawler(headless=False) as crawler:
+        if args.login:
+            success = crawler.login_by_qrcode()
+            print(f"登录{'成功' if success else '失败'}")
+        else:
+            articles = crawler.search(args.keyword, max_pages=args.pages)
+            print(f"\n采集到 {len(articles)} 篇文章:")
+            for i, article in enumerate(articles[:10], 1):
+                print(f"[{i}] {article.title}")
+                print(f"    作者: {article.author}")
+                print(f"    链接: {article.url}")
+                print()
@@ -5,6 +5,7 @@
 """
 import json
 import os
+import random
 import re
 import time
 from datetime import datetime, timedelta
@@ -12,9 +13,17 @@ from typing import List, Optional, Callable
 from pathlib import Path
 import logging
 
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
+from playwright.sync_api import Page, Browser, BrowserContext, TimeoutError as PlaywrightTimeoutError
 
 from .base import BaseCrawler, Article
+from ._browser_pool import get_browser
+from ._cookies import dumps_cookies, loads_cookies
+
+# 可选依赖：更快的JSON解析
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # 导入路径管理
 try:
@@ -25,6 +34,79 @@ except ImportError:
 
 logging.basicConfig(level=logging.INFO)
 
+# 解析只用到文本和链接，这些资源类型直接在浏览器网络层丢弃
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+# 埋点/统计请求
+_TRACKER_HOSTS = ("sensorsdata", "mixpanel")
+# 扫码登录过程中页面会请求的接口：二维码状态轮询、登录激活、获取当前用户
+_LOGIN_API_MARKERS = ("/login/qrcode/status", "/login/activate", "/user/me")
+
+# 页面内嵌的初始状态（SSR 数据），一次提取后按字典遍历
+_INITIAL_STATE_RE = re.compile(r'window\.__INITIAL_STATE__\s*=\s*(\{.*?\})\s*</script>', re.DOTALL)
+_UNDEFINED_RE = re.compile(r'(?<=[:\[,])\s*undefined(?=\s*[,}\]])')
+
+# 页面内嵌JSON中的笔记标题与ID（备用解析）
+_NOTE_JSON_RE1 = re.compile(r'"noteCard":\s*\{[^}]*?"title":\s*"([^"]+)"[^}]*?"noteId":\s*"([^"]+)"')
+_NOTE_JSON_RE2 = re.compile(r'"title":\s*"([^"]{5,})"[^}]*?"id":\s*"([a-z0-9]{24})"')
+_COUNT_CLEAN_RE = re.compile(r'[^\d.]')
+
+# 在页面内一次性提取笔记字段，各字段的选择器按优先级传入：
+# 标题取第一个有文本的匹配；作者、点赞数取第一个存在的匹配
+_EXTRACT_NOTES_JS = """
+(sel) => {
+    let items = [];
+    for (const s of sel.items) {
+        items = document.querySelectorAll(s);
+        if (items.length) break;
+    }
+    const firstText = (el, selectors, needText) => {
+        for (const s of selectors) {
+            const n = el.querySelector(s);
+            if (!n) continue;
+            const text = n.innerText.trim();
+            if (text || !needText) return text;
+        }
+        return '';
+    };
+    return Array.from(items, (el) => {
+        let href = el.getAttribute('href');
+        if (!href) {
+            const a = el.querySelector('a');
+            href = a ? (a.getAttribute('href') || '') : '';
+        }
+        return {
+            title: firstText(el, sel.title, true),
+            href: href,
+            author: firstText(el, sel.author, false),
+            likes: firstText(el, sel.likes, false),
+        };
+    });
+}
+"""
+
+# 笔记卡片选择器，出现即说明搜索结果已渲染
+_NOTE_ITEM_SELECTOR = 'section.note-item, div.note-item, [class*="note-item"]'
+_NOTE_COUNT_JS = f"document.querySelectorAll('{_NOTE_ITEM_SELECTOR}').length"
+
+
+def _is_login_response(response) -> bool:
+    """是否为登录相关接口的响应"""
+    return any(marker in response.url for marker in _LOGIN_API_MARKERS)
+
+
+def _iter_note_cards(node):
+    """递归查找状态树中带 noteCard 的笔记条目（不依赖具体的字段路径）"""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if isinstance(node.get("noteCard"), dict):
+                yield node
+            else:
+                stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
 
 class XHSCrawler(BaseCrawler):
     """小红书爬虫（支持扫码登录、按时间排序）"""
@@ -37,6 +119,18 @@ class XHSCrawler(BaseCrawler):
     SORT_TIME = "time_descending" # 最新排序
     SORT_POPULAR = "popularity_descending"  # 最热排序
     
+    # 笔记列表与字段选择器，按优先级排列
+    _NOTE_ITEM_SELECTORS = (
+        'section.note-item',
+        'div.note-item',
+        'a.cover.ld.mask',
+        '[class*="note-item"]',
+        'div[data-v-a264b01c]',
+    )
+    _TITLE_SELECTORS = ('.title', '.note-title', 'span.title', '.desc')
+    _AUTHOR_SELECTORS = ('.author', '.nickname', '.name', '.author-name')
+    _LIKES_SELECTORS = ('.like-count', '.count', '.like span', '[class*="like"] span')
+    
     def __init__(
         self, 
         request_delay: float = 3.0, 
@@ -70,7 +164,6 @@ class XHSCrawler(BaseCrawler):
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
-        self._playwright = None
         
         self._logged_in = False
     
@@ -78,22 +171,21 @@ class XHSCrawler(BaseCrawler):
     def platform_name(self) -> str:
         return "小红书"
     
-    def _init_browser(self, headless: bool = None):
-        """初始化浏览器"""
-        if self.browser:
+    def _init_browser(self, headless: bool = None, block_resources: bool = True):
+        """
+        初始化浏览器
+        
+        Args:
+            headless: 是否无头模式，默认使用实例配置
+            block_resources: 是否拦截图片/视频/字体/样式表和埋点请求（扫码登录需要显示二维码，应关闭）
+        """
+        if self.context:
             return
         
         use_headless = headless if headless is not None else self.headless
         
-        self._playwright = sync_playwright().start()
-        self.browser = self._playwright.chromium.launch(
-            headless=use_headless,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-            ]
-        )
+        # 浏览器进程在同一线程内的爬虫间共享，每个爬虫只创建自己的上下文
+        self.browser = get_browser(use_headless)
         
         # 创建带有用户代理的上下文
         self.context = self.browser.new_context(
@@ -102,37 +194,44 @@ class XHSCrawler(BaseCrawler):
             locale="zh-CN",
         )
         
-        # 尝试加载cookies
-        self._load_cookies()
-        
-        self.page = self.context.new_page()
-        
-        # 设置额外的头信息
-        self.page.set_extra_http_headers({
+        # 设置额外的头信息（对上下文内所有标签页生效）
+        self.context.set_extra_http_headers({
             "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
         })
         
         # 注入反检测脚本
-        self.page.add_init_script("""
+        self.context.add_init_script("""
             Object.defineProperty(navigator, 'webdriver', {
                 get: () => undefined
             });
         """)
+        
+        if block_resources:
+            self.context.route("**/*", self._route_resources)
+        
+        # 尝试加载cookies
+        self._load_cookies()
+        
+        self.page = self.context.new_page()
+    
+    @staticmethod
+    def _route_resources(route):
+        """拦截不影响解析的重资源与埋点请求"""
+        request = route.request
+        if request.resource_type in _BLOCKED_RESOURCE_TYPES or any(host in request.url for host in _TRACKER_HOSTS):
+            route.abort()
+        else:
+            route.continue_()
     
     def _close_browser(self):
-        """关闭浏览器"""
+        """关闭浏览器上下文（共享的浏览器进程不关闭）"""
         if self.page:
             self.page.close()
             self.page = None
         if self.context:
             self.context.close()
             self.context = None
-        if self.browser:
-            self.browser.close()
-            self.browser = None
-        if self._playwright:
-            self._playwright.stop()
-            self._playwright = None
+        self.browser = None
     
     def _load_cookies(self) -> bool:
         """加载Cookies"""
@@ -141,8 +240,7 @@ class XHSCrawler(BaseCrawler):
         
         try:
             if os.path.exists(self.cookie_file):
-                with open(self.cookie_file, 'r', encoding='utf-8') as f:
-                    cookies = json.load(f)
+                cookies = loads_cookies(Path(self.cookie_file).read_bytes())
                 self.context.add_cookies(cookies)
                 self.logger.info(f"已加载Cookies: {len(cookies)} 条")
                 self._logged_in = True
@@ -158,9 +256,7 @@ class XHSCrawler(BaseCrawler):
             return
         
         try:
-            cookies = self.context.cookies()
-            with open(self.cookie_file, 'w', encoding='utf-8') as f:
-                json.dump(cookies, f, ensure_ascii=False, indent=2)
+            Path(self.cookie_file).write_bytes(dumps_cookies(self.context.cookies()))
             self.logger.info(f"Cookies已保存: {self.cookie_file}")
         except Exception as e:
             self.logger.error(f"保存Cookies失败: {e}")
@@ -181,12 +277,13 @@ class XHSCrawler(BaseCrawler):
             是否登录成功
         """
         self._close_browser()  # 确保干净启动
-        self._init_browser(headless=False)  # 非无头模式
         
         try:
+            self._init_browser(headless=False, block_resources=False)  # 非无头模式，需要显示二维码
+            
             # 访问登录页面
-            self.page.goto(f"{self.BASE_URL}/explore", wait_until="networkidle", timeout=30000)
-            time.sleep(2)
+            self.page.goto(f"{self.BASE_URL}/explore", wait_until="load", timeout=30000)
+            self._wait_for_notes()
             
             # 检查是否已经登录
             if self._check_login_status():
@@ -199,9 +296,8 @@ class XHSCrawler(BaseCrawler):
             login_btn = self.page.query_selector('div.login-btn, .login, [class*="login"]')
             if login_btn:
                 login_btn.click()
-                time.sleep(1)
             
-            # 等待二维码出现
+            # 等待二维码出现（点击后弹窗出现即继续）
             self.logger.info("等待二维码出现...")
             qr_selector = 'img[class*="qrcode"], img[src*="qrcode"], canvas.qrcode, div.qrcode img'
             
@@ -226,15 +322,25 @@ class XHSCrawler(BaseCrawler):
             self.logger.info(f"等待登录（超时: {timeout}秒）...")
             self.logger.info("="*50)
             
-            # 等待登录成功
-            start_time = time.time()
-            while time.time() - start_time < timeout:
+            # 等待登录成功：页面每次请求登录相关接口时立即复查登录状态，没有相关请求时最多5秒复查一次
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    self.page.wait_for_event(
+                        "response",
+                        predicate=_is_login_response,
+                        timeout=min(remaining, 5) * 1000,
+                    )
+                except PlaywrightTimeoutError:
+                    pass
                 if self._check_login_status():
                     self.logger.info("登录成功！")
                     self.save_cookies()
                     self._logged_in = True
                     return True
-                time.sleep(2)
             
             self.logger.error("登录超时")
             return False
@@ -243,8 +349,9 @@ class XHSCrawler(BaseCrawler):
             self.logger.error(f"扫码登录失败: {e}")
             return False
         finally:
-            if self._logged_in:
-                self._close_browser()
+            # 登录用的是可见且不拦截资源的上下文，无论成功与否都关闭；
+            # 之后的搜索会按实例配置重建无头、拦截资源的上下文，并从文件加载刚保存的cookies
+            self._close_browser()
     
     def _check_login_status(self) -> bool:
         """检查当前页面是否已登录"""
@@ -300,37 +407,113 @@ class XHSCrawler(BaseCrawler):
             文章列表
         """
         self._init_browser()
-        articles = []
         sort = sort or self.SORT_TIME  # 默认按时间排序
         
+        self.logger.info(f"搜索: {keyword} (排序: {sort})")
         try:
-            # 构建搜索URL
-            search_url = f"{self.SEARCH_URL}?keyword={keyword}&source=web_search_result_notes"
-            if sort and sort != self.SORT_GENERAL:
-                search_url += f"&sort={sort}"
+            self.page.goto(self._search_url(keyword, sort), wait_until="domcontentloaded", timeout=30000)
+        except Exception as e:
+            self.logger.error(f"搜索出错: {e}")
+            return []
+        
+        return self._collect_notes(self.page, keyword, max_pages, sort, filter_hours)
+    
+    def search_many(
+        self,
+        keywords: List[str],
+        max_pages: int = 3,
+        concurrency: int = 4,
+        sort: str = None,
+        filter_hours: int = None
+    ) -> List[Article]:
+        """
+        在同一浏览器上下文中用多个标签页搜索多个关键词
+        
+        同步API的页面不能跨线程使用，因此每批先让各标签页同时开始导航（wait_until="commit"），
+        再逐个等待渲染、滚动并解析，页面加载在浏览器内并行进行；登录态在上下文内共享
+        
+        Args:
+            keywords: 关键词列表
+            max_pages: 每个关键词的最大滚动次数
+            concurrency: 同时打开的标签页数
+            sort: 排序方式
+            filter_hours: 只返回N小时内的内容（可选）
             
-            self.logger.info(f"搜索: {keyword} (排序: {sort})")
-            self.page.goto(search_url, wait_until="networkidle", timeout=30000)
-            time.sleep(2)
+        Returns:
+            所有文章列表（已去重）
+        """
+        if not keywords:
+            return []
+        
+        self._init_browser()
+        sort = sort or self.SORT_TIME
+        workers = max(1, min(concurrency, len(keywords)))
+        pages = [self.page] + [self.context.new_page() for _ in range(workers - 1)]
+        results = []
+        
+        try:
+            for start in range(0, len(keywords), workers):
+                batch = list(zip(pages, keywords[start:start + workers]))
+                started = []
+                for page, keyword in batch:
+                    self.logger.info(f"搜索: {keyword} (排序: {sort})")
+                    try:
+                        page.goto(self._search_url(keyword, sort), wait_until="commit", timeout=30000)
+                        started.append(True)
+                    except Exception as e:
+                        self.logger.error(f"搜索关键词 '{keyword}' 时出错: {e}")
+                        started.append(False)
+                
+                for (page, keyword), ok in zip(batch, started):
+                    results.append(self._collect_notes(page, keyword, max_pages, sort, filter_hours) if ok else [])
+                
+                if start + workers < len(keywords):
+                    self._sleep()
+        finally:
+            for page in pages[1:]:
+                page.close()
+        
+        return self._merge_results(results)
+    
+    def _search_url(self, keyword: str, sort: str) -> str:
+        """构建搜索URL"""
+        search_url = f"{self.SEARCH_URL}?keyword={keyword}&source=web_search_result_notes"
+        if sort and sort != self.SORT_GENERAL:
+            search_url += f"&sort={sort}"
+        return search_url
+    
+    def _collect_notes(
+        self,
+        page: Page,
+        keyword: str,
+        max_pages: int,
+        sort: str,
+        filter_hours: int = None
+    ) -> List[Article]:
+        """在已导航到搜索结果的标签页上滚动加载并解析笔记"""
+        articles = []
+        
+        try:
+            self._wait_for_notes(page)
             
             # 检查是否需要登录
-            if "login" in self.page.url.lower():
+            if "login" in page.url.lower():
                 self.logger.warning("需要登录，请先运行扫码登录")
                 return []
             
             # 如果有排序选项，尝试点击排序按钮
             if sort == self.SORT_TIME:
-                self._click_sort_by_time()
+                self._click_sort_by_time(page)
             
-            # 滚动加载
+            # 滚动加载（已采集URL集合跨批次维护，避免每批重建）
+            existing_urls = set()
             for i in range(max_pages):
                 self.logger.info(f"正在采集第 {i + 1}/{max_pages} 批数据...")
                 
                 # 解析当前页面
-                page_articles = self._parse_notes(keyword)
+                page_articles = self._parse_notes(keyword, page)
                 
                 # 去重添加
-                existing_urls = {a.url for a in articles}
                 new_count = 0
                 for article in page_articles:
                     if article.url not in existing_urls:
@@ -345,9 +528,22 @@ class XHSCrawler(BaseCrawler):
                     self.logger.info("没有更多新内容")
                     break
                 
-                # 滚动到底部
-                self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                time.sleep(self.request_delay)
+                if i == max_pages - 1:
+                    break
+                
+                # 滚动到底部，等到新的笔记卡片出现（最多等 request_delay 秒）
+                baseline = page.evaluate(_NOTE_COUNT_JS)
+                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                try:
+                    page.wait_for_function(
+                        f"{_NOTE_COUNT_JS} > {baseline}",
+                        timeout=max(1500, int(self.request_delay * 1000)),
+                    )
+                except PlaywrightTimeoutError:
+                    # 卡片数不变也可能是列表回收了旧节点，交给下一轮解析判断是否到底
+                    self.logger.debug("滚动后未检测到新笔记")
+                # 少量随机停顿，避免过于规律的滚动节奏
+                time.sleep(0.3 + random.random() * 0.4)
             
             # 时间过滤
             if filter_hours and filter_hours > 0:
@@ -361,8 +557,19 @@ class XHSCrawler(BaseCrawler):
         
         return articles
     
-    def _click_sort_by_time(self):
+    def _wait_for_notes(self, page: Page = None, timeout: int = 15000) -> bool:
+        """等待笔记卡片渲染（XHS 有长轮询和埋点请求，networkidle 往往等不到）"""
+        page = page or self.page
+        try:
+            page.wait_for_selector(_NOTE_ITEM_SELECTOR, timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            self.logger.debug("等待笔记卡片超时")
+            return False
+    
+    def _click_sort_by_time(self, page: Page = None):
         """点击按时间排序"""
+        page = page or self.page
         try:
             # 小红书的排序按钮
             sort_selectors = [
@@ -374,7 +581,7 @@ class XHSCrawler(BaseCrawler):
             
             for selector in sort_selectors:
                 try:
-                    elem = self.page.query_selector(selector)
+                    elem = page.query_selector(selector)
                     if elem:
                         elem.click()
                         self.logger.info("已切换到最新排序")
@@ -387,118 +594,73 @@ class XHSCrawler(BaseCrawler):
             return False
             
         except Exception as e:
-            self.logger.debug(f"点击排序按钮失败: {e}")
+            self.logger.debug("点击排序按钮失败: %s", e)
             return False
     
-    def _parse_notes(self, keyword: str) -> List[Article]:
-        """解析页面中的笔记"""
+    def _parse_notes(self, keyword: str, page: Page = None) -> List[Article]:
+        """解析页面中的笔记（一次 page.evaluate 取回所有笔记字段）"""
         articles = []
+        page = page or self.page
         
         try:
-            # 尝试多种选择器
-            selectors = [
-                'section.note-item',
-                'div.note-item', 
-                'a.cover.ld.mask',
-                '[class*="note-item"]',
-                'div[data-v-a264b01c]',
-            ]
-            
-            note_items = []
-            for selector in selectors:
-                items = self.page.query_selector_all(selector)
-                if items:
-                    note_items = items
-                    break
-            
-            self.logger.debug(f"找到 {len(note_items)} 个笔记元素")
-            
-            for item in note_items:
-                try:
-                    article = self._parse_note_item(item, keyword)
-                    if article:
-                        articles.append(article)
-                except Exception as e:
-                    self.logger.debug(f"解析笔记失败: {e}")
-                    continue
+            notes = page.evaluate(_EXTRACT_NOTES_JS, {
+                "items": list(self._NOTE_ITEM_SELECTORS),
+                "title": list(self._TITLE_SELECTORS),
+                "author": list(self._AUTHOR_SELECTORS),
+                "likes": list(self._LIKES_SELECTORS),
+            })
+            self.logger.debug("找到 %d 个笔记元素", len(notes))
+            
+            for note in notes:
+                article = self._build_note_article(note, keyword)
+                if article:
+                    articles.append(article)
             
             # 备用：从HTML解析
             if not articles:
-                articles = self._parse_from_html(keyword)
+                articles = self._parse_from_html(keyword, page)
             
         except Exception as e:
             self.logger.error(f"解析笔记列表失败: {e}")
         
         return articles
     
-    def _parse_note_item(self, item, keyword: str) -> Optional[Article]:
-        """解析单个笔记"""
-        # 标题
-        title_selectors = ['.title', '.note-title', 'span.title', '.desc']
-        title = ""
-        for sel in title_selectors:
-            elem = item.query_selector(sel)
-            if elem:
-                title = elem.inner_text().strip()
-                if title:
-                    break
-        
-        # 链接
-        href = item.get_attribute('href')
-        if not href:
-            link_elem = item.query_selector('a')
-            href = link_elem.get_attribute('href') if link_elem else ""
-        
+    def _build_note_article(self, note: dict, keyword: str) -> Optional[Article]:
+        """由页面内提取的笔记字段构建 Article"""
+        title = note["title"]
+        href = note["href"]
         if href and not href.startswith('http'):
             href = f"{self.BASE_URL}{href}"
         
-        # 作者
-        author_selectors = ['.author', '.nickname', '.name', '.author-name']
-        author = "小红书用户"
-        for sel in author_selectors:
-            elem = item.query_selector(sel)
-            if elem:
-                author = elem.inner_text().strip() or author
-                break
-        
-        # 点赞数
-        likes = 0
-        likes_selectors = ['.like-count', '.count', '.like span', '[class*="like"] span']
-        for sel in likes_selectors:
-            elem = item.query_selector(sel)
-            if elem:
-                likes = self._parse_count(elem.inner_text())
-                break
-        
         if not title and not href:
             return None
         
         return Article(
             title=title or "无标题",
-            author=author,
+            author=note["author"] or "小红书用户",
             content="",
             url=href,
             platform=self.platform_name,
             keyword=keyword,
-            likes=likes,
+            likes=self._parse_count(note["likes"]),
         )
     
-    def _parse_from_html(self, keyword: str) -> List[Article]:
-        """从HTML解析（备用）"""
+    def _parse_from_html(self, keyword: str, page: Page = None) -> List[Article]:
+        """从HTML解析（备用）：优先解析页面内嵌的 __INITIAL_STATE__，失败时用正则匹配"""
         articles = []
+        page = page or self.page
         
         try:
-            html = self.page.content()
+            html = page.content()
             
-            # 尝试匹配JSON数据
-            patterns = [
-                r'"noteCard":\s*\{[^}]*?"title":\s*"([^"]+)"[^}]*?"noteId":\s*"([^"]+)"',
-                r'"title":\s*"([^"]{5,})"[^}]*?"id":\s*"([a-z0-9]{24})"',
-            ]
+            articles = self._parse_initial_state(html, keyword)
+            if articles:
+                return articles
             
+            # 尝试匹配JSON数据
             seen_ids = set()
-            for pattern in patterns:
-                matches = re.findall(pattern, html)
+            for pattern in (_NOTE_JSON_RE1, _NOTE_JSON_RE2):
+                matches = pattern.findall(html)
                 for title, note_id in matches:
                     if note_id not in seen_ids:
                         seen_ids.add(note_id)
@@ -512,7 +674,44 @@ class XHSCrawler(BaseCrawler):
                         ))
             
         except Exception as e:
-            self.logger.debug(f"HTML解析失败: {e}")
+            self.logger.debug("HTML解析失败: %s", e)
+        
+        return articles
+    
+    def _parse_initial_state(self, html: str, keyword: str) -> List[Article]:
+        """解析 window.__INITIAL_STATE__ 中的笔记卡片（含作者和点赞数）"""
+        match = _INITIAL_STATE_RE.search(html)
+        if not match:
+            return []
+        
+        # 状态对象是JS字面量，可能包含 undefined
+        raw = _UNDEFINED_RE.sub('null', match.group(1))
+        try:
+            state = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except ValueError as e:
+            self.logger.debug("__INITIAL_STATE__ 解析失败: %s", e)
+            return []
+        
+        articles = []
+        seen_ids = set()
+        for item in _iter_note_cards(state):
+            card = item["noteCard"]
+            note_id = item.get("id") or card.get("noteId")
+            if not note_id or note_id in seen_ids:
+                continue
+            seen_ids.add(note_id)
+            
+            user = card.get("user") or {}
+            interact = card.get("interactInfo") or {}
+            articles.append(Article(
+                title=card.get("displayTitle") or card.get("title") or "无标题",
+                author=user.get("nickname") or user.get("nickName") or "小红书用户",
+                content="",
+                url=f"{self.BASE_URL}/explore/{note_id}",
+                platform=self.platform_name,
+                keyword=keyword,
+                likes=self._parse_count(str(interact.get("likedCount") or "")),
+            ))
         
         return articles
     
@@ -529,13 +728,20 @@ class XHSCrawler(BaseCrawler):
                 return int(float(text.lower().replace('w', '')) * 10000)
             else:
                 # 移除非数字字符
-                num = re.sub(r'[^\d.]', '', text)
+                num = _COUNT_CLEAN_RE.sub('', text)
                 return int(float(num)) if num else 0
         except ValueError:
             return 0
     
-    def __del__(self):
-        """析构时关闭浏览器"""
+    def close(self):
+        """关闭本爬虫的浏览器上下文（当前线程共享的浏览器进程保留，供后续任务复用）"""
+        self._close_browser()
+    
+    def __enter__(self):
+        self._init_browser()
+        return self
+    
+    def __exit__(self, *exc):
         self._close_browser()
 
 
@@ -550,27 +756,26 @@ if __name__ == "__main__":
     parser.add_argument("--pages", "-p", type=int, default=2, help="滚动次数")
     args = parser.parse_args()
     
-    crawler = XHSCrawler(headless=False)
-    
-    if args.login:
-        success = crawler.login_by_qrcode()
-        print(f"登录{'成功' if success else '失败'}")
-    else:
-        sort_map = {
-            "general": XHSCrawler.SORT_GENERAL,
-            "time": XHSCrawler.SORT_TIME,
-            "popular": XHSCrawler.SORT_POPULAR,
-        }
-        
-        articles = crawler.search(
-            args.keyword, 
-            max_pages=args.pages,
-            sort=sort_map.get(args.sort, XHSCrawler.SORT_TIME)
-        )
-        
-        print(f"\n采集到 {len(articles)} 条笔记 (排序: {args.sort}):")
-        for i, article in enumerate(articles[:10], 1):
-            print(f"[{i}] {article.title}")
-            print(f"    作者: {article.author} | 点赞: {article.likes}")
-            print(f"    链接: {article.url}")
-            print()
+    with XHSCrawler(headless=False) as crawler:
+        if args.login:
+            success = crawler.login_by_qrcode()
+            print(f"登录{'成功' if success else '失败'}")
+        else:
+            sort_map = {
+                "general": XHSCrawler.SORT_GENERAL,
+                "time": XHSCrawler.SORT_TIME,
+                "popular": XHSCrawler.SORT_POPULAR,
+            }
+        
+            articles = crawler.search(
+                args.keyword, 
+                max_pages=args.pages,
+                sort=sort_map.get(args.sort, XHSCrawler.SORT_TIME)
+            )
+        
+            print(f"\n采集到 {len(articles)} 条笔记 (排序: {args.sort}):")
+            for i, article in enumerate(articles[:10], 1):
+                print(f"[{i}] {article.title}")
+                print(f"    作者: {article.author} | 点赞: {article.likes}")
+                print(f"    链接: {article.url}")
+                print()
@@ -5,17 +5,17 @@
 """
 import argparse
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List
 
-import yaml
-
 from crawlers import SogouWechatCrawler, XHSCrawler, Article
-from processors.dedup import DedupProcessor
+from processors.dedup import DedupProcessor, default_cache_file
 from processors.sentiment import SentimentAnalyzer
 from processors.filter import RelevanceFilter, TimeFilter
-from storage.feishu_client import FeishuClient
 from reporters.daily_report import DailyReporter
+from utils.yaml_cache import load_yaml
 
 # 配置日志
 logging.basicConfig(
@@ -26,9 +26,8 @@ logger = logging.getLogger(__name__)
 
 
 def load_keywords(config_path: str = "config/keywords.yaml") -> dict:
-    """加载关键词配置"""
-    with open(config_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    """加载关键词配置（返回值为共享的缓存结果，只读）"""
+    return load_yaml(config_path)
 
 
 def crawl_wechat(keywords: List[str], max_pages: int = 3, delay: float = 3.0) -> List[Article]:
@@ -63,12 +62,24 @@ def crawl_xhs(keywords: List[str], max_pages: int = 2, delay: float = 3.0) -> Li
         文章列表
     """
     logger.info("开始采集小红书...")
-    crawler = XHSCrawler(request_delay=delay, headless=True)
-    articles = crawler.search_multiple(keywords, max_pages=max_pages)
+    from crawlers._browser_pool import release_browsers
+    try:
+        with XHSCrawler(request_delay=delay, headless=True) as crawler:
+            articles = crawler.search_many(keywords, max_pages=max_pages)
+    finally:
+        # 浏览器按线程复用，在采集线程中运行时需在线程内关闭（atexit 只处理主线程）
+        release_browsers()
     logger.info(f"小红书采集完成，共 {len(articles)} 条笔记")
     return articles
 
 
+# 平台 -> 采集函数及默认参数；max_pages_key 为 search 配置中覆盖默认页数的键（None 表示不读配置）
+CRAWLER_REGISTRY = {
+    "wechat": {"func": crawl_wechat, "max_pages_key": "max_pages", "max_pages": 3},
+    "xhs": {"func": crawl_xhs, "max_pages_key": None, "max_pages": 2},
+}
+
+
 def run_crawl(args):
     """运行采集任务"""
     # 加载配置
@@ -82,52 +93,65 @@ def run_crawl(args):
     
     logger.info(f"开始采集，关键词: {keywords}")
     
-    all_articles = []
+    # 飞书配置在任务开始时读取一次，后续阶段只使用快照结果
+    # 飞书SDK导入较慢（数秒），不存储也不发简报时既不导入也不创建客户端
+    feishu = None
+    if args.save or args.briefing:
+        from storage.feishu_client import FeishuClient
+        feishu = FeishuClient()
+    feishu_ready = feishu is not None and feishu.is_configured()
+    webhook_url = feishu.webhook_url if feishu is not None else ""
     
-    # 采集微信公众号
-    if not args.platform or args.platform in ["wechat", "all"]:
-        wechat_articles = crawl_wechat(
-            keywords,
-            max_pages=search_config.get("max_pages", 3),
-            delay=search_config.get("request_delay", 3)
-        )
-        all_articles.extend(wechat_articles)
+    # 各平台采集互不共享状态，各占一个后台线程并发执行；主线程在每个平台完成后立即过滤、去重并做情感分析
+    platform = args.platform or "wechat"
+    selected = list(CRAWLER_REGISTRY) if platform == "all" else [platform]
     
-    # 采集小红书
-    if args.platform in ["xhs", "all"]:
-        xhs_articles = crawl_xhs(
-            keywords,
-            max_pages=2,
-            delay=search_config.get("request_delay", 3)
-        )
-        all_articles.extend(xhs_articles)
+    crawl_tasks = []
+    delay = search_config.get("request_delay", 3)
+    for name in selected:
+        spec = CRAWLER_REGISTRY.get(name)
+        if spec is None:
+            logger.warning(f"暂不支持采集平台: {name}")
+            continue
+        max_pages = spec["max_pages"]
+        if spec["max_pages_key"]:
+            max_pages = search_config.get(spec["max_pages_key"], max_pages)
+        crawl_tasks.append((spec["func"], {"max_pages": max_pages, "delay": delay}))
     
     # 时间过滤（只保留48小时内的内容）
     time_filter = TimeFilter(hours=search_config.get("time_filter_hours", 48))
-    all_articles = time_filter.filter_recent(all_articles)
-    logger.info(f"时间过滤后剩余 {len(all_articles)} 篇文章")
-    
     # 关键词组合过滤（排除不相关文章）
-    if args.filter:
-        relevance_filter = RelevanceFilter()
-        filtered_articles = relevance_filter.filter_articles(all_articles)
-        logger.info(f"过滤后剩余 {len(filtered_articles)} 篇相关文章（过滤掉 {len(all_articles) - len(filtered_articles)} 篇）")
-        all_articles = filtered_articles
+    relevance_filter = RelevanceFilter() if args.filter else None
+    analyzer = SentimentAnalyzer() if args.analyze else None
+    # 去重（跨运行缓存，跳过往次已处理的文章）；去重状态跨批次保留，每批先去重再做情感分析，重复文章不再打分
+    dedup = DedupProcessor(cache_file=default_cache_file())
     
-    # 去重
-    dedup = DedupProcessor()
-    unique_articles = dedup.deduplicate(all_articles)
-    logger.info(f"去重后剩余 {len(unique_articles)} 篇文章")
+    unique_articles = []
+    with ThreadPoolExecutor(max_workers=max(1, len(crawl_tasks))) as executor:
+        futures = [executor.submit(func, keywords, **kwargs) for func, kwargs in crawl_tasks]
+        # 按提交顺序取结果，保证合并后的文章顺序与串行采集一致
+        for future in futures:
+            batch = time_filter.filter_recent(future.result())
+            logger.info(f"时间过滤后剩余 {len(batch)} 篇文章")
+            
+            if relevance_filter:
+                filtered_batch = relevance_filter.filter_articles(batch)
+                logger.info(f"过滤后剩余 {len(filtered_batch)} 篇相关文章（过滤掉 {len(batch) - len(filtered_batch)} 篇）")
+                batch = filtered_batch
+            
+            batch = dedup.deduplicate(batch)
+            
+            # 情感分析
+            if analyzer:
+                batch = analyzer.analyze_articles(batch)
+            
+            unique_articles.extend(batch)
     
-    # 情感分析
-    if args.analyze:
-        analyzer = SentimentAnalyzer()
-        unique_articles = analyzer.analyze_articles(unique_articles)
+    logger.info(f"去重后剩余 {len(unique_articles)} 篇文章")
     
     # 存储到飞书
-    feishu = FeishuClient()
     if args.save:
-        if feishu.is_configured():
+        if feishu_ready:
             result = feishu.add_new_articles(unique_articles)
             logger.info(f"飞书存储结果: 成功 {result['success']}, 失败 {result['failed']}, 跳过 {result['skipped']}")
         else:
@@ -141,7 +165,7 @@ def run_crawl(args):
         print("\n" + full_report)
         
         # 发送到飞书Webhook
-        if feishu.webhook_url:
+        if webhook_url:
             feishu.send_webhook_message(full_report)
             logger.info("简报已发送到飞书群")
     
@@ -152,23 +176,19 @@ def run_crawl(args):
     print(f"{'='*60}\n")
     
     # 按关键词统计
-    keyword_stats = {}
-    for article in unique_articles:
-        keyword_stats[article.keyword] = keyword_stats.get(article.keyword, 0) + 1
+    keyword_stats = Counter(article.keyword for article in unique_articles)
     
     print("按关键词统计:")
-    for kw, count in keyword_stats.items():
+    for kw, count in keyword_stats.most_common():
         print(f"  {kw}: {count} 篇")
     
     # 情感统计
     if args.analyze:
-        sentiment_stats = {"积极": 0, "消极": 0, "中立": 0}
-        for article in unique_articles:
-            if article.sentiment:
-                sentiment_stats[article.sentiment] = sentiment_stats.get(article.sentiment, 0) + 1
+        sentiment_stats = Counter(article.sentiment for article in unique_articles if article.sentiment)
         
         print("\n情感分析统计:")
-        for label, count in sentiment_stats.items():
+        for label in ("积极", "消极", "中立"):
+            count = sentiment_stats[label]
             pct = count / len(unique_articles) * 100 if unique_articles else 0
             print(f"  {label}: {count} 篇 ({pct:.1f}%)")
     
@@ -256,6 +276,7 @@ def test_config():
     
     # 测试飞书配置
     try:
+        from storage.feishu_client import FeishuClient
         feishu = FeishuClient()
         if feishu.is_configured():
             print("✓ 飞书配置完整")
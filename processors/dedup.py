@@ -3,72 +3,136 @@
 用于对采集的文章进行去重
 """
 import hashlib
+import logging
+import sqlite3
+import time
+from contextlib import closing
 from typing import List, Set
 from crawlers.base import Article
+from utils.runtime_dir import get_runtime_data_dir
 
-# 导入路径管理（缓存文件在未来可能需要持久化）
+# 可选依赖：更快的非加密哈希
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# 导入路径管理（去重缓存文件）
 try:
     from path_manager import DEDUP_CACHE_FILE
 except ImportError:
     DEDUP_CACHE_FILE = None
 
+logger = logging.getLogger(__name__)
+
+def default_cache_file() -> str:
+    """跨运行去重缓存的默认路径（运行时数据目录下），供每日任务等需要跳过往次已处理文章的调用方使用"""
+    return str(DEDUP_CACHE_FILE or get_runtime_data_dir() / "dedup_cache.db")
+
+
+# 当前使用的哈希算法，写入缓存以免切换算法后旧键失效却仍被加载
+_HASH_NAME = "xxh64" if xxhash is not None else "blake2b64"
+
 
 class DedupProcessor:
     """去重处理器"""
     
-    def __init__(self, cache_file: str = None):
+    def __init__(self, cache_file: str = None, ttl_days: int = 7):
         """
         初始化去重处理器
         
         Args:
-            cache_file: 缓存文件路径（未来功能）
+            cache_file: 去重缓存文件路径（SQLite），设置后跨运行去重
+            ttl_days: 缓存中去重键的保留天数
         """
-        self.seen_urls: Set[str] = set()
-        self.seen_hashes: Set[str] = set()
+        # URL键与内容键共用一个集合（均为64位整数，两类键冲突概率可忽略）
+        self._seen: Set[int] = set()
         self.cache_file = cache_file or (str(DEDUP_CACHE_FILE) if DEDUP_CACHE_FILE else None)
+        self.ttl_days = ttl_days
+        if self.cache_file:
+            self._load_cache()
     
-    def _get_content_hash(self, article: Article) -> str:
-        """基于内容生成哈希"""
-        content = f"{article.title}|{article.author}|{article.platform}"
-        return hashlib.md5(content.encode()).hexdigest()
+    @staticmethod
+    def _hash64(text: str) -> int:
+        """64位有符号整数哈希（可直接存入SQLite；跨进程稳定，不使用内置 hash()）"""
+        data = text.encode()
+        if xxhash is not None:
+            digest = xxhash.xxh64_digest(data)
+        else:
+            digest = hashlib.blake2b(data, digest_size=8).digest()
+        return int.from_bytes(digest, "little", signed=True)
     
-    def _get_url_hash(self, url: str) -> str:
-        """基于URL生成哈希"""
-        return hashlib.md5(url.encode()).hexdigest()
+    def _connect(self) -> sqlite3.Connection:
+        """打开缓存数据库并确保表结构存在"""
+        conn = sqlite3.connect(self.cache_file)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS seen (h INTEGER PRIMARY KEY, ts INTEGER)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        return conn
+    
+    def _load_cache(self):
+        """加载保留期内的去重键，并清理过期记录"""
+        cutoff = int(time.time()) - self.ttl_days * 86400
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'hash'").fetchone()
+                if row is None or row[0] != _HASH_NAME:
+                    conn.execute("DELETE FROM seen")
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES ('hash', ?)", (_HASH_NAME,))
+                conn.execute("DELETE FROM seen WHERE ts <= ?", (cutoff,))
+                self._seen.update(h for (h,) in conn.execute("SELECT h FROM seen"))
+        except sqlite3.Error as e:
+            logger.warning(f"加载去重缓存失败: {e}")
+    
+    def _save_keys(self, keys: List[int]):
+        """在一个事务中写入新的去重键"""
+        now = int(time.time())
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany("INSERT OR IGNORE INTO seen VALUES (?, ?)", ((h, now) for h in keys))
+        except sqlite3.Error as e:
+            logger.warning(f"保存去重缓存失败: {e}")
     
     def deduplicate(self, articles: List[Article]) -> List[Article]:
         """
         对文章列表进行去重
         
+        同时基于URL和内容（标题+作者+平台，防止相同内容不同URL的情况）去重，
+        内容字段用 \\x1f 分隔，标题中出现 | 也不会误判
+        
         Args:
             articles: 文章列表
             
         Returns:
             去重后的文章列表
         """
+        seen = self._seen
+        seen_add = seen.add
+        hash64 = self._hash64
         unique_articles = []
+        append = unique_articles.append
+        new_keys = [] if self.cache_file else None
         
         for article in articles:
-            # 基于URL去重
-            url_hash = self._get_url_hash(article.url)
-            if url_hash in self.seen_urls:
+            url_key = hash64(article.url)
+            content_key = hash64(f"{article.title}\x1f{article.author}\x1f{article.platform}")
+            if url_key in seen or content_key in seen:
                 continue
-            
-            # 基于内容去重（防止相同内容不同URL的情况）
-            content_hash = self._get_content_hash(article)
-            if content_hash in self.seen_hashes:
-                continue
-            
-            self.seen_urls.add(url_hash)
-            self.seen_hashes.add(content_hash)
-            unique_articles.append(article)
+            seen_add(url_key)
+            seen_add(content_key)
+            append(article)
+            if new_keys is not None:
+                new_keys += (url_key, content_key)
+        
+        if new_keys:
+            self._save_keys(new_keys)
         
         return unique_articles
     
     def reset(self):
-        """重置去重状态"""
-        self.seen_urls.clear()
-        self.seen_hashes.clear()
+        """重置内存中的去重状态（不清空缓存文件）"""
+        self._seen.clear()
 
 
 
@@ -3,11 +3,13 @@
 用于过滤掉与目标主题无关的文章以及过期内容
 """
 import logging
+import re
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Set, Optional
+from typing import Callable, List, Dict, Set, Optional, Tuple
 
-from crawlers.base import Article
+from crawlers.base import Article, ArticleBatch
 
 # 导入配置管理
 try:
@@ -15,24 +17,51 @@ try:
 except ImportError:
     get_config_manager = None
 
+# 可选依赖：pyahocorasick，未安装时使用合并后的正则匹配
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=32)
+def _compile_matcher(patterns: Tuple[str, ...]) -> Callable[[str], bool]:
+    """
+    将一组关联词编译为“文本是否包含任一关联词”的判断函数（忽略大小写）
+    
+    按关联词元组缓存，多个过滤器实例（如调度器每次任务新建的实例）共享同一份编译结果。
+    优先使用 Aho-Corasick 自动机：只扫描一遍文本，与关联词数量无关；
+    未安装 pyahocorasick 时合并为一个正则，由 re 在C层一次匹配
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for pattern in patterns:
+            automaton.add_word(pattern.casefold(), True)
+        automaton.make_automaton()
+        
+        def match(text: str) -> bool:
+            # casefold 比 lower 的 Unicode 大小写归一更完整；命中第一个关联词即返回
+            return next(automaton.iter(text.casefold()), None) is not None
+        
+        return match
+    
+    regex = re.compile("|".join(map(re.escape, patterns)), re.IGNORECASE)
+    return lambda text: regex.search(text) is not None
+
+
 class RelevanceFilter:
     """关键词相关性过滤器"""
     
-    # 默认的关联词规则
-    # Monolith/MONOLITH 必须同时包含这些词之一才保留
+    # 默认的关联词规则（关键词不区分大小写，Monolith/MONOLITH 共用一条）
+    # Monolith 必须同时包含这些词之一才保留
     DEFAULT_RELEVANCE_RULES = {
         "Monolith": [
             "砺思资本", "砺思", "曹曦", "投资", "基金", "资本", 
             "融资", "创业", "实习", "VC", "PE", "管理"
         ],
-        "MONOLITH": [
-            "砺思资本", "砺思", "曹曦", "投资", "基金", "资本",
-            "融资", "创业", "实习", "VC", "PE", "管理"
-        ],
     }
     
     # 这些关键词的文章直接保留，不需要过滤
@@ -59,7 +88,27 @@ class RelevanceFilter:
         else:
             self.relevance_rules = self.DEFAULT_RELEVANCE_RULES.copy()
         
-        self.whitelist_keywords = self.WHITELIST_KEYWORDS.copy()
+        self.relevance_rules = self._normalize_rules(self.relevance_rules)
+        self.whitelist_keywords = {k.casefold() for k in self.WHITELIST_KEYWORDS}
+        # 关联词列表为空的关键词没有匹配器，视为不相关
+        self._matchers = {
+            keyword: _compile_matcher(tuple(related_keywords))
+            for keyword, related_keywords in self.relevance_rules.items()
+            if related_keywords
+        }
+    
+    @staticmethod
+    def _normalize_rules(rules: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """
+        关键词统一转为字符串并 casefold；仅大小写不同的关键词合并为一条，关联词去重并保持顺序
+        
+        YAML 中未加引号的数字（如 2026）会被解析为 int，这里一并转为字符串
+        """
+        normalized = {}
+        for keyword, related_keywords in rules.items():
+            merged = normalized.setdefault(str(keyword).casefold(), [])
+            merged.extend(str(r) for r in related_keywords if str(r) not in merged)
+        return normalized
     
     def _load_rules(self, config_path: str) -> Dict[str, List[str]]:
         """已弃用：从配置文件加载过滤规则（保留用于兼容性）"""
@@ -75,7 +124,7 @@ class RelevanceFilter:
         Returns:
             是否相关
         """
-        keyword = article.keyword
+        keyword = str(article.keyword).casefold()
         
         # 白名单关键词直接通过
         if keyword in self.whitelist_keywords:
@@ -86,18 +135,29 @@ class RelevanceFilter:
             # 没有定义规则的关键词，默认通过
             return True
         
-        # 获取关联词列表
-        related_keywords = self.relevance_rules[keyword]
-        
         # 合并标题和内容进行检查
-        text = f"{article.title} {article.content} {article.author}".lower()
+        text = f"{article.title} {article.content} {article.author}"
         
         # 检查是否包含任一关联词
-        for related in related_keywords:
-            if related.lower() in text:
-                return True
+        matcher = self._matchers.get(keyword)
+        return matcher is not None and matcher(text)
+    
+    def partition_articles(self, articles: List[Article]) -> Tuple[List[Article], List[Article]]:
+        """
+        一次遍历将文章分为相关与不相关两组（每篇只判断一次）
         
-        return False
+        Args:
+            articles: 文章列表
+            
+        Returns:
+            (保留的文章列表, 被过滤掉的文章列表)
+        """
+        kept = []
+        removed = []
+        is_relevant = self.is_relevant
+        for article in articles:
+            (kept if is_relevant(article) else removed).append(article)
+        return kept, removed
     
     def filter_articles(self, articles: List[Article]) -> List[Article]:
         """
@@ -112,12 +172,10 @@ class RelevanceFilter:
         if not articles:
             return []
         
-        original_count = len(articles)
-        filtered = [a for a in articles if self.is_relevant(a)]
-        removed_count = original_count - len(filtered)
+        filtered, removed = self.partition_articles(articles)
         
-        if removed_count > 0:
-            self.logger.info(f"过滤掉 {removed_count} 篇不相关文章，保留 {len(filtered)} 篇")
+        if removed:
+            self.logger.info(f"过滤掉 {len(removed)} 篇不相关文章，保留 {len(filtered)} 篇")
         
         return filtered
     
@@ -131,7 +189,7 @@ class RelevanceFilter:
         Returns:
             被过滤掉的文章列表
         """
-        return [a for a in articles if not self.is_relevant(a)]
+        return self.partition_articles(articles)[1]
 
 
 # 测试代码
@@ -239,21 +297,11 @@ class TimeFilter:
         filter_hours = hours if hours is not None else self.hours
         cutoff = datetime.now() - timedelta(hours=filter_hours)
         
-        filtered = []
-        skipped_no_time = 0
-        skipped_too_old = 0
-        
-        for article in articles:
-            if article.published_at is None:
-                # 没有发布时间的文章，保守处理，保留
-                filtered.append(article)
-                skipped_no_time += 1
-            elif article.published_at > cutoff:
-                # 在时间范围内，保留
-                filtered.append(article)
-            else:
-                # 太旧，过滤掉
-                skipped_too_old += 1
+        # 没有发布时间的文章，保守处理，保留
+        batch = ArticleBatch(articles)
+        filtered = batch.select(batch.published_after_mask(cutoff, keep_missing=True))
+        skipped_no_time = batch.missing_published_count()
+        skipped_too_old = len(articles) - len(filtered)
         
         self.logger.info(
             f"时间过滤: 保留 {len(filtered)} 篇 "
@@ -277,14 +325,15 @@ class TimeFilter:
         if not articles:
             return []
         
-        target_day = target_date.date()
+        # 按日序号（整数）比较，不必为每篇文章构造 date 对象
+        target_ordinal = target_date.toordinal()
         filtered = [
             a for a in articles 
-            if a.published_at and a.published_at.date() == target_day
+            if a.published_at is not None and a.published_at.toordinal() == target_ordinal
         ]
         
         self.logger.info(
-            f"日期过滤 ({target_day}): {len(articles)} -> {len(filtered)} 篇"
+            f"日期过滤 ({target_date.date()}): {len(articles)} -> {len(filtered)} 篇"
         )
         
         return filtered
@@ -2,16 +2,40 @@
 情感分析处理器
 使用SnowNLP对文本进行情感分析
 """
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Tuple
 import logging
-
-from snownlp import SnowNLP
+import multiprocessing
+import os
 
 from crawlers.base import Article
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=4096)
+def _sentiment_score(text: str) -> float:
+    """SnowNLP 情感分数（进程内按文本缓存，重复采集到的相同内容不再重新计算）"""
+    # 首次调用时才加载（导入时即加载词典和模型，约需数秒），不做情感分析的流程无需付出这部分开销
+    from snownlp import SnowNLP
+    return SnowNLP(text).sentiments
+
+
+# 子进程内的分析器实例（由 _init_worker 创建）
+_worker_analyzer = None
+
+
+def _init_worker(positive_threshold: float, negative_threshold: float):
+    """子进程初始化：创建一次分析器，之后复用"""
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer(positive_threshold, negative_threshold)
+
+
+def _analyze_in_worker(text: str) -> Tuple[str, float]:
+    """在子进程中分析单条文本"""
+    return _worker_analyzer.analyze_text(text)
+
 
 class SentimentAnalyzer:
     """情感分析器"""
@@ -20,16 +44,28 @@ class SentimentAnalyzer:
     POSITIVE_THRESHOLD = 0.6   # 大于此值为积极
     NEGATIVE_THRESHOLD = 0.4   # 小于此值为消极
     
-    def __init__(self, positive_threshold: float = 0.6, negative_threshold: float = 0.4):
+    # 文章数达到该值才启用多进程（SnowNLP 为纯 Python 计算，受 GIL 限制无法用线程并发；
+    # 子进程以 spawn 方式启动需重新加载模型，文章少时得不偿失）
+    PARALLEL_THRESHOLD = 500
+    
+    def __init__(
+        self,
+        positive_threshold: float = 0.6,
+        negative_threshold: float = 0.4,
+        max_chars: int = 1024
+    ):
         """
         初始化情感分析器
         
         Args:
             positive_threshold: 积极情感阈值
             negative_threshold: 消极情感阈值
+            max_chars: 参与分析的最大字符数（标题+内容截断到此长度，开头部分已足以判断倾向，
+                       同时避免超长正文拖慢分词）
         """
         self.positive_threshold = positive_threshold
         self.negative_threshold = negative_threshold
+        self.max_chars = max_chars
         self.logger = logging.getLogger(self.__class__.__name__)
     
     def analyze_text(self, text: str) -> Tuple[str, float]:
@@ -46,8 +82,7 @@ class SentimentAnalyzer:
             return "中立", 0.5
         
         try:
-            s = SnowNLP(text)
-            score = s.sentiments  # 返回0-1之间的值
+            score = _sentiment_score(text)  # 返回0-1之间的值
             
             if score >= self.positive_threshold:
                 label = "积极"
@@ -72,32 +107,38 @@ class SentimentAnalyzer:
         Returns:
             更新情感标注后的文章对象
         """
-        # 合并标题和内容进行分析
-        text = f"{article.title} {article.content}"
-        label, score = self.analyze_text(text)
+        label, score = self.analyze_text(self._article_text(article))
         
         article.sentiment = label
         article.sentiment_score = score
         
         return article
     
-    def analyze_articles(self, articles: List[Article]) -> List[Article]:
+    def _article_text(self, article: Article) -> str:
+        """合并标题和内容作为分析文本，并截断到 max_chars"""
+        return f"{article.title} {article.content}"[:self.max_chars]
+    
+    def analyze_articles(self, articles: List[Article], workers: Optional[int] = None) -> List[Article]:
         """
         批量分析文章情感
         
         Args:
             articles: 文章列表
+            workers: 并行进程数，默认为CPU核数；去重后的文本数不足 PARALLEL_THRESHOLD 时始终在当前进程中分析
             
         Returns:
             更新情感标注后的文章列表
         """
         self.logger.info(f"开始情感分析，共 {len(articles)} 篇文章")
         
-        for i, article in enumerate(articles):
-            self.analyze_article(article)
-            
-            if (i + 1) % 20 == 0:
-                self.logger.info(f"已分析 {i + 1}/{len(articles)} 篇")
+        truncated = sum(1 for a in articles if len(a.title) + len(a.content) + 1 > self.max_chars)
+        if truncated:
+            self.logger.info(f"{truncated} 篇文章超过 {self.max_chars} 字，只分析开头部分")
+        
+        results = self.analyze_batch([self._article_text(article) for article in articles], workers)
+        for article, (label, score) in zip(articles, results):
+            article.sentiment = label
+            article.sentiment_score = score
         
         # 统计结果
         stats = self.get_statistics(articles)
@@ -105,6 +146,71 @@ class SentimentAnalyzer:
         
         return articles
     
+    def analyze_batch(self, texts: List[str], workers: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        批量分析文本情感，相同文本只分析一次（多平台、多关键词常采集到同一篇内容）
+        
+        Args:
+            texts: 待分析文本列表
+            workers: 并行进程数，默认为CPU核数；去重后文本数不足 PARALLEL_THRESHOLD 时始终在当前进程中分析
+            
+        Returns:
+            与 texts 一一对应的 (情感标签, 情感分数) 列表
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(unique_texts) >= self.PARALLEL_THRESHOLD:
+            try:
+                results = self._analyze_parallel(unique_texts, workers)
+            except (OSError, RuntimeError) as e:
+                # 无法创建子进程（如受限环境）时退回串行分析
+                self.logger.warning(f"多进程情感分析不可用，改为串行: {e}")
+                results = self._analyze_serial(unique_texts)
+        else:
+            results = self._analyze_serial(unique_texts)
+        
+        if len(unique_texts) == len(texts):
+            return results
+        by_text = dict(zip(unique_texts, results))
+        return [by_text[text] for text in texts]
+    
+    def _analyze_serial(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """在当前进程中逐条分析"""
+        results = []
+        total = len(texts)
+        log_progress = self.logger.isEnabledFor(logging.INFO)
+        for i, text in enumerate(texts):
+            results.append(self.analyze_text(text))
+            
+            if log_progress and (i + 1) % 20 == 0:
+                self.logger.info("已分析 %d/%d 篇", i + 1, total)
+        return results
+    
+    def _analyze_parallel(self, texts: List[str], workers: int) -> List[Tuple[str, float]]:
+        """
+        分块交给进程池分析，只传递文本和 (标签, 分数)，结果按原顺序返回
+        
+        使用 spawn 启动子进程，避免在已有后台线程（Web 服务、Playwright）的进程中 fork
+        """
+        chunksize = max(1, len(texts) // (workers * 4))
+        
+        results = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.positive_threshold, self.negative_threshold),
+        ) as executor:
+            total = len(texts)
+            log_progress = self.logger.isEnabledFor(logging.INFO)
+            for i, result in enumerate(executor.map(_analyze_in_worker, texts, chunksize=chunksize)):
+                results.append(result)
+                
+                if log_progress and (i + 1) % 20 == 0:
+                    self.logger.info("已分析 %d/%d 篇", i + 1, total)
+        return results
+    
     def get_statistics(self, articles: List[Article]) -> dict:
         """
         获取情感统计
@@ -115,11 +221,12 @@ class SentimentAnalyzer:
         Returns:
             统计结果
         """
+        total = len(articles)
         stats = {
             "positive": 0,
             "negative": 0,
             "neutral": 0,
-            "total": len(articles),
+            "total": total,
             "avg_score": 0.0
         }
         
@@ -136,8 +243,8 @@ class SentimentAnalyzer:
             if article.sentiment_score is not None:
                 total_score += article.sentiment_score
         
-        if articles:
-            stats["avg_score"] = round(total_score / len(articles), 4)
+        if total:
+            stats["avg_score"] = round(total_score / total, 4)
         
         return stats
 
@@ -3,9 +3,10 @@
 生成舆情监测日报并推送到飞书
 支持LLM生成智能简报
 """
+import io
 from datetime import datetime
 from typing import List, Dict, Optional
-from collections import defaultdict
+from collections import Counter
 import logging
 
 from crawlers.base import Article
@@ -33,19 +34,27 @@ class DailyReporter:
         """延迟加载LLM客户端"""
         if self._llm_client is None and self.use_llm:
             try:
-                from utils.llm_client import LLMClient
-                self._llm_client = LLMClient()
+                from utils.llm_client import get_llm_client
+                self._llm_client = get_llm_client()
             except Exception as e:
                 self.logger.warning(f"LLM客户端加载失败: {e}")
         return self._llm_client
     
-    def generate_report(self, articles: List[Article], date: datetime = None) -> str:
+    def generate_report(
+        self,
+        articles: List[Article],
+        date: datetime = None,
+        stats: Dict = None,
+        buckets: Dict[str, List[Article]] = None
+    ) -> str:
         """
         生成日报文本
         
         Args:
             articles: 文章列表
             date: 报告日期，默认为今天
+            stats: 已计算好的统计数据（_calculate_stats 的结果），不传则现算
+            buckets: 已按情感分好的文章（_bucket_by_sentiment 的结果），不传则现算
             
         Returns:
             日报文本
@@ -56,102 +65,111 @@ class DailyReporter:
         date_str = date.strftime("%Y年%m月%d日")
         
         # 统计数据
-        stats = self._calculate_stats(articles)
-        
-        # 生成报告
-        report_lines = [
-            f"📊 舆情监测日报 - {date_str}",
-            "=" * 40,
-            "",
-            f"📈 今日概览",
-            f"• 采集文章总数: {stats['total']} 篇",
-            "",
-        ]
+        if stats is None:
+            stats = self._calculate_stats(articles)
+        if buckets is None:
+            buckets = self._bucket_by_sentiment(articles)
+        
+        # 生成报告（逐行写入缓冲区，不保留中间行列表）
+        buf = io.StringIO()
+        w = buf.write
+        w(f"📊 舆情监测日报 - {date_str}\n")
+        w("=" * 40 + "\n")
+        w("\n")
+        w("📈 今日概览\n")
+        w(f"• 采集文章总数: {stats['total']} 篇\n")
+        w("\n")
         
         # 平台分布
         if stats['by_platform']:
-            report_lines.append("📱 平台分布:")
+            w("📱 平台分布:\n")
             for platform, count in stats['by_platform'].items():
                 pct = count / stats['total'] * 100 if stats['total'] else 0
-                report_lines.append(f"  • {platform}: {count} 篇 ({pct:.1f}%)")
-            report_lines.append("")
+                w(f"  • {platform}: {count} 篇 ({pct:.1f}%)\n")
+            w("\n")
         
         # 关键词分布
         if stats['by_keyword']:
-            report_lines.append("🔑 关键词分布:")
+            w("🔑 关键词分布:\n")
             for keyword, count in stats['by_keyword'].items():
                 pct = count / stats['total'] * 100 if stats['total'] else 0
-                report_lines.append(f"  • {keyword}: {count} 篇 ({pct:.1f}%)")
-            report_lines.append("")
+                w(f"  • {keyword}: {count} 篇 ({pct:.1f}%)\n")
+            w("\n")
         
         # 情感分析
         if stats['by_sentiment']:
-            report_lines.append("💬 情感分析:")
+            w("💬 情感分析:\n")
             sentiment_emoji = {"积极": "😊", "消极": "😟", "中立": "😐"}
             for sentiment, count in stats['by_sentiment'].items():
                 pct = count / stats['total'] * 100 if stats['total'] else 0
                 emoji = sentiment_emoji.get(sentiment, "")
-                report_lines.append(f"  • {emoji} {sentiment}: {count} 篇 ({pct:.1f}%)")
-            report_lines.append("")
+                w(f"  • {emoji} {sentiment}: {count} 篇 ({pct:.1f}%)\n")
+            w("\n")
         
         # 重点内容
-        report_lines.append("📌 重点内容摘要:")
-        report_lines.append("-" * 40)
+        w("📌 重点内容摘要:\n")
+        w("-" * 40 + "\n")
         
         # 按情感分组展示
         # 先展示消极内容（需要关注）
-        negative_articles = [a for a in articles if a.sentiment == "消极"]
+        negative_articles = buckets["消极"]
         if negative_articles:
-            report_lines.append("")
-            report_lines.append("⚠️ 需关注（消极内容）:")
+            w("\n")
+            w("⚠️ 需关注（消极内容）:\n")
             for i, article in enumerate(negative_articles[:3], 1):
-                report_lines.append(f"  {i}. {article.title[:40]}...")
-                report_lines.append(f"     来源: {article.author} | 关键词: {article.keyword}")
+                w(f"  {i}. {article.title[:40]}...\n")
+                w(f"     来源: {article.author} | 关键词: {article.keyword}\n")
         
         # 展示积极内容
-        positive_articles = [a for a in articles if a.sentiment == "积极"]
+        positive_articles = buckets["积极"]
         if positive_articles:
-            report_lines.append("")
-            report_lines.append("✅ 正面报道:")
+            w("\n")
+            w("✅ 正面报道:\n")
             for i, article in enumerate(positive_articles[:3], 1):
-                report_lines.append(f"  {i}. {article.title[:40]}...")
-                report_lines.append(f"     来源: {article.author} | 关键词: {article.keyword}")
+                w(f"  {i}. {article.title[:40]}...\n")
+                w(f"     来源: {article.author} | 关键词: {article.keyword}\n")
         
-        report_lines.append("")
-        report_lines.append("=" * 40)
-        report_lines.append(f"报告生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        w("\n")
+        w("=" * 40 + "\n")
+        w(f"报告生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        return "\n".join(report_lines)
+        return buf.getvalue()
     
     def _calculate_stats(self, articles: List[Article]) -> Dict:
         """计算统计数据"""
+        # Counter 的计数在C层完成，most_common() 直接给出按数量降序的结果
         stats = {
             "total": len(articles),
-            "by_platform": defaultdict(int),
-            "by_keyword": defaultdict(int),
-            "by_sentiment": defaultdict(int),
+            "by_platform": dict(Counter(a.platform for a in articles).most_common()),
+            "by_keyword": dict(Counter(a.keyword for a in articles).most_common()),
+            "by_sentiment": dict(Counter(a.sentiment for a in articles if a.sentiment).most_common()),
         }
         
-        for article in articles:
-            stats["by_platform"][article.platform] += 1
-            stats["by_keyword"][article.keyword] += 1
-            if article.sentiment:
-                stats["by_sentiment"][article.sentiment] += 1
-        
-        # 转换为普通字典并排序
-        stats["by_platform"] = dict(sorted(stats["by_platform"].items(), key=lambda x: x[1], reverse=True))
-        stats["by_keyword"] = dict(sorted(stats["by_keyword"].items(), key=lambda x: x[1], reverse=True))
-        stats["by_sentiment"] = dict(sorted(stats["by_sentiment"].items(), key=lambda x: x[1], reverse=True))
-        
         return stats
     
-    def generate_markdown_report(self, articles: List[Article], date: datetime = None) -> str:
+    @staticmethod
+    def _bucket_by_sentiment(articles: List[Article]) -> Dict[str, List[Article]]:
+        """一次遍历按情感标签分组（保持原顺序；未标注的文章归入键 None）"""
+        buckets = {"消极": [], "积极": [], "中立": []}
+        for article in articles:
+            buckets.setdefault(article.sentiment, []).append(article)
+        return buckets
+    
+    def generate_markdown_report(
+        self,
+        articles: List[Article],
+        date: datetime = None,
+        stats: Dict = None,
+        buckets: Dict[str, List[Article]] = None
+    ) -> str:
         """
         生成Markdown格式的日报
         
         Args:
             articles: 文章列表
             date: 报告日期
+            stats: 已计算好的统计数据，不传则现算
+            buckets: 已按情感分好的文章，不传则现算
             
         Returns:
             Markdown格式的日报
@@ -160,82 +178,85 @@ class DailyReporter:
             date = datetime.now()
         
         date_str = date.strftime("%Y年%m月%d日")
-        stats = self._calculate_stats(articles)
-        
-        md_lines = [
-            f"# 舆情监测日报 - {date_str}",
-            "",
-            "## 📈 今日概览",
-            "",
-            f"| 指标 | 数值 |",
-            f"|------|------|",
-            f"| 采集文章总数 | {stats['total']} 篇 |",
-            "",
-        ]
+        if stats is None:
+            stats = self._calculate_stats(articles)
+        if buckets is None:
+            buckets = self._bucket_by_sentiment(articles)
+        
+        buf = io.StringIO()
+        w = buf.write
+        w(f"# 舆情监测日报 - {date_str}\n")
+        w("\n")
+        w("## 📈 今日概览\n")
+        w("\n")
+        w("| 指标 | 数值 |\n")
+        w("|------|------|\n")
+        w(f"| 采集文章总数 | {stats['total']} 篇 |\n")
+        w("\n")
         
         # 平台分布表格
         if stats['by_platform']:
-            md_lines.append("## 📱 平台分布")
-            md_lines.append("")
-            md_lines.append("| 平台 | 数量 | 占比 |")
-            md_lines.append("|------|------|------|")
+            w("## 📱 平台分布\n")
+            w("\n")
+            w("| 平台 | 数量 | 占比 |\n")
+            w("|------|------|------|\n")
             for platform, count in stats['by_platform'].items():
                 pct = count / stats['total'] * 100 if stats['total'] else 0
-                md_lines.append(f"| {platform} | {count} | {pct:.1f}% |")
-            md_lines.append("")
+                w(f"| {platform} | {count} | {pct:.1f}% |\n")
+            w("\n")
         
         # 关键词分布表格
         if stats['by_keyword']:
-            md_lines.append("## 🔑 关键词分布")
-            md_lines.append("")
-            md_lines.append("| 关键词 | 数量 | 占比 |")
-            md_lines.append("|--------|------|------|")
+            w("## 🔑 关键词分布\n")
+            w("\n")
+            w("| 关键词 | 数量 | 占比 |\n")
+            w("|--------|------|------|\n")
             for keyword, count in stats['by_keyword'].items():
                 pct = count / stats['total'] * 100 if stats['total'] else 0
-                md_lines.append(f"| {keyword} | {count} | {pct:.1f}% |")
-            md_lines.append("")
+                w(f"| {keyword} | {count} | {pct:.1f}% |\n")
+            w("\n")
         
         # 情感分析
         if stats['by_sentiment']:
-            md_lines.append("## 💬 情感分析")
-            md_lines.append("")
-            md_lines.append("| 情感 | 数量 | 占比 |")
-            md_lines.append("|------|------|------|")
+            w("## 💬 情感分析\n")
+            w("\n")
+            w("| 情感 | 数量 | 占比 |\n")
+            w("|------|------|------|\n")
             for sentiment, count in stats['by_sentiment'].items():
                 pct = count / stats['total'] * 100 if stats['total'] else 0
-                md_lines.append(f"| {sentiment} | {count} | {pct:.1f}% |")
-            md_lines.append("")
+                w(f"| {sentiment} | {count} | {pct:.1f}% |\n")
+            w("\n")
         
         # 重点内容列表
-        md_lines.append("## 📌 重点内容")
-        md_lines.append("")
+        w("## 📌 重点内容\n")
+        w("\n")
         
-        negative_articles = [a for a in articles if a.sentiment == "消极"]
+        negative_articles = buckets["消极"]
         if negative_articles:
-            md_lines.append("### ⚠️ 需关注（消极内容）")
-            md_lines.append("")
+            w("### ⚠️ 需关注（消极内容）\n")
+            w("\n")
             for i, article in enumerate(negative_articles[:5], 1):
-                md_lines.append(f"{i}. **{article.title}**")
-                md_lines.append(f"   - 来源: {article.author}")
-                md_lines.append(f"   - 关键词: {article.keyword}")
-                md_lines.append(f"   - [查看原文]({article.url})")
-                md_lines.append("")
+                w(f"{i}. **{article.title}**\n")
+                w(f"   - 来源: {article.author}\n")
+                w(f"   - 关键词: {article.keyword}\n")
+                w(f"   - [查看原文]({article.url})\n")
+                w("\n")
         
-        positive_articles = [a for a in articles if a.sentiment == "积极"]
+        positive_articles = buckets["积极"]
         if positive_articles:
-            md_lines.append("### ✅ 正面报道")
-            md_lines.append("")
+            w("### ✅ 正面报道\n")
+            w("\n")
             for i, article in enumerate(positive_articles[:5], 1):
-                md_lines.append(f"{i}. **{article.title}**")
-                md_lines.append(f"   - 来源: {article.author}")
-                md_lines.append(f"   - 关键词: {article.keyword}")
-                md_lines.append(f"   - [查看原文]({article.url})")
-                md_lines.append("")
+                w(f"{i}. **{article.title}**\n")
+                w(f"   - 来源: {article.author}\n")
+                w(f"   - 关键词: {article.keyword}\n")
+                w(f"   - [查看原文]({article.url})\n")
+                w("\n")
         
-        md_lines.append("---")
-        md_lines.append(f"*报告生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*")
+        w("---\n")
+        w(f"*报告生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*")
         
-        return "\n".join(md_lines)
+        return buf.getvalue()
     
     def generate_llm_briefing(self, articles: List[Article]) -> Optional[str]:
         """
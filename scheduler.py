@@ -8,13 +8,12 @@ import logging
 import time
 import threading
 from datetime import datetime
-
-import schedule
+from typing import Optional
 
 from crawlers import SogouWechatCrawler, Article
-from processors.dedup import DedupProcessor
+from processors.dedup import DedupProcessor, default_cache_file
 from processors.sentiment import SentimentAnalyzer
-from storage.feishu_client import FeishuClient
+from storage.feishu_client import get_feishu_client
 from reporters.daily_report import DailyReporter
 
 # 导入新的路径和配置管理
@@ -47,10 +46,9 @@ def load_config():
         config_manager = get_config_manager()
         return config_manager.get_config()
     else:
-        # Fallback to YAML
-        import yaml
-        with open("config/keywords.yaml", "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        # Fallback to YAML（文件未修改时复用上次解析结果）
+        from utils.yaml_cache import load_yaml
+        return load_yaml("config/keywords.yaml")
 
 
 def run_daily_task():
@@ -69,31 +67,33 @@ def run_daily_task():
             logger.error("关键词列表为空")
             return
         
-        # 采集数据
+        # 采集数据：关键词在后台线程中采集，主线程对已完成关键词的文章先去重再做情感分析，与后续采集重叠
         logger.info(f"采集关键词: {keywords}")
         crawler = SogouWechatCrawler(
             request_delay=search_config.get("request_delay", 3)
         )
-        articles = crawler.search_multiple(
+        # 去重（跨运行缓存，跳过往次已处理的文章）；去重状态跨批次保留，重复文章不再做情感分析
+        dedup = DedupProcessor(cache_file=default_cache_file())
+        analyzer = SentimentAnalyzer()
+        total = 0
+        unique_articles = []
+        for batch in crawler.iter_search_multiple(
             keywords,
             max_pages=search_config.get("max_pages", 3)
-        )
+        ):
+            total += len(batch)
+            batch = dedup.deduplicate(batch)
+            if batch:
+                unique_articles.extend(analyzer.analyze_articles(batch))
         
-        if not articles:
+        if not total:
             logger.warning("未采集到任何文章")
             return
         
-        # 去重
-        dedup = DedupProcessor()
-        unique_articles = dedup.deduplicate(articles)
         logger.info(f"去重后剩余 {len(unique_articles)} 篇文章")
         
-        # 情感分析
-        analyzer = SentimentAnalyzer()
-        unique_articles = analyzer.analyze_articles(unique_articles)
-        
         # 存储到飞书
-        feishu = FeishuClient()
+        feishu = get_feishu_client()
         if feishu.is_configured():
             result = feishu.add_new_articles(unique_articles)
             logger.info(f"飞书存储: 成功 {result['success']}, 失败 {result['failed']}, 跳过 {result['skipped']}")
@@ -117,6 +117,18 @@ def run_daily_task():
         logger.error(f"每日任务执行失败: {e}", exc_info=True)
 
 
+# 单次休眠上限（秒）：系统休眠或时钟调整后，最迟在此时间内重新计算下次执行时间
+MAX_IDLE_SECONDS = 3600
+
+
+def _idle_seconds(schedule) -> Optional[float]:
+    """距下一个定时任务的秒数（不超过 MAX_IDLE_SECONDS），没有任务时返回 None"""
+    idle = schedule.idle_seconds()
+    if idle is None:
+        return None
+    return min(idle, MAX_IDLE_SECONDS)
+
+
 def main():
     parser = argparse.ArgumentParser(description="舆情监测定时调度器")
     parser.add_argument(
@@ -141,16 +153,21 @@ def main():
         run_daily_task()
         return
     
-    # 设置定时任务
+    # 设置定时任务（只有常驻调度时才需要 schedule）
+    import schedule
     schedule.every().day.at(args.time).do(run_daily_task)
     logger.info(f"定时任务已设置，每天 {args.time} 执行")
     logger.info("按 Ctrl+C 停止调度器")
     
-    # 运行调度器
+    # 运行调度器：直接睡到下一个任务的执行时间，不再每分钟唤醒检查
     try:
         while True:
+            idle = _idle_seconds(schedule)
+            if idle is None:
+                break
+            if idle > 0:
+                time.sleep(idle)
             schedule.run_pending()
-            time.sleep(60)  # 每分钟检查一次
     except KeyboardInterrupt:
         logger.info("调度器已停止")
 
@@ -163,12 +180,18 @@ def main_with_time(schedule_time: str, stop_event: threading.Event):
         schedule_time: 执行时间，例如"09:00"
         stop_event: 停止事件
     """
+    import schedule
     schedule.every().day.at(schedule_time).do(run_daily_task)
     logger.info(f"定时任务已设置，每天 {schedule_time} 执行")
     
+    # 在停止事件上等待到下一个任务的执行时间，收到停止信号时立即退出
     while not stop_event.is_set():
+        idle = _idle_seconds(schedule)
+        if idle is None:
+            break
+        if idle > 0 and stop_event.wait(idle):
+            break
         schedule.run_pending()
-        time.sleep(60)  # 每分钟检查一次
     
     logger.info("调度器已停止")
 
@@ -3,17 +3,22 @@
 用于将采集的数据写入飞书多维表格
 """
 import hashlib
+import os
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, FrozenSet, Optional, Set, Tuple
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-import lark_oapi as lark
-from lark_oapi.api.bitable.v1 import *
-from lark_oapi.api.auth.v3 import *
+import requests
+from requests.adapters import HTTPAdapter
 
 from crawlers.base import Article
+from crawlers.rate_limiter import AdaptiveRateLimiter
+from utils import fast_json
+from utils.yaml_cache import load_yaml_copy
 
 # 导入配置管理
 try:
@@ -24,10 +29,50 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Webhook 共用的连接池，连续发送多条消息时复用 TCP/TLS 连接
+_webhook_session = requests.Session()
+_webhook_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+
+_CONFIG_FIELDS = ("app_id", "app_secret", "app_token", "table_id", "webhook_url")
+
+
+def _read_feishu_config() -> Tuple[str, ...]:
+    """从配置管理器读取飞书配置，按 _CONFIG_FIELDS 顺序返回；读取失败或没有配置管理器时全部为空"""
+    if not get_config_manager:
+        return ("",) * len(_CONFIG_FIELDS)
+    try:
+        feishu_config = get_config_manager().get_feishu_config()
+    except Exception as e:
+        logger.warning(f"从配置管理器加载失败: {e}")
+        return ("",) * len(_CONFIG_FIELDS)
+    return tuple(feishu_config.get(name, "") for name in _CONFIG_FIELDS)
+
+
+def _bitable():
+    """按需导入飞书多维表格 SDK（lark_oapi 导入耗时约2秒，只在真正读写飞书时加载）"""
+    from lark_oapi.api.bitable import v1
+    return v1
+
 
 class FeishuClient:
     """飞书多维表格客户端"""
     
+    # 已有记录ID缓存的有效期（秒）
+    EXISTING_IDS_TTL = 300
+    # (app_token, table_id) -> (拉取时间, 记录ID集合)；同一进程内的客户端实例共享，写入成功后增量合并
+    _existing_ids_cache: Dict[Tuple[str, str], Tuple[float, FrozenSet[str]]] = {}
+    # 批量写入：初始每批记录数（上下限见 MIN/MAX）、同时在途的批次数、批次请求速率上限（次/秒）
+    BATCH_SIZE = 100
+    MIN_BATCH_SIZE = 50
+    MAX_BATCH_SIZE = 500
+    BATCH_WORKERS = 4
+    BATCH_RATE = 4.0
+    # 飞书限流错误码（通用频控 / 多维表格 TooManyRequest）
+    RATE_LIMIT_CODES = frozenset({99991400, 1254290})
+    # (app_token, table_id) -> 当前每批记录数；全部成功时放大，被限流时减半，进程内跨调用保留
+    _batch_sizes: Dict[Tuple[str, str], int] = {}
+    
     def __init__(self, config_path: Optional[str] = None):
         """
         初始化飞书客户端
@@ -36,36 +81,20 @@ class FeishuClient:
             config_path: 飞书配置文件路径（已弃用，使用config_manager）
         """
         # 使用配置管理器加载配置
-        if get_config_manager:
-            try:
-                config_manager = get_config_manager()
-                feishu_config = config_manager.get_feishu_config()
-                
-                self.app_id = feishu_config.get("app_id", "")
-                self.app_secret = feishu_config.get("app_secret", "")
-                self.app_token = feishu_config.get("app_token", "")
-                self.table_id = feishu_config.get("table_id", "")
-                self.webhook_url = feishu_config.get("webhook_url", "")
-            except Exception as e:
-                logger.warning(f"从配置管理器加载失败: {e}")
-                self.app_id = ""
-                self.app_secret = ""
-                self.app_token = ""
-                self.table_id = ""
-                self.webhook_url = ""
-        else:
-            # Fallback：没有config_manager，所有为空
-            self.app_id = ""
-            self.app_secret = ""
-            self.app_token = ""
-            self.table_id = ""
-            self.webhook_url = ""
+        (
+            self.app_id,
+            self.app_secret,
+            self.app_token,
+            self.table_id,
+            self.webhook_url,
+        ) = _read_feishu_config()
         
         # 检查配置是否完整
         self._validate_config()
         
-        # 初始化飞书客户端
+        # 初始化飞书客户端（SDK 按 app_id 在进程内缓存 tenant_access_token，到期前10分钟才刷新，多个实例共享）
         if self.app_id and self.app_secret:
+            import lark_oapi as lark
             self.client = lark.Client.builder() \
                 .app_id(self.app_id) \
                 .app_secret(self.app_secret) \
@@ -77,8 +106,14 @@ class FeishuClient:
         self.logger = logging.getLogger(self.__class__.__name__)
     
     def _load_config(self, config_path: str) -> dict:
-        """已弃用：加载配置文件（保留用于兼容性）"""
-        return {}
+        """已弃用：加载配置文件（保留用于兼容性；文件未修改时复用缓存的解析结果，返回副本）"""
+        if not config_path or not os.path.exists(config_path):
+            return {}
+        try:
+            return load_yaml_copy(config_path) or {}
+        except Exception as e:
+            logger.warning(f"加载配置文件失败: {e}")
+            return {}
     
     def _validate_config(self):
         """验证配置是否完整"""
@@ -97,56 +132,81 @@ class FeishuClient:
             logger.warning("请在 config/feishu.yaml 中填写完整配置")
     
     def is_configured(self) -> bool:
-        """检查是否已配置"""
-        return all([self.app_id, self.app_secret, self.app_token, self.table_id])
+        """检查是否已配置（按当前属性实时判断，不缓存：配置属性可能在创建后被改写）"""
+        return bool(self.app_id and self.app_secret and self.app_token and self.table_id)
     
     def _generate_record_id(self, article: Article) -> str:
         """
         生成文章的唯一标识，用于去重
-        基于URL生成MD5哈希
+        基于URL生成MD5哈希（表中已有记录使用该格式，更换算法会导致去重失效；
+        仅用作标识而非安全用途，FIPS 模式下也可用）
         """
-        return hashlib.md5(article.url.encode()).hexdigest()[:16]
+        return hashlib.md5(article.url.encode(), usedforsecurity=False).hexdigest()[:16]
     
-    def _build_fields(self, article: Article) -> Dict[str, Any]:
+    def _build_fields(self, article: Article, record_id: Optional[str] = None) -> Dict[str, Any]:
         """
         构建飞书多维表格字段
         字段名必须与飞书表格中的字段名完全一致
         
         Args:
             article: 文章对象
+            record_id: 已计算好的记录ID，不传则现算
             
         Returns:
             字段字典
         """
-        fields = {
-            "标题": article.title or "",
-            "作者": article.author or "",
-            "内容摘要": (article.content[:500] if article.content else ""),
-            "平台": article.platform or "",
-            "关键词": article.keyword or "",
-            "情感标注": article.sentiment or "待分析",
-            "记录ID": self._generate_record_id(article),
-        }
-        
-        # URL字段（类型15需要特殊格式）
-        if article.url:
-            fields["原文链接"] = {
-                "link": article.url,
-                "text": article.title[:30] if article.title else "查看原文"
-            }
-        
-        # 日期字段（类型5需要毫秒时间戳）
-        if article.published_at:
-            fields["发布日期"] = int(article.published_at.timestamp() * 1000)
-        if article.crawled_at:
-            fields["采集日期"] = int(article.crawled_at.timestamp() * 1000)
-        
-        # 情感分数
-        if article.sentiment_score is not None:
-            fields["情感分数"] = str(article.sentiment_score)
+        if record_id is None:
+            record_id = self._generate_record_id(article)
+        return self._build_fields_batch([article], [record_id])[0]
+    
+    def _build_fields_batch(self, articles: List[Article], record_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        批量构建字段（与 _build_fields 结果一致，只保留非空字段，省去逐篇构建完整字典再过滤）
         
-        # 过滤空值和None
-        return {k: v for k, v in fields.items() if v is not None and v != ""}
+        Args:
+            articles: 文章列表
+            record_ids: 与 articles 一一对应的记录ID
+            
+        Returns:
+            字段字典列表
+        """
+        rows = []
+        append = rows.append
+        for article, record_id in zip(articles, record_ids):
+            title = article.title
+            fields = {}
+            if title:
+                fields["标题"] = title
+            if article.author:
+                fields["作者"] = article.author
+            if article.content:
+                fields["内容摘要"] = article.content[:500]
+            if article.platform:
+                fields["平台"] = article.platform
+            if article.keyword:
+                fields["关键词"] = article.keyword
+            fields["情感标注"] = article.sentiment or "待分析"
+            fields["记录ID"] = record_id
+            
+            # URL字段（类型15需要特殊格式）
+            if article.url:
+                fields["原文链接"] = {
+                    "link": article.url,
+                    "text": title[:30] if title else "查看原文"
+                }
+            
+            # 日期字段（类型5需要毫秒时间戳）
+            if article.published_at:
+                fields["发布日期"] = int(article.published_at.timestamp() * 1000)
+            if article.crawled_at:
+                fields["采集日期"] = int(article.crawled_at.timestamp() * 1000)
+            
+            # 情感分数
+            if article.sentiment_score is not None:
+                fields["情感分数"] = str(article.sentiment_score)
+            
+            append(fields)
+        return rows
     
     def add_record(self, article: Article) -> Optional[str]:
         """
@@ -166,10 +226,11 @@ class FeishuClient:
         fields = self._build_fields(article)
         
         try:
-            request = CreateAppTableRecordRequest.builder() \
+            bitable = _bitable()
+            request = bitable.CreateAppTableRecordRequest.builder() \
                 .app_token(self.app_token) \
                 .table_id(self.table_id) \
-                .request_body(AppTableRecord.builder()
+                .request_body(bitable.AppTableRecord.builder()
                     .fields(fields)
                     .build()) \
                 .build()
@@ -188,12 +249,13 @@ class FeishuClient:
             self.logger.error(f"添加记录异常: {e}")
             return None
     
-    def add_records_batch(self, articles: List[Article]) -> Dict[str, Any]:
+    def add_records_batch(self, articles: List[Article], record_ids: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         批量添加记录到多维表格
         
         Args:
             articles: 文章列表
+            record_ids: 与 articles 一一对应的记录ID（add_new_articles 去重时已算好），不传则逐篇现算
             
         Returns:
             包含成功和失败数量的结果
@@ -204,69 +266,110 @@ class FeishuClient:
         
         success_count = 0
         failed_count = 0
-        record_ids = []
+        created_ids = []
         
         # 构建批量记录（简化版，全部文本类型）
-        records = []
-        for article in articles:
-            fields = self._build_fields(article)
-            records.append(AppTableRecord.builder().fields(fields).build())
+        if record_ids is None:
+            record_ids = [self._generate_record_id(article) for article in articles]
+        bitable = _bitable()
+        records = [
+            bitable.AppTableRecord.builder().fields(fields).build()
+            for fields in self._build_fields_batch(articles, record_ids)
+        ]
+        
+        # 分批处理（飞书API单次最多500条）；多个批次并发提交，由限速器控制请求间隔
+        size_key = (self.app_token, self.table_id)
+        batch_size = self._batch_sizes.get(size_key, self.BATCH_SIZE)
+        batches = [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
+        limiter = AdaptiveRateLimiter(rate=self.BATCH_RATE, max_rate=self.BATCH_RATE)
+        
+        def submit(batch):
+            limiter.acquire()
+            request = bitable.BatchCreateAppTableRecordRequest.builder() \
+                .app_token(self.app_token) \
+                .table_id(self.table_id) \
+                .request_body(bitable.BatchCreateAppTableRecordRequestBody.builder()
+                    .records(batch)
+                    .build()) \
+                .build()
+            response = self.client.bitable.v1.app_table_record.batch_create(request)
+            if response.success():
+                limiter.on_success()
+            else:
+                limiter.on_throttle()
+            return response
+        
+        workers = min(self.BATCH_WORKERS, len(batches))
+        if workers > 1:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feishu-batch")
+            futures = [executor.submit(submit, batch) for batch in batches]
+            executor.shutdown(wait=False)
+        else:
+            futures = None
         
-        # 分批处理（飞书API单次最多500条）
-        batch_size = 100
-        for i in range(0, len(records), batch_size):
-            batch = records[i:i + batch_size]
-            
+        # 按提交顺序汇总结果，保证返回的记录ID顺序与输入一致
+        throttled = False
+        for index, batch in enumerate(batches):
+            start = index * batch_size
             try:
-                request = BatchCreateAppTableRecordRequest.builder() \
-                    .app_token(self.app_token) \
-                    .table_id(self.table_id) \
-                    .request_body(BatchCreateAppTableRecordRequestBody.builder()
-                        .records(batch)
-                        .build()) \
-                    .build()
-                
-                response = self.client.bitable.v1.app_table_record.batch_create(request)
+                response = futures[index].result() if futures else submit(batch)
                 
                 if response.success():
                     batch_records = response.data.records
                     success_count += len(batch_records)
-                    record_ids.extend([r.record_id for r in batch_records])
+                    created_ids.extend([r.record_id for r in batch_records])
+                    self._remember_record_ids(record_ids[start:start + batch_size])
                     self.logger.info(f"批量添加成功: {len(batch_records)} 条")
                 else:
                     failed_count += len(batch)
+                    throttled = throttled or response.code in self.RATE_LIMIT_CODES
                     self.logger.error(f"批量添加失败: {response.code} - {response.msg}")
-                
-                # 批次间隔，避免触发频率限制
-                if i + batch_size < len(records):
-                    time.sleep(0.5)
                     
             except Exception as e:
                 failed_count += len(batch)
                 self.logger.error(f"批量添加异常: {e}")
         
+        # 调整下次调用的批次大小
+        if throttled:
+            self._batch_sizes[size_key] = max(self.MIN_BATCH_SIZE, batch_size // 2)
+        elif batches and not failed_count:
+            self._batch_sizes[size_key] = min(self.MAX_BATCH_SIZE, int(batch_size * 1.25))
+        
         return {
             "success": success_count,
             "failed": failed_count,
-            "records": record_ids
+            "records": created_ids
         }
     
-    def get_existing_record_ids(self) -> set:
+    def get_existing_record_ids(self, force_refresh: bool = False) -> Set[str]:
         """
         获取已存在的记录ID，用于去重
         
+        EXISTING_IDS_TTL 秒内重复调用直接返回缓存（期间本进程写入的记录会合并进缓存），不再分页拉取整张表
+        
+        Args:
+            force_refresh: 忽略缓存，重新从飞书拉取
+            
         Returns:
             已存在的记录ID集合
         """
         if not self.is_configured():
             return set()
         
+        cache_key = (self.app_token, self.table_id)
+        cached = self._existing_ids_cache.get(cache_key)
+        if not force_refresh and cached and time.monotonic() - cached[0] < self.EXISTING_IDS_TTL:
+            self.logger.info(f"已有 {len(cached[1])} 条记录（缓存）")
+            return set(cached[1])
+        
         existing_ids = set()
+        complete = False
         page_token = None
         
         try:
+            bitable = _bitable()
             while True:
-                request_builder = ListAppTableRecordRequest.builder() \
+                request_builder = bitable.ListAppTableRecordRequest.builder() \
                     .app_token(self.app_token) \
                     .table_id(self.table_id) \
                     .page_size(500) \
@@ -288,6 +391,7 @@ class FeishuClient:
                         existing_ids.add(record_id)
                 
                 if not response.data.has_more:
+                    complete = True
                     break
                     
                 page_token = response.data.page_token
@@ -295,9 +399,21 @@ class FeishuClient:
         except Exception as e:
             self.logger.error(f"获取记录异常: {e}")
         
+        # 只缓存完整拉取的结果，中途失败时下次重新拉取
+        if complete:
+            self._existing_ids_cache[cache_key] = (time.monotonic(), frozenset(existing_ids))
+        
         self.logger.info(f"已有 {len(existing_ids)} 条记录")
         return existing_ids
     
+    def _remember_record_ids(self, record_ids: List[str]):
+        """把刚写入成功的记录ID合并进缓存（缓存不存在时不创建，保持拉取时间不变）"""
+        cache_key = (self.app_token, self.table_id)
+        cached = self._existing_ids_cache.get(cache_key)
+        if cached:
+            # 整体替换元组，其他线程读到的始终是完整的集合
+            self._existing_ids_cache[cache_key] = (cached[0], cached[1].union(record_ids))
+    
     def add_new_articles(self, articles: List[Article]) -> Dict[str, Any]:
         """
         添加新文章（自动去重）
@@ -311,26 +427,32 @@ class FeishuClient:
         if not articles:
             return {"success": 0, "failed": 0, "skipped": 0}
         
-        # 获取已存在的记录
-        existing_ids = self.get_existing_record_ids()
-        
-        # 过滤出新文章
-        new_articles = []
-        skipped = 0
+        # 先在本批内按记录ID去重（同一URL可能被多个关键词重复采集），记录ID只算一次，写入时复用
+        generate_id = self._generate_record_id
+        seen = set()
+        unique_pairs = []
         for article in articles:
-            record_id = self._generate_record_id(article)
-            if record_id not in existing_ids:
-                new_articles.append(article)
-            else:
-                skipped += 1
+            record_id = generate_id(article)
+            if record_id not in seen:
+                seen.add(record_id)
+                unique_pairs.append((article, record_id))
+        duplicated = len(articles) - len(unique_pairs)
+        if duplicated:
+            self.logger.info(f"本批内重复: {duplicated} 条")
+        
+        # 获取已存在的记录，过滤出新文章
+        existing_ids = self.get_existing_record_ids()
+        new_pairs = [pair for pair in unique_pairs if pair[1] not in existing_ids]
+        skipped = len(articles) - len(new_pairs)
         
-        self.logger.info(f"过滤后: {len(new_articles)} 条新文章, {skipped} 条已存在")
+        self.logger.info(f"过滤后: {len(new_pairs)} 条新文章, {skipped - duplicated} 条已存在")
         
-        if not new_articles:
+        if not new_pairs:
             return {"success": 0, "failed": 0, "skipped": skipped}
         
         # 批量添加新文章
-        result = self.add_records_batch(new_articles)
+        new_articles, new_ids = map(list, zip(*new_pairs))
+        result = self.add_records_batch(new_articles, new_ids)
         result["skipped"] = skipped
         
         return result
@@ -349,8 +471,6 @@ class FeishuClient:
             self.logger.warning("Webhook URL未配置")
             return False
         
-        import requests
-        
         try:
             payload = {
                 "msg_type": "text",
@@ -359,10 +479,15 @@ class FeishuClient:
                 }
             }
             
-            response = requests.post(self.webhook_url, json=payload, timeout=10)
+            response = _webhook_session.post(
+                self.webhook_url,
+                data=fast_json.dumps(payload),
+                headers={"Content-Type": "application/json"},
+                timeout=10,
+            )
             
             if response.status_code == 200:
-                result = response.json()
+                result = fast_json.loads(response.content)
                 if result.get("code") == 0:
                     self.logger.info("Webhook消息发送成功")
                     return True
@@ -378,6 +503,22 @@ class FeishuClient:
             return False
 
 
+@lru_cache(maxsize=1)
+def _shared_client(config: Tuple[str, ...]) -> FeishuClient:
+    """按配置缓存客户端实例（config 只作为缓存键，实例创建时自行读取配置）"""
+    return FeishuClient()
+
+
+def get_feishu_client() -> FeishuClient:
+    """
+    获取进程内共享的飞书客户端
+    
+    以当前配置为缓存键，配置未变化时复用同一实例（包括其中的 SDK 客户端）；
+    在网页上修改飞书配置后，下次调用自动按新配置重新创建
+    """
+    return _shared_client(_read_feishu_config())
+
+
 # 测试代码
 if __name__ == "__main__":
     from crawlers.base import Article
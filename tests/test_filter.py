@@ -0,0 +1,41 @@
+"""关键词相关性过滤器"""
+import unittest
+from unittest import mock
+
+from crawlers.base import Article
+from processors.filter import RelevanceFilter
+
+
+def _article(keyword, title: str) -> Article:
+    return Article(
+        title=title, author="作者", content="", url=f"https://example.com/{title}",
+        platform="微信公众号", keyword=keyword,
+    )
+
+
+class RelevanceFilterTest(unittest.TestCase):
+    def setUp(self):
+        self.filter = RelevanceFilter()
+    
+    def test_rule_is_case_insensitive(self):
+        self.assertTrue(self.filter.is_relevant(_article("MONOLITH", "Monolith完成融资")))
+        self.assertFalse(self.filter.is_relevant(_article("monolith", "Monolith建筑设计")))
+    
+    def test_numeric_keyword(self):
+        # YAML 中未加引号的数字关键词/关联词会被解析为 int
+        rules = {2026: ["规划", 14]}
+        with mock.patch.object(RelevanceFilter, "DEFAULT_RELEVANCE_RULES", rules):
+            filter_ = RelevanceFilter()
+        self.assertEqual(filter_.relevance_rules, {"2026": ["规划", "14"]})
+        
+        kept, removed = filter_.partition_articles([
+            _article(2026, "2026年发展规划"),
+            _article(2026, "2026年展望"),
+            _article(42, "无规则的关键词"),
+        ])
+        self.assertEqual([a.title for a in kept], ["2026年发展规划", "无规则的关键词"])
+        self.assertEqual([a.title for a in removed], ["2026年展望"])
+
+
+if __name__ == "__main__":
+    unittest.main()
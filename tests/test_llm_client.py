@@ -0,0 +1,44 @@
+"""LLM客户端：chat/completions 回复解析"""
+import io
+import unittest
+from unittest import mock
+
+import requests
+
+from utils import llm_client
+from utils.llm_client import LLMClient
+
+
+def _response(content_type: str, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = content_type
+    response.raw = io.BytesIO(body)
+    return response
+
+
+class ChatTest(unittest.TestCase):
+    def setUp(self):
+        self.client = LLMClient()
+        self.client.api_key = "test-key"
+    
+    def chat(self, response: requests.Response) -> str:
+        with mock.patch.object(llm_client._api_session, "post", return_value=response):
+            return self.client.chat("你好")
+    
+    def test_stream_response(self):
+        body = (
+            b'data: {"choices": [{"delta": {"content": "\xe4\xbd\xa0"}}]}\n\n'
+            b'data: {"choices": [{"delta": {"content": "\xe5\xa5\xbd"}}]}\n\n'
+            b'data: [DONE]\n\n'
+        )
+        self.assertEqual(self.chat(_response("text/event-stream", body)), "你好")
+    
+    def test_plain_json_response(self):
+        # 服务商忽略 stream 参数时返回完整的 JSON 回复
+        body = '{"choices": [{"message": {"role": "assistant", "content": " 完整回复 "}}]}'.encode()
+        self.assertEqual(self.chat(_response("application/json; charset=utf-8", body)), "完整回复")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""搜狗微信爬虫：搜索URL构建与结果页解析"""
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+from crawlers.sogou_wechat import SogouWechatCrawler, _search_url_template
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sogou_search.html"
+
+# 基线 BeautifulSoup 解析器对 fixtures/sogou_search.html 的解析结果：(标题, 公众号, 摘要, 链接)
+EXPECTED = [
+    (
+        "Monolith砺思资本完成新一期美元基金募集",
+        "投资界",
+        "近日，Monolith砺思资本宣布完成新一期基金募集……",
+        "https://weixin.sogou.com/link?url=dn9a_-gY295K0Rci_xozVXfdMkSQTLW6cwJThYulHEtVjXrGTiVgS0",
+    ),
+    (
+        "曹曦：Monolith的早期投资方法论",
+        "36氪",
+        "在一次分享中，曹曦谈到了早期投资的判断标准。",
+        "https://weixin.sogou.com/link?url=dn9a_-gY295K0Rci_second",
+    ),
+    (
+        "Monolith 实习生招聘 | 2026 春季",
+        "砺思资本Monolith",
+        "欢迎对投资感兴趣的同学加入",
+        "https://mp.weixin.qq.com/s/abcdefg",
+    ),
+    (
+        "一家名为Monolith的建筑设计工作室",
+        "未知公众号",
+        "设计作品展示",
+        "https://weixin.sogou.com/link?url=dn9a_-gY295K0Rci_fourth",
+    ),
+    (
+        "砺思资本参与领投某AI公司A轮融资",
+        "创业邦",
+        "本轮融资由砺思资本领投",
+        "https://weixin.sogou.com/link?url=dn9a_-gY295K0Rci_sixth",
+    ),
+]
+
+
+class SearchUrlTemplateTest(unittest.TestCase):
+    def test_encodes_keyword(self):
+        url = _search_url_template(SogouWechatCrawler.SEARCH_URL, "舆情 监测")
+        self.assertEqual(
+            url.format(page=2),
+            "https://weixin.sogou.com/weixin?type=2&query=%E8%88%86%E6%83%85%20%E7%9B%91%E6%B5%8B&page=2",
+        )
+    
+    def test_numeric_keyword(self):
+        # YAML 中未加引号的数字关键词会被解析为 int
+        url = _search_url_template(SogouWechatCrawler.SEARCH_URL, 2026)
+        self.assertEqual(url.format(page=1), "https://weixin.sogou.com/weixin?type=2&query=2026&page=1")
+
+
+
+class ParseSearchResultsTest(unittest.TestCase):
+    def setUp(self):
+        cookie_file = os.path.join(tempfile.mkdtemp(), "sogou_cookies.txt")
+        with mock.patch.object(SogouWechatCrawler, "_init_session"):
+            self.crawler = SogouWechatCrawler(request_delay=0, cache_ttl=0, cookie_file=cookie_file)
+        self.html = FIXTURE.read_text(encoding="utf-8")
+    
+    def assert_matches_baseline(self, articles):
+        self.assertEqual([(a.title, a.author, a.content, a.url) for a in articles], EXPECTED)
+        self.assertTrue(all(a.keyword == "Monolith" and a.platform == self.crawler.platform_name for a in articles))
+        
+        dates = [a.published_at for a in articles]
+        # 2026-01-10 / 2026年01月09日 / 01-08（补当前年份）/ 只有脚本渲染的时间戳（取不到文本）
+        self.assertEqual(dates[:4], [
+            datetime(2026, 1, 10),
+            datetime(2026, 1, 9),
+            datetime(datetime.now().year, 1, 8),
+            None,
+        ])
+        # 3小时前（按分钟缓存，最多偏差一分钟）
+        self.assertAlmostEqual(dates[4], datetime.now() - timedelta(hours=3), delta=timedelta(minutes=2))
+    
+    def test_news_list(self):
+        self.assert_matches_baseline(self.crawler._parse_search_results(self.html, "Monolith"))
+    
+    def test_txt_box_fallback(self):
+        # 没有 ul.news-list 时退回 div.txt-box
+        html = self.html.replace('class="news-list"', 'class="list"')
+        self.assert_matches_baseline(self.crawler._parse_search_results(html, "Monolith"))
+    
+    def test_empty_page(self):
+        self.assertEqual(self.crawler._parse_search_results("", "Monolith"), [])
+        self.assertEqual(self.crawler._parse_search_results("<html><body></body></html>", "Monolith"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
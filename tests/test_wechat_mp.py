@@ -0,0 +1,95 @@
+"""微信公众号爬虫：HTTP 快速路径"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from crawlers.base import Article
+from crawlers.wechat_mp import WechatMPCrawler
+
+
+class HttpFastPathTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.cookie_file = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            f.write('[{"name": "SUID", "value": "x", "domain": ".sogou.com", "path": "/"}]')
+        self.addCleanup(os.remove, self.cookie_file)
+        self.crawler = WechatMPCrawler(request_delay=0, cookie_file=self.cookie_file)
+    
+    def test_http_success_does_not_start_browser(self):
+        article = Article(
+            title="标题", content="摘要", url="https://mp.weixin.qq.com/s/1",
+            platform="微信公众号", author="作者", keyword="测试",
+        )
+        with mock.patch.object(self.crawler, "_search_pages_http", return_value=[[article]]), \
+                mock.patch.object(self.crawler, "_init_browser") as init_browser:
+            articles = self.crawler.search("测试", max_pages=1)
+        
+        self.assertEqual(articles, [article])
+        init_browser.assert_not_called()
+    
+    def test_search_url_encodes_keyword(self):
+        for keyword, query in (("A&B #1+", "A%26B%20%231%2B"), (2026, "2026")):
+            with mock.patch.object(self.crawler, "_search_pages_http", return_value=[]) as search_http:
+                self.crawler.search(keyword, max_pages=1)
+            url = search_http.call_args.args[1]
+            self.assertEqual(url, f"https://weixin.sogou.com/weixin?type=2&query={query}&sort=1")
+    
+    def test_not_logged_in_without_cookie_file(self):
+        crawler = WechatMPCrawler(request_delay=0, cookie_file=self.cookie_file + ".missing")
+        with mock.patch.object(crawler, "_init_browser") as init_browser:
+            self.assertFalse(crawler.is_logged_in())
+        init_browser.assert_not_called()
+
+
+
+class LoginContextTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.crawler = WechatMPCrawler(request_delay=0, cookie_file=os.path.join(tmp_dir, "wechat_mp_cookies.json"))
+        self.contexts = []
+        self.page = mock.MagicMock(name="page")
+        
+        def fake_init_browser(headless=None, block_resources=True):
+            if self.crawler.context:
+                return
+            self.crawler.context = mock.MagicMock(name="context")
+            self.crawler.context.cookies.return_value = []
+            self.crawler.page = self.page
+            self.crawler._qrcode = mock.MagicMock(name="qrcode")
+            self.contexts.append((self.crawler.context, headless, block_resources))
+        
+        mock.patch.object(self.crawler, "_init_browser", side_effect=fake_init_browser).start()
+        self.addCleanup(mock.patch.stopall)
+    
+    def assert_login_context_closed(self):
+        login_context, headless, block_resources = self.contexts[0]
+        self.assertEqual((headless, block_resources), (False, False))
+        login_context.close.assert_called_once()
+        self.assertIsNone(self.crawler.context)
+    
+    def test_context_closed_after_success(self):
+        with mock.patch.object(self.crawler, "_check_login_status", return_value=True):
+            self.assertTrue(self.crawler.login_by_qrcode())
+        self.assert_login_context_closed()
+        
+        # 之后的搜索按实例配置重建上下文
+        self.crawler._init_browser()
+        self.assertEqual(self.contexts[1][1:], (None, True))
+    
+    def test_context_closed_after_timeout(self):
+        self.page.wait_for_url.side_effect = PlaywrightTimeoutError("timeout")
+        with mock.patch.object(self.crawler, "_check_login_status", return_value=False):
+            self.assertFalse(self.crawler.login_by_qrcode(timeout=0))
+        self.assert_login_context_closed()
+    
+    def test_context_closed_after_failure(self):
+        with mock.patch.object(self.crawler, "_check_login_status", side_effect=RuntimeError("页面崩溃")):
+            self.assertFalse(self.crawler.login_by_qrcode())
+        self.assert_login_context_closed()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""小红书爬虫：扫码登录后的浏览器上下文"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from crawlers.xhs_crawler import XHSCrawler
+
+
+class LoginContextTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.crawler = XHSCrawler(request_delay=0, cookie_file=os.path.join(tmp_dir, "xhs_cookies.json"))
+        self.contexts = []
+        
+        def fake_init_browser(headless=None, block_resources=True):
+            if self.crawler.context:
+                return
+            self.crawler.context = mock.MagicMock(name="context")
+            self.crawler.context.cookies.return_value = []
+            self.crawler.page = mock.MagicMock(name="page")
+            self.contexts.append((self.crawler.context, headless, block_resources))
+        
+        mock.patch.object(self.crawler, "_init_browser", side_effect=fake_init_browser).start()
+        mock.patch.object(self.crawler, "_wait_for_notes").start()
+        self.addCleanup(mock.patch.stopall)
+    
+    def assert_login_context_closed(self):
+        login_context, headless, block_resources = self.contexts[0]
+        self.assertEqual((headless, block_resources), (False, False))
+        login_context.close.assert_called_once()
+        self.assertIsNone(self.crawler.context)
+    
+    def test_context_closed_after_success(self):
+        with mock.patch.object(self.crawler, "_check_login_status", return_value=True):
+            self.assertTrue(self.crawler.login_by_qrcode())
+        self.assertTrue(os.path.exists(self.crawler.cookie_file))
+        self.assert_login_context_closed()
+        
+        # 之后的搜索按实例配置重建上下文
+        self.crawler._init_browser()
+        self.assertEqual(self.contexts[1][1:], (None, True))
+    
+    def test_context_closed_after_timeout(self):
+        with mock.patch.object(self.crawler, "_check_login_status", return_value=False):
+            self.assertFalse(self.crawler.login_by_qrcode(timeout=0))
+        self.assert_login_context_closed()
+    
+    def test_context_closed_after_failure(self):
+        with mock.patch.object(self.crawler, "_check_login_status", side_effect=RuntimeError("页面崩溃")):
+            self.assertFalse(self.crawler.login_by_qrcode())
+        self.assert_login_context_closed()
+
+
+if __name__ == "__main__":
+    unittest.main()
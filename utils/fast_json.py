@@ -0,0 +1,27 @@
+"""
+JSON 编解码
+HTTP 请求体与响应解析共用，优先使用 orjson，未安装时回退到标准库
+"""
+import json
+from typing import Any, Union
+
+# 可选依赖：更快的JSON序列化
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """序列化为紧凑的 UTF-8 JSON 字节串"""
+    if orjson is not None:
+        # 与标准库一致，允许非字符串的字典键（如 YAML 中写成数字的关键词）
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """反序列化 JSON（接受 bytes 或 str）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
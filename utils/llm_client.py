@@ -3,12 +3,19 @@ LLM客户端
 封装DeepSeek API调用，用于生成舆情简报
 """
 import logging
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from crawlers.base import Article
+from utils import fast_json
+from utils.yaml_cache import load_yaml_copy
 
 # 导入配置管理
 try:
@@ -19,10 +26,47 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_DEFAULT_BASE_URL = "https://api.siliconflow.cn/v1"
+_DEFAULT_MODEL = "deepseek-ai/DeepSeek-V3"
+
+
+# 简报各部分（标题, 写作要求）；整篇生成与按部分并发生成共用
+BRIEFING_SECTIONS = (
+    ("【一、今日要点】", "用2-3句话概括今日舆情的核心态势和关键发现。"),
+    ("【二、重点关注】", "列出需要管理层特别关注的事项，包括：\n- 消极内容分析（如有）\n- 潜在风险预警\n- 值得关注的新动态"),
+    ("【三、内容分析】", "对各关键词相关内容进行简要分析，包括：\n- 传播渠道特点\n- 关键话题走向\n- 舆论情绪变化"),
+    ("【四、建议与行动】", "基于今日舆情给出具体、可执行的建议。"),
+    ("【五、明日关注】", "预判明日可能的舆情走向和需关注的风险点。"),
+)
+
+
+# LLM API 共用的连接池：多次生成简报、按部分并发生成时复用到服务商的 TCP/TLS 连接
+_api_session = requests.Session()
+_api_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=len(BRIEFING_SECTIONS) * 2))
+
+
+def _read_llm_config() -> Tuple[str, str, str]:
+    """从配置管理器读取 (api_key, base_url, model)；读取失败或没有配置管理器时使用默认值且不含 api_key"""
+    if not get_config_manager:
+        return "", _DEFAULT_BASE_URL, _DEFAULT_MODEL
+    try:
+        llm_config = get_config_manager().get_llm_config()
+    except Exception as e:
+        logger.warning(f"从配置管理器加载失败: {e}")
+        return "", _DEFAULT_BASE_URL, _DEFAULT_MODEL
+    return (
+        llm_config.get("api_key", ""),
+        llm_config.get("base_url", _DEFAULT_BASE_URL),
+        llm_config.get("model", _DEFAULT_MODEL),
+    )
+
 
 class LLMClient:
     """LLM客户端（支持DeepSeek/硅基流动）"""
     
+    # 按部分生成简报时每部分的最大返回token数
+    SECTION_MAX_TOKENS = 600
+    
     def __init__(self, config_path: Optional[str] = None):
         """
         初始化LLM客户端
@@ -33,30 +77,19 @@ class LLMClient:
         self.logger = logging.getLogger(self.__class__.__name__)
         
         # 使用配置管理器加载配置
-        if get_config_manager:
-            try:
-                config_manager = get_config_manager()
-                llm_config = config_manager.get_llm_config()
-                
-                self.api_key = llm_config.get("api_key", "")
-                self.base_url = llm_config.get("base_url", "https://api.siliconflow.cn/v1")
-                self.model = llm_config.get("model", "deepseek-ai/DeepSeek-V3")
-            except Exception as e:
-                self.logger.warning(f"从配置管理器加载失败: {e}")
-                self.api_key = ""
-                self.base_url = "https://api.siliconflow.cn/v1"
-                self.model = "deepseek-ai/DeepSeek-V3"
-        else:
-            # Fallback：没有config_manager
-            self.api_key = ""
-            self.base_url = "https://api.siliconflow.cn/v1"
-            self.model = "deepseek-ai/DeepSeek-V3"
+        self.api_key, self.base_url, self.model = _read_llm_config()
         
         self._validate_config()
     
     def _load_config(self, config_path: str) -> dict:
-        """已弃用：加载配置文件（保留用于兼容性）"""
-        return {}
+        """已弃用：加载配置文件（保留用于兼容性；文件未修改时复用缓存的解析结果，返回副本）"""
+        if not config_path or not os.path.exists(config_path):
+            return {}
+        try:
+            return load_yaml_copy(config_path) or {}
+        except Exception as e:
+            logger.warning(f"加载配置文件失败: {e}")
+            return {}
     
     def _validate_config(self):
         """验证配置"""
@@ -83,47 +116,94 @@ class LLMClient:
             self.logger.error("LLM未配置，无法调用")
             return None
         
+        try:
+            return "".join(self._iter_completion(prompt, system_prompt, max_tokens)).strip()
+        except requests.RequestException as e:
+            self.logger.error(f"LLM API调用失败: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"LLM调用异常: {e}")
+            return None
+    
+    def chat_stream(self, prompt: str, system_prompt: str = None, max_tokens: int = 1000) -> Iterator[str]:
+        """
+        流式调用LLM，边生成边返回文本片段（调用方可以提前展示或中途停止）
+        
+        Args:
+            prompt: 用户提示
+            system_prompt: 系统提示
+            max_tokens: 最大返回token数
+            
+        Yields:
+            回复内容片段；调用失败时记录日志并结束
+        """
+        if not self.is_configured():
+            self.logger.error("LLM未配置，无法调用")
+            return
+        
+        try:
+            yield from self._iter_completion(prompt, system_prompt, max_tokens)
+        except requests.RequestException as e:
+            self.logger.error(f"LLM API调用失败: {e}")
+        except Exception as e:
+            self.logger.error(f"LLM调用异常: {e}")
+    
+    def _iter_completion(self, prompt: str, system_prompt: Optional[str], max_tokens: int) -> Iterator[str]:
+        """以 stream 模式请求 chat/completions，逐帧解析 SSE 并返回 delta 内容；服务商返回普通 JSON 时整段返回（异常直接抛出）"""
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": self.model,
-                    "messages": messages,
-                    "max_tokens": max_tokens,
-                    "temperature": 0.7,
-                },
-                timeout=60
-            )
-            
+        with _api_session.post(
+            f"{self.base_url}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            data=fast_json.dumps({
+                "model": self.model,
+                "messages": messages,
+                "max_tokens": max_tokens,
+                "temperature": 0.7,
+                "stream": True,
+            }),
+            timeout=60,
+            stream=True,
+        ) as response:
             response.raise_for_status()
-            result = response.json()
             
-            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-            return content.strip()
+            # 部分服务商不支持 stream 参数，直接返回完整的 JSON 回复
+            if response.headers.get("Content-Type", "").startswith("application/json"):
+                result = fast_json.loads(response.content)
+                content = result["choices"][0]["message"]["content"]
+                if content:
+                    yield content
+                return
             
-        except requests.RequestException as e:
-            self.logger.error(f"LLM API调用失败: {e}")
-            return None
-        except Exception as e:
-            self.logger.error(f"LLM调用异常: {e}")
-            return None
+            for line in response.iter_lines():
+                # SSE 帧格式: "data: {...}"，空行为帧分隔，"data: [DONE]" 表示结束
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                
+                chunk = fast_json.loads(data)
+                choices = chunk.get("choices") or [{}]
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
     
-    def generate_briefing(self, articles: List[Article], style: str = "executive") -> Optional[str]:
+    def generate_briefing(self, articles: List[Article], style: str = "executive",
+                          split_sections: bool = False) -> Optional[str]:
         """
         生成舆情简报
         
         Args:
             articles: 文章列表
             style: 简报风格（executive=高管版, detailed=详细版, concise=简洁版）
+            split_sections: 是否按部分拆成多个请求并发生成（更快，但各部分之间不再互相参照）
             
         Returns:
             舆情简报文本
@@ -131,25 +211,22 @@ class LLMClient:
         if not articles:
             return "今日暂无相关舆情内容。"
         
-        # 构建文章摘要
-        article_summaries = []
-        for i, article in enumerate(articles[:20], 1):  # 最多20篇，避免超过token限制
-            sentiment_tag = f"[{article.sentiment}]" if article.sentiment else ""
-            summary = f"{i}. {article.title} {sentiment_tag}\n   来源: {article.author} | 关键词: {article.keyword}"
-            article_summaries.append(summary)
+        # 构建文章摘要（最多20篇，避免超过token限制）
+        articles_text = "\n".join(
+            f"{i}. {article.title} {f'[{article.sentiment}]' if article.sentiment else ''}\n"
+            f"   来源: {article.author} | 关键词: {article.keyword}"
+            for i, article in enumerate(articles[:20], 1)
+        )
         
-        articles_text = "\n".join(article_summaries)
-        
-        # 统计数据
+        # 统计数据（一次遍历完成情感计数）
         total = len(articles)
-        positive = sum(1 for a in articles if a.sentiment == "积极")
-        negative = sum(1 for a in articles if a.sentiment == "消极")
-        neutral = sum(1 for a in articles if a.sentiment == "中立")
+        sentiment_counts = Counter(a.sentiment for a in articles)
+        positive = sentiment_counts["积极"]
+        negative = sentiment_counts["消极"]
+        neutral = sentiment_counts["中立"]
         
         # 按关键词统计
-        keyword_stats = {}
-        for a in articles:
-            keyword_stats[a.keyword] = keyword_stats.get(a.keyword, 0) + 1
+        keyword_stats = Counter(a.keyword for a in articles)
         keyword_text = ", ".join([f"{k}: {v}篇" for k, v in keyword_stats.items()])
         
         # 构建prompt - 第一版本：详细高管风格
@@ -167,8 +244,7 @@ class LLMClient:
 - 数据支撑，有理有据
 - 语言精炼，避免冗余"""
 
-        prompt = f"""请根据以下今日舆情监测数据，生成一份详细的高管舆情简报：
-
+        data_text = f"""
 ═══════════════════════════════════════════
 📊 今日数据概览
 ═══════════════════════════════════════════
@@ -185,34 +261,63 @@ class LLMClient:
 {articles_text}
 
 ═══════════════════════════════════════════
+"""
 
-请生成舆情简报，包含以下部分：
-
-【一、今日要点】
-用2-3句话概括今日舆情的核心态势和关键发现。
+        if split_sections:
+            return self._generate_briefing_by_sections(data_text, system_prompt)
 
-【二、重点关注】
-列出需要管理层特别关注的事项，包括：
-- 消极内容分析（如有）
-- 潜在风险预警
-- 值得关注的新动态
+        sections = "\n\n".join(f"{header}\n{requirement}" for header, requirement in BRIEFING_SECTIONS)
+        prompt = (
+            f"请根据以下今日舆情监测数据，生成一份详细的高管舆情简报：\n{data_text}"
+            f"\n请生成舆情简报，包含以下部分：\n\n{sections}\n\n"
+            "请确保报告专业、详尽，为管理层决策提供有力支撑。"
+        )
 
-【三、内容分析】
-对各关键词相关内容进行简要分析，包括：
-- 传播渠道特点
-- 关键话题走向
-- 舆论情绪变化
+        self.logger.info("正在调用LLM生成舆情简报...")
+        return self.chat(prompt, system_prompt, max_tokens=2000)
+    
+    def _generate_briefing_by_sections(self, data_text: str, system_prompt: str) -> Optional[str]:
+        """
+        各部分分别调用LLM并发生成后按顺序拼接，总耗时约为最慢一部分的耗时
+        
+        每次调用都会带上完整的数据概览，输入token约为整篇生成的5倍
+        """
+        def generate_section(section):
+            header, requirement = section
+            prompt = (
+                f"请根据以下今日舆情监测数据，撰写高管舆情简报中的一个部分：\n{data_text}"
+                f"\n只撰写以下部分，以“{header}”开头，不要输出其他部分：\n\n{header}\n{requirement}"
+            )
+            content = self.chat(prompt, system_prompt, max_tokens=self.SECTION_MAX_TOKENS)
+            if content and not content.startswith(header):
+                content = f"{header}\n{content}"
+            return content
+        
+        self.logger.info(f"正在并发调用LLM生成舆情简报（{len(BRIEFING_SECTIONS)} 个部分）...")
+        with ThreadPoolExecutor(max_workers=len(BRIEFING_SECTIONS)) as executor:
+            results = list(executor.map(generate_section, BRIEFING_SECTIONS))
+        
+        if not any(results):
+            return None
+        return "\n\n".join(
+            content or f"{header}\n（本部分生成失败）"
+            for content, (header, _) in zip(results, BRIEFING_SECTIONS)
+        )
 
-【四、建议与行动】
-基于今日舆情给出具体、可执行的建议。
 
-【五、明日关注】
-预判明日可能的舆情走向和需关注的风险点。
+@lru_cache(maxsize=1)
+def _shared_client(config: Tuple[str, str, str]) -> LLMClient:
+    """按配置缓存客户端实例（config 只作为缓存键，实例创建时自行读取配置）"""
+    return LLMClient()
 
-请确保报告专业、详尽，为管理层决策提供有力支撑。"""
 
-        self.logger.info("正在调用LLM生成舆情简报...")
-        return self.chat(prompt, system_prompt, max_tokens=2000)
+def get_llm_client() -> LLMClient:
+    """
+    获取进程内共享的LLM客户端
+    
+    以当前配置为缓存键，配置未变化时复用同一实例；在网页上修改LLM配置后，下次调用自动按新配置重新创建
+    """
+    return _shared_client(_read_llm_config())
 
 
 # 测试代码
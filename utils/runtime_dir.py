@@ -0,0 +1,28 @@
+"""
+运行时数据目录
+cookies、缓存等运行时文件统一写到这里：优先使用环境变量 RUNTIME_DATA_DIR，
+其次是项目根目录下的 data/，都不可写时（如只读部署）回退到 /tmp/monolith_data
+"""
+import os
+from functools import lru_cache
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+@lru_cache(maxsize=1)
+def get_runtime_data_dir() -> Path:
+    """获取运行时数据目录（首次调用时创建，结果缓存）"""
+    env_dir = os.environ.get("RUNTIME_DATA_DIR")
+    if env_dir:
+        p = Path(env_dir)
+        p.mkdir(parents=True, exist_ok=True)
+        return p
+    default = PROJECT_ROOT / "data"
+    try:
+        default.mkdir(parents=True, exist_ok=True)
+        return default
+    except Exception:
+        tmp = Path("/tmp/monolith_data")
+        tmp.mkdir(parents=True, exist_ok=True)
+        return tmp
@@ -0,0 +1,58 @@
+"""
+YAML 配置读取缓存
+按 (路径, 修改时间, 文件大小) 缓存解析结果，文件未变化时直接返回上次的结果
+"""
+import copy
+import os
+from functools import lru_cache
+from typing import Any, Union
+from pathlib import Path
+
+import yaml
+
+# C 实现的加载器比纯 Python 版本快数倍；libyaml 不可用时回退
+try:
+    _Loader = yaml.CSafeLoader
+except AttributeError:
+    _Loader = yaml.SafeLoader
+
+
+@lru_cache(maxsize=32)
+def _load(path: str, mtime_ns: int, size: int) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_Loader)
+
+
+def load_yaml(path: Union[str, Path]) -> Any:
+    """
+    读取并解析 YAML 文件（带缓存）
+
+    返回值在多次调用之间共享，调用方只能读取，需要修改时请先复制
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        解析结果，空文件为 None
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return _load(path, stat.st_mtime_ns, stat.st_size)
+
+
+def load_yaml_copy(path: Union[str, Path]) -> Any:
+    """
+    读取并解析 YAML 文件（带缓存），返回可自由修改的深拷贝
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        解析结果的副本，空文件为 None
+    """
+    return copy.deepcopy(load_yaml(path))
+
+
+def clear_cache():
+    """清空解析缓存（写入配置文件后调用，避免同一时钟刻度内写入的同长度内容命中旧缓存）"""
+    _load.cache_clear()
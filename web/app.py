@@ -20,6 +20,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
+from jinja2 import FileSystemBytecodeCache
 
 from web.routes import config_router, crawl_router, auth_router, reports_router
 
@@ -35,6 +36,12 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     logger.info("舆情监测系统启动...")
+    # 登录会话、采集任务状态都保存在进程内存中，多 worker 时请求会落到不同进程而查不到状态
+    if int(os.environ.get("WEB_CONCURRENCY", "1") or 1) > 1:
+        logger.warning("检测到 WEB_CONCURRENCY > 1：登录与采集任务状态不跨进程共享，请以单 worker 运行")
+    # 预先编译页面模板，首个请求无需再编译
+    for name in PAGE_TEMPLATES:
+        templates.get_template(name)
     yield
     logger.info("舆情监测系统关闭...")
 
@@ -47,21 +54,44 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# CORS 配置
+# CORS 配置：页面与接口同源，不经过 CORS；其他来源需在 CORS_ALLOW_ORIGINS 中列出（逗号分隔）
+# 明确的来源列表让中间件按集合直接匹配，max_age 让浏览器缓存预检结果24小时
+CORS_ALLOW_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("CORS_ALLOW_ORIGINS", "http://localhost:8000,http://127.0.0.1:8000").split(",")
+    if origin.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ALLOW_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
+class CachedStaticFiles(StaticFiles):
+    """静态文件附带 Cache-Control，浏览器缓存期内不再请求；过期后凭 ETag 重新验证（StaticFiles 自带 304 处理）"""
+
+    # 资源URL不带内容哈希，不能标记为 immutable，缓存1小时
+    CACHE_CONTROL = "public, max-age=3600"
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers.setdefault("Cache-Control", self.CACHE_CONTROL)
+        return response
+
+
 # 静态文件和模板
 STATIC_DIR = Path(__file__).parent / "static"
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+app.mount("/static", CachedStaticFiles(directory=str(STATIC_DIR)), name="static")
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+# 编译结果缓存到系统临时目录，进程重启（含热重载）后模板未修改则直接加载字节码
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+PAGE_TEMPLATES = ("index.html", "config.html", "platforms.html", "keywords.html", "tasks.html", "reports.html")
 
 # 注册路由
 app.include_router(config_router, prefix="/api/config", tags=["配置管理"])
@@ -133,11 +163,13 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
+    # 安装 uvicorn[standard] 后默认（loop/http="auto"）即使用 uvloop + httptools，未安装时回退到 asyncio + h11
+    # 采集任务状态保存在进程内存中，只能单 worker 运行；生产环境设置 WEB_RELOAD=0 关闭热重载
     uvicorn.run(
         "app:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        reload=os.environ.get("WEB_RELOAD", "1") != "0"
     )
 
 
@@ -7,40 +7,47 @@ import json
 import os
 import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
 import logging
+import threading
 
 from fastapi import APIRouter, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 import sys
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from utils.runtime_dir import get_runtime_data_dir
+
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-def _runtime_data_dir() -> Path:
-    env_dir = os.environ.get("RUNTIME_DATA_DIR")
-    if env_dir:
-        p = Path(env_dir)
-        p.mkdir(parents=True, exist_ok=True)
-        return p
-    default = PROJECT_ROOT / "data"
-    try:
-        default.mkdir(parents=True, exist_ok=True)
-        return default
-    except Exception:
-        tmp = Path("/tmp/monolith_data")
-        tmp.mkdir(parents=True, exist_ok=True)
-        return tmp
-
-DATA_DIR = _runtime_data_dir()
+DATA_DIR = get_runtime_data_dir()
 
-# 登录状态存储
+# 登录状态存储（登录线程写、接口读，统一经 _sessions_lock 访问）
 login_sessions: Dict[str, Dict] = {}
+_sessions_lock = threading.Lock()
+# 登录会话最后一次更新后保留的时间（秒），超时且登录任务已结束的会话在下次发起登录时清理
+SESSION_TTL = 600
+
+# 会话状态变化通知：会话ID -> asyncio.Event。状态每次变化时在事件循环线程中换上新的 Event 并 set 旧的，唤醒所有等待者
+_session_events: Dict[str, asyncio.Event] = {}
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+# 登录结束的状态，SSE 推送到这些状态后关闭连接
+TERMINAL_STATUSES = frozenset({"success", "failed", "timeout"})
+# 长轮询单次最长等待时间（秒）、SSE 无变化时发送心跳的间隔（秒）
+MAX_LONG_POLL_WAIT = 25
+SSE_KEEPALIVE_INTERVAL = 15
+
+# 扫码登录使用 Playwright 同步API（阻塞且对象绑定线程），每次登录整体放在线程池的一个线程中执行，并限制同时进行的登录数
+# 线程池复用空闲线程，线程内由 crawlers._browser_pool 缓存已启动的浏览器，连续登录时不再重新启动 Chromium
+_login_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="login")
 
 
 class LoginStatus(BaseModel):
@@ -50,6 +57,7 @@ class LoginStatus(BaseModel):
     message: str = ""
     qrcode_url: Optional[str] = None
     session_id: Optional[str] = None
+    version: int = 0  # 状态每变化一次加1，长轮询时传回 since 参数
 
 
 class PlatformStatus(BaseModel):
@@ -61,35 +69,175 @@ class PlatformStatus(BaseModel):
 
 
 def get_cookie_file(platform: str) -> Path:
-    """获取Cookie文件路径"""
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    """获取Cookie文件路径（DATA_DIR 在模块加载时已创建）"""
     return DATA_DIR / f"{platform}_cookies.json"
 
 
 def check_login_status(platform: str) -> bool:
-    """检查平台登录状态"""
-    cookie_file = get_cookie_file(platform)
-    if cookie_file.exists():
-        # 检查文件是否有效
+    """检查平台登录状态（按 Cookie 文件大小判断，不解析JSON）"""
+    return _cookie_status(_stat_cookie_file(platform))[0]
+
+
+def _create_session(session_id: str, platform: str):
+    """创建登录会话，并顺带清理过期会话（在事件循环中调用）"""
+    global _event_loop
+    _event_loop = asyncio.get_running_loop()
+    now = time.monotonic()
+    with _sessions_lock:
+        expired = [
+            sid for sid, session in login_sessions.items()
+            if now - session["updated_at"] > SESSION_TTL
+            and (session.get("task") is None or session["task"].done())
+        ]
+        for sid in expired:
+            del login_sessions[sid]
+            _session_events.pop(sid, None)
+        
+        login_sessions[session_id] = {
+            "platform": platform,
+            "status": "pending",
+            "message": "正在初始化登录...",
+            "qrcode_url": None,
+            "session_id": session_id,
+            "version": 0,
+            "updated_at": now,
+        }
+    _session_events[session_id] = asyncio.Event()
+
+
+def _update_session(session_id: str, **fields):
+    """更新登录会话字段并通知等待者（线程安全，登录线程中调用）"""
+    with _sessions_lock:
+        session = login_sessions.get(session_id)
+        if session is None:
+            return
+        session.update(fields, version=session["version"] + 1, updated_at=time.monotonic())
+    
+    loop = _event_loop
+    if loop is not None and not loop.is_closed():
+        loop.call_soon_threadsafe(_wake_session_waiters, session_id)
+
+
+def _wake_session_waiters(session_id: str):
+    """唤醒等待该会话状态变化的请求（在事件循环线程中执行）"""
+    event = _session_events.get(session_id)
+    if event is not None:
+        _session_events[session_id] = asyncio.Event()
+        event.set()
+
+
+def _get_session_status(session_id: str) -> Optional[LoginStatus]:
+    """读取登录会话当前状态，会话不存在返回 None"""
+    with _sessions_lock:
+        session = login_sessions.get(session_id)
+        return LoginStatus(**session) if session is not None else None
+
+
+def _session_status(session_id: str) -> LoginStatus:
+    """读取登录会话当前状态，会话不存在时返回404"""
+    status = _get_session_status(session_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="登录会话不存在")
+    return status
+
+
+async def _wait_session_status(session_id: str, since: Optional[int], wait: float) -> LoginStatus:
+    """
+    长轮询：状态版本号大于 since 时立即返回，否则最多等待 wait 秒直到状态变化
+    
+    未传 since 或 wait 为0时与普通轮询一致，直接返回当前状态
+    """
+    # 先取 Event 再读状态，避免读取后、等待前发生的变化被漏掉
+    event = _session_events.get(session_id)
+    status = _session_status(session_id)
+    if since is None or wait <= 0 or status.version > since or event is None:
+        return status
+    
+    try:
+        await asyncio.wait_for(event.wait(), timeout=min(wait, MAX_LONG_POLL_WAIT))
+    except asyncio.TimeoutError:
+        pass
+    return _session_status(session_id)
+
+
+async def _session_event_stream(session_id: str):
+    """SSE：每次状态变化推送一帧，登录结束或会话被清理后关闭"""
+    version = None
+    while True:
+        event = _session_events.get(session_id)
+        status = _get_session_status(session_id)
+        if status is None:
+            return
+        if status.version != version:
+            version = status.version
+            yield f"data: {json.dumps(jsonable_encoder(status), ensure_ascii=False)}\n\n"
+            if status.status in TERMINAL_STATUSES:
+                return
+        if event is None:
+            return
+        
         try:
-            with open(cookie_file, 'r') as f:
-                cookies = json.load(f)
-            return len(cookies) > 0
-        except Exception:
-            return False
-    return False
+            await asyncio.wait_for(event.wait(), timeout=SSE_KEEPALIVE_INTERVAL)
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+
+
+def _stream_response(session_id: str) -> StreamingResponse:
+    """创建登录状态 SSE 响应，会话不存在时返回404"""
+    _session_status(session_id)
+    return StreamingResponse(
+        _session_event_stream(session_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+async def _run_login(login_func: Callable[[str], None], session_id: str):
+    """在登录线程池中执行阻塞的登录流程"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_login_executor, login_func, session_id)
+
+
+def _start_login_task(login_func: Callable[[str], None], session_id: str):
+    """启动登录任务，任务句柄保存在会话中（状态接口可查看 task.done()）"""
+    task = asyncio.create_task(_run_login(login_func, session_id))
+    with _sessions_lock:
+        login_sessions[session_id]["task"] = task
+
+
+# 空的 cookies 列表序列化后为 "[]"，比它大的 Cookie 文件即视为保存了登录状态
+_EMPTY_COOKIES_SIZE = 2
+
+
+def _stat_cookie_file(platform: str) -> Optional[os.stat_result]:
+    """获取平台 Cookie 文件的 stat 结果，文件不存在返回 None"""
+    try:
+        return get_cookie_file(platform).stat()
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=64)
+def _mtime_iso(mtime: float) -> str:
+    """修改时间转ISO字符串（Cookie 文件只在登录时改写，轮询时几乎总是命中缓存）"""
+    return datetime.fromtimestamp(mtime).isoformat()
+
+
+def _cookie_status(stat: Optional[os.stat_result]) -> Tuple[bool, Optional[str]]:
+    """根据 Cookie 文件的 stat 结果得到（是否已登录, 最后登录时间），不读取文件内容"""
+    if stat is None:
+        return False, None
+    return stat.st_size > _EMPTY_COOKIES_SIZE, _mtime_iso(stat.st_mtime)
 
 
 # ========== 小红书登录 ==========
 
 def xhs_login_thread(session_id: str):
     """小红书登录线程"""
-    global login_sessions
-    
+    crawler = None
     try:
         from crawlers import XHSCrawler
-        login_sessions[session_id]["status"] = "waiting_scan"
-        login_sessions[session_id]["message"] = "请使用小红书APP扫描二维码"
+        _update_session(session_id, status="waiting_scan", message="请使用小红书APP扫描二维码")
         
         crawler = XHSCrawler(
             headless=False,
@@ -97,21 +245,22 @@ def xhs_login_thread(session_id: str):
         )
         
         def qr_callback(qr_url: str):
-            login_sessions[session_id]["qrcode_url"] = qr_url
+            _update_session(session_id, qrcode_url=qr_url)
         
         success = crawler.login_by_qrcode(callback=qr_callback, timeout=120)
         
         if success:
-            login_sessions[session_id]["status"] = "success"
-            login_sessions[session_id]["message"] = "小红书登录成功"
+            _update_session(session_id, status="success", message="小红书登录成功")
         else:
-            login_sessions[session_id]["status"] = "failed"
-            login_sessions[session_id]["message"] = "登录失败或超时"
+            _update_session(session_id, status="failed", message="登录失败或超时")
             
     except Exception as e:
         logger.error(f"小红书登录失败: {e}")
-        login_sessions[session_id]["status"] = "failed"
-        login_sessions[session_id]["message"] = str(e)
+        _update_session(session_id, status="failed", message=str(e))
+    finally:
+        # 只关闭本次登录的浏览器上下文；浏览器进程留在登录线程池的线程中，下次登录直接复用
+        if crawler is not None:
+            crawler.close()
 
 
 @router.post("/xhs/login", response_model=LoginStatus)
@@ -119,45 +268,36 @@ async def start_xhs_login():
     """启动小红书扫码登录"""
     session_id = f"xhs_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     
-    login_sessions[session_id] = {
-        "platform": "xiaohongshu",
-        "status": "pending",
-        "message": "正在初始化登录...",
-        "qrcode_url": None,
-        "session_id": session_id,
-    }
+    _create_session(session_id, "xiaohongshu")
     
-    # 启动登录线程
-    thread = Thread(target=xhs_login_thread, args=(session_id,))
-    thread.start()
+    # 启动登录任务
+    _start_login_task(xhs_login_thread, session_id)
     
-    return LoginStatus(**login_sessions[session_id])
+    return _session_status(session_id)
 
 
 @router.get("/xhs/status/{session_id}", response_model=LoginStatus)
-async def get_xhs_login_status(session_id: str):
-    """获取小红书登录状态"""
-    if session_id not in login_sessions:
-        raise HTTPException(status_code=404, detail="登录会话不存在")
-    
-    return LoginStatus(**login_sessions[session_id])
+async def get_xhs_login_status(session_id: str, since: Optional[int] = None, wait: float = 0):
+    """获取小红书登录状态（传入上次返回的 version 作为 since 并设置 wait 秒数即为长轮询）"""
+    return await _wait_session_status(session_id, since, wait)
+
+
+@router.get("/xhs/stream/{session_id}")
+async def stream_xhs_login_status(session_id: str):
+    """以 SSE 推送小红书登录状态变化"""
+    return _stream_response(session_id)
 
 
 @router.get("/xhs/check", response_model=PlatformStatus)
 async def check_xhs_status():
     """检查小红书登录状态"""
-    cookie_file = get_cookie_file("xhs")
-    logged_in = check_login_status("xhs")
-    
-    last_login = None
-    if cookie_file.exists():
-        mtime = os.path.getmtime(cookie_file)
-        last_login = datetime.fromtimestamp(mtime).isoformat()
+    stat = _stat_cookie_file("xhs")
+    logged_in, last_login = _cookie_status(stat)
     
     return PlatformStatus(
         platform="xiaohongshu",
         logged_in=logged_in,
-        cookie_file=str(cookie_file) if cookie_file.exists() else None,
+        cookie_file=str(get_cookie_file("xhs")) if stat else None,
         last_login=last_login,
     )
 
@@ -165,9 +305,7 @@ async def check_xhs_status():
 @router.delete("/xhs/logout")
 async def xhs_logout():
     """清除小红书登录状态"""
-    cookie_file = get_cookie_file("xhs")
-    if cookie_file.exists():
-        cookie_file.unlink()
+    await asyncio.to_thread(get_cookie_file("xhs").unlink, missing_ok=True)
     return {"status": "success", "message": "已退出登录"}
 
 
@@ -175,51 +313,39 @@ async def xhs_logout():
 
 def wechat_mp_login_thread(session_id: str):
     """微信公众号平台登录线程"""
-    global login_sessions
-    
-    # #region agent log
-    import json;open('/Users/zayn/ALL_Projects/Monolith_detective/.cursor/debug.log','a').write(json.dumps({"location":"auth.py:175","message":"wechat_mp_login_thread entry","data":{"session_id":session_id},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"initial","hypothesisId":"E"})+"\n")
-    # #endregion
+    logger.debug("微信公众号平台登录线程启动: %s", session_id)
     
+    crawler = None
     try:
         from crawlers import WechatMPCrawler
-        login_sessions[session_id]["status"] = "waiting_scan"
-        login_sessions[session_id]["message"] = "请使用微信扫描二维码"
+        _update_session(session_id, status="waiting_scan", message="请使用微信扫描二维码")
         
         cookie_file_path = str(get_cookie_file("wechat_mp"))
         
-        # #region agent log
-        open('/Users/zayn/ALL_Projects/Monolith_detective/.cursor/debug.log','a').write(json.dumps({"location":"auth.py:186","message":"before WechatMPCrawler init","data":{"cookie_file":cookie_file_path},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"initial","hypothesisId":"A,D,E"})+"\n")
-        # #endregion
+        logger.debug("创建 WechatMPCrawler, cookie_file=%s", cookie_file_path)
         
         crawler = WechatMPCrawler(
             headless=False,
             cookie_file=cookie_file_path
         )
         
-        # #region agent log
-        open('/Users/zayn/ALL_Projects/Monolith_detective/.cursor/debug.log','a').write(json.dumps({"location":"auth.py:192","message":"after WechatMPCrawler init","data":{"crawler_created":crawler is not None},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"initial","hypothesisId":"A,E"})+"\n")
-        # #endregion
-        
         def qr_callback(qr_url: str):
-            login_sessions[session_id]["qrcode_url"] = qr_url
+            _update_session(session_id, qrcode_url=qr_url)
         
         success = crawler.login_by_qrcode(callback=qr_callback, timeout=120)
         
         if success:
-            login_sessions[session_id]["status"] = "success"
-            login_sessions[session_id]["message"] = "微信公众号平台登录成功"
+            _update_session(session_id, status="success", message="微信公众号平台登录成功")
         else:
-            login_sessions[session_id]["status"] = "failed"
-            login_sessions[session_id]["message"] = "登录失败或超时"
+            _update_session(session_id, status="failed", message="登录失败或超时")
             
     except Exception as e:
-        # #region agent log
-        open('/Users/zayn/ALL_Projects/Monolith_detective/.cursor/debug.log','a').write(json.dumps({"location":"auth.py:202","message":"wechat_mp_login_thread exception","data":{"error":str(e),"error_type":type(e).__name__},"timestamp":int(time.time()*1000),"sessionId":"debug-session","runId":"initial","hypothesisId":"A,B,E"})+"\n")
-        # #endregion
         logger.error(f"微信公众号平台登录失败: {e}")
-        login_sessions[session_id]["status"] = "failed"
-        login_sessions[session_id]["message"] = str(e)
+        _update_session(session_id, status="failed", message=str(e))
+    finally:
+        # 只关闭本次登录的浏览器上下文；浏览器进程留在登录线程池的线程中，下次登录直接复用
+        if crawler is not None:
+            crawler.close()
 
 
 @router.post("/wechat/login", response_model=LoginStatus)
@@ -227,44 +353,35 @@ async def start_wechat_login():
     """启动微信公众号平台扫码登录"""
     session_id = f"wechat_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     
-    login_sessions[session_id] = {
-        "platform": "wechat_mp",
-        "status": "pending",
-        "message": "正在初始化登录...",
-        "qrcode_url": None,
-        "session_id": session_id,
-    }
+    _create_session(session_id, "wechat_mp")
     
-    thread = Thread(target=wechat_mp_login_thread, args=(session_id,))
-    thread.start()
+    _start_login_task(wechat_mp_login_thread, session_id)
     
-    return LoginStatus(**login_sessions[session_id])
+    return _session_status(session_id)
 
 
 @router.get("/wechat/status/{session_id}", response_model=LoginStatus)
-async def get_wechat_login_status(session_id: str):
-    """获取微信公众号平台登录状态"""
-    if session_id not in login_sessions:
-        raise HTTPException(status_code=404, detail="登录会话不存在")
-    
-    return LoginStatus(**login_sessions[session_id])
+async def get_wechat_login_status(session_id: str, since: Optional[int] = None, wait: float = 0):
+    """获取微信公众号平台登录状态（传入上次返回的 version 作为 since 并设置 wait 秒数即为长轮询）"""
+    return await _wait_session_status(session_id, since, wait)
+
+
+@router.get("/wechat/stream/{session_id}")
+async def stream_wechat_login_status(session_id: str):
+    """以 SSE 推送微信公众号平台登录状态变化"""
+    return _stream_response(session_id)
 
 
 @router.get("/wechat/check", response_model=PlatformStatus)
 async def check_wechat_status():
     """检查微信公众号平台登录状态"""
-    cookie_file = get_cookie_file("wechat_mp")
-    logged_in = check_login_status("wechat_mp")
-    
-    last_login = None
-    if cookie_file.exists():
-        mtime = os.path.getmtime(cookie_file)
-        last_login = datetime.fromtimestamp(mtime).isoformat()
+    stat = _stat_cookie_file("wechat_mp")
+    logged_in, last_login = _cookie_status(stat)
     
     return PlatformStatus(
         platform="wechat_mp",
         logged_in=logged_in,
-        cookie_file=str(cookie_file) if cookie_file.exists() else None,
+        cookie_file=str(get_cookie_file("wechat_mp")) if stat else None,
         last_login=last_login,
     )
 
@@ -272,9 +389,7 @@ async def check_wechat_status():
 @router.delete("/wechat/logout")
 async def wechat_logout():
     """清除微信公众号平台登录状态"""
-    cookie_file = get_cookie_file("wechat_mp")
-    if cookie_file.exists():
-        cookie_file.unlink()
+    await asyncio.to_thread(get_cookie_file("wechat_mp").unlink, missing_ok=True)
     return {"status": "success", "message": "已退出登录"}
 
 
@@ -286,14 +401,16 @@ async def get_all_platforms_status():
     platforms = ["xhs", "wechat_mp"]
     result = []
     
+    # 一次扫描数据目录取得所有 Cookie 文件（DirEntry 缓存 stat 结果）
+    try:
+        with os.scandir(DATA_DIR) as it:
+            entries = {entry.name: entry for entry in it if entry.name.endswith("_cookies.json")}
+    except FileNotFoundError:
+        entries = {}
+    
     for platform in platforms:
-        cookie_file = get_cookie_file(platform)
-        logged_in = check_login_status(platform)
-        
-        last_login = None
-        if cookie_file.exists():
-            mtime = os.path.getmtime(cookie_file)
-            last_login = datetime.fromtimestamp(mtime).isoformat()
+        entry = entries.get(f"{platform}_cookies.json")
+        logged_in, last_login = _cookie_status(entry.stat() if entry else None)
         
         result.append({
             "platform": platform,
@@ -2,19 +2,31 @@
 配置管理 API
 管理飞书配置、关键词配置、平台配置等
 """
+import asyncio
 import os
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
 import yaml
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 
+from utils import yaml_cache
+
 router = APIRouter()
 
 # 配置文件路径
 CONFIG_DIR = Path(__file__).parent.parent.parent / "config"
 
+# 配置的“读取-修改-写回”之间有 await，串行化这些接口，避免并发请求互相覆盖对方的修改
+_config_write_lock = asyncio.Lock()
+
+# C 实现的序列化器比纯 Python 版本快数倍，输出一致；libyaml 不可用时回退
+try:
+    _Dumper = yaml.CSafeDumper
+except AttributeError:
+    _Dumper = yaml.SafeDumper
+
 
 class FeishuConfig(BaseModel):
     """飞书配置"""
@@ -50,26 +62,69 @@ class PlatformConfig(BaseModel):
 
 
 def load_yaml(file_path: Path) -> dict:
-    """加载YAML文件"""
+    """加载YAML文件（按修改时间缓存解析结果，返回值共享，只读）"""
+    if not file_path.exists():
+        return {}
+    return yaml_cache.load_yaml(file_path) or {}
+
+
+def load_yaml_for_update(file_path: Path) -> dict:
+    """加载YAML文件的可修改副本（保存接口在此基础上修改后写回）"""
     if not file_path.exists():
         return {}
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f) or {}
+    return yaml_cache.load_yaml_copy(file_path) or {}
+
+
+def _config_snapshot(*names: str) -> Dict[str, dict]:
+    """一次取出多个配置文件的解析结果（只读，来自解析缓存，文件未修改时只有 stat 开销）"""
+    return {name: load_yaml(CONFIG_DIR / f"{name}.yaml") for name in names}
+
+
+def _etag(file_path: Path) -> Optional[str]:
+    """按配置文件的修改时间与大小生成弱 ETag，文件不存在返回 None"""
+    try:
+        stat = file_path.stat()
+    except FileNotFoundError:
+        return None
+    return f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def _check_not_modified(request: Request, response: Response, file_path: Path) -> Optional[Response]:
+    """
+    条件请求处理：客户端缓存的 ETag 与当前文件一致时返回 304 响应，否则在响应上附加 ETag 并返回 None
+    
+    no-cache 让浏览器每次都带 If-None-Match 重新验证，保存配置后不会读到旧内容
+    """
+    etag = _etag(file_path)
+    if etag is None:
+        return None
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
 
 
 def save_yaml(file_path: Path, data: dict):
-    """保存YAML文件"""
+    """保存YAML文件（先写临时文件再替换，其他进程不会读到写了一半的配置）"""
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(file_path, 'w', encoding='utf-8') as f:
-        yaml.dump(data, f, allow_unicode=True, default_flow_style=False)
+    tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        yaml.dump(data, f, Dumper=_Dumper, allow_unicode=True, default_flow_style=False)
+    os.replace(tmp_path, file_path)
+    yaml_cache.clear_cache()
 
 
 # ========== 飞书配置 ==========
 
 @router.get("/feishu", response_model=FeishuConfig)
-async def get_feishu_config():
+async def get_feishu_config(request: Request, response: Response):
     """获取飞书配置"""
-    config = load_yaml(CONFIG_DIR / "feishu.yaml")
+    config_path = CONFIG_DIR / "feishu.yaml"
+    not_modified = _check_not_modified(request, response, config_path)
+    if not_modified is not None:
+        return not_modified
+    config = load_yaml(config_path)
     bitable = config.get("bitable", {})
     webhook = config.get("webhook", {})
     
@@ -85,26 +140,31 @@ async def get_feishu_config():
 @router.post("/feishu")
 async def save_feishu_config(config: FeishuConfig):
     """保存飞书配置"""
-    data = load_yaml(CONFIG_DIR / "feishu.yaml")
-    
-    data["app_id"] = config.app_id
-    data["app_secret"] = config.app_secret
-    data.setdefault("bitable", {})
-    data["bitable"]["app_token"] = config.bitable_app_token
-    data["bitable"]["table_id"] = config.bitable_table_id
-    data.setdefault("webhook", {})
-    data["webhook"]["url"] = config.webhook_url
-    
-    save_yaml(CONFIG_DIR / "feishu.yaml", data)
-    return {"status": "success", "message": "飞书配置已保存"}
+    async with _config_write_lock:
+        data = load_yaml_for_update(CONFIG_DIR / "feishu.yaml")
+        
+        data["app_id"] = config.app_id
+        data["app_secret"] = config.app_secret
+        data.setdefault("bitable", {})
+        data["bitable"]["app_token"] = config.bitable_app_token
+        data["bitable"]["table_id"] = config.bitable_table_id
+        data.setdefault("webhook", {})
+        data["webhook"]["url"] = config.webhook_url
+        
+        await asyncio.to_thread(save_yaml, CONFIG_DIR / "feishu.yaml", data)
+        return {"status": "success", "message": "飞书配置已保存"}
 
 
 # ========== LLM配置 ==========
 
 @router.get("/llm", response_model=LLMConfig)
-async def get_llm_config():
+async def get_llm_config(request: Request, response: Response):
     """获取LLM配置"""
-    config = load_yaml(CONFIG_DIR / "feishu.yaml")
+    config_path = CONFIG_DIR / "feishu.yaml"
+    not_modified = _check_not_modified(request, response, config_path)
+    if not_modified is not None:
+        return not_modified
+    config = load_yaml(config_path)
     llm = config.get("llm", {})
     
     return LLMConfig(
@@ -118,24 +178,29 @@ async def get_llm_config():
 @router.post("/llm")
 async def save_llm_config(config: LLMConfig):
     """保存LLM配置"""
-    data = load_yaml(CONFIG_DIR / "feishu.yaml")
-    
-    data.setdefault("llm", {})
-    data["llm"]["provider"] = config.provider
-    data["llm"]["model"] = config.model
-    data["llm"]["api_key"] = config.api_key
-    data["llm"]["base_url"] = config.base_url
-    
-    save_yaml(CONFIG_DIR / "feishu.yaml", data)
-    return {"status": "success", "message": "LLM配置已保存"}
+    async with _config_write_lock:
+        data = load_yaml_for_update(CONFIG_DIR / "feishu.yaml")
+        
+        data.setdefault("llm", {})
+        data["llm"]["provider"] = config.provider
+        data["llm"]["model"] = config.model
+        data["llm"]["api_key"] = config.api_key
+        data["llm"]["base_url"] = config.base_url
+        
+        await asyncio.to_thread(save_yaml, CONFIG_DIR / "feishu.yaml", data)
+        return {"status": "success", "message": "LLM配置已保存"}
 
 
 # ========== 关键词配置 ==========
 
 @router.get("/keywords", response_model=KeywordsConfig)
-async def get_keywords_config():
+async def get_keywords_config(request: Request, response: Response):
     """获取关键词配置"""
-    config = load_yaml(CONFIG_DIR / "keywords.yaml")
+    config_path = CONFIG_DIR / "keywords.yaml"
+    not_modified = _check_not_modified(request, response, config_path)
+    if not_modified is not None:
+        return not_modified
+    config = load_yaml(config_path)
     search = config.get("search", {})
     
     return KeywordsConfig(
@@ -149,54 +214,61 @@ async def get_keywords_config():
 @router.post("/keywords")
 async def save_keywords_config(config: KeywordsConfig):
     """保存关键词配置"""
-    data = load_yaml(CONFIG_DIR / "keywords.yaml")
-    
-    data["keywords"] = config.keywords
-    data["relevance_keywords"] = config.relevance_keywords
-    data.setdefault("search", {})
-    data["search"]["max_pages"] = config.max_pages
-    data["search"]["request_delay"] = config.request_delay
-    
-    save_yaml(CONFIG_DIR / "keywords.yaml", data)
-    return {"status": "success", "message": "关键词配置已保存"}
+    async with _config_write_lock:
+        data = load_yaml_for_update(CONFIG_DIR / "keywords.yaml")
+        
+        data["keywords"] = config.keywords
+        data["relevance_keywords"] = config.relevance_keywords
+        data.setdefault("search", {})
+        data["search"]["max_pages"] = config.max_pages
+        data["search"]["request_delay"] = config.request_delay
+        
+        await asyncio.to_thread(save_yaml, CONFIG_DIR / "keywords.yaml", data)
+        return {"status": "success", "message": "关键词配置已保存"}
 
 
 @router.post("/keywords/add")
 async def add_keyword(keyword: str):
     """添加关键词"""
-    config = load_yaml(CONFIG_DIR / "keywords.yaml")
-    keywords = config.get("keywords", [])
-    
-    if keyword not in keywords:
-        keywords.append(keyword)
-        config["keywords"] = keywords
-        save_yaml(CONFIG_DIR / "keywords.yaml", config)
-        return {"status": "success", "message": f"关键词 '{keyword}' 已添加"}
-    
-    return {"status": "exists", "message": f"关键词 '{keyword}' 已存在"}
+    async with _config_write_lock:
+        config = load_yaml_for_update(CONFIG_DIR / "keywords.yaml")
+        keywords = config.get("keywords", [])
+        
+        if keyword not in keywords:
+            keywords.append(keyword)
+            config["keywords"] = keywords
+            await asyncio.to_thread(save_yaml, CONFIG_DIR / "keywords.yaml", config)
+            return {"status": "success", "message": f"关键词 '{keyword}' 已添加"}
+        
+        return {"status": "exists", "message": f"关键词 '{keyword}' 已存在"}
 
 
 @router.delete("/keywords/{keyword}")
 async def delete_keyword(keyword: str):
     """删除关键词"""
-    config = load_yaml(CONFIG_DIR / "keywords.yaml")
-    keywords = config.get("keywords", [])
-    
-    if keyword in keywords:
-        keywords.remove(keyword)
-        config["keywords"] = keywords
-        save_yaml(CONFIG_DIR / "keywords.yaml", config)
-        return {"status": "success", "message": f"关键词 '{keyword}' 已删除"}
-    
-    raise HTTPException(status_code=404, detail=f"关键词 '{keyword}' 不存在")
+    async with _config_write_lock:
+        config = load_yaml_for_update(CONFIG_DIR / "keywords.yaml")
+        keywords = config.get("keywords", [])
+        
+        if keyword in keywords:
+            keywords.remove(keyword)
+            config["keywords"] = keywords
+            await asyncio.to_thread(save_yaml, CONFIG_DIR / "keywords.yaml", config)
+            return {"status": "success", "message": f"关键词 '{keyword}' 已删除"}
+        
+        raise HTTPException(status_code=404, detail=f"关键词 '{keyword}' 不存在")
 
 
 # ========== 平台配置 ==========
 
 @router.get("/platforms", response_model=PlatformConfig)
-async def get_platforms_config():
+async def get_platforms_config(request: Request, response: Response):
     """获取平台配置"""
-    config = load_yaml(CONFIG_DIR / "platforms.yaml")
+    config_path = CONFIG_DIR / "platforms.yaml"
+    not_modified = _check_not_modified(request, response, config_path)
+    if not_modified is not None:
+        return not_modified
+    config = load_yaml(config_path)
     wechat = config.get("wechat", {})
     xhs = config.get("xiaohongshu", {})
     
@@ -211,18 +283,19 @@ async def get_platforms_config():
 @router.post("/platforms")
 async def save_platforms_config(config: PlatformConfig):
     """保存平台配置"""
-    data = load_yaml(CONFIG_DIR / "platforms.yaml")
-    
-    data.setdefault("wechat", {})
-    data["wechat"]["method"] = config.wechat_method
-    
-    data.setdefault("xiaohongshu", {})
-    data["xiaohongshu"]["enabled"] = config.xhs_enabled
-    data["xiaohongshu"]["sort"] = config.xhs_sort
-    data["xiaohongshu"]["filter_hours"] = config.filter_hours
-    
-    save_yaml(CONFIG_DIR / "platforms.yaml", data)
-    return {"status": "success", "message": "平台配置已保存"}
+    async with _config_write_lock:
+        data = load_yaml_for_update(CONFIG_DIR / "platforms.yaml")
+        
+        data.setdefault("wechat", {})
+        data["wechat"]["method"] = config.wechat_method
+        
+        data.setdefault("xiaohongshu", {})
+        data["xiaohongshu"]["enabled"] = config.xhs_enabled
+        data["xiaohongshu"]["sort"] = config.xhs_sort
+        data["xiaohongshu"]["filter_hours"] = config.filter_hours
+        
+        await asyncio.to_thread(save_yaml, CONFIG_DIR / "platforms.yaml", data)
+        return {"status": "success", "message": "平台配置已保存"}
 
 
 # ========== 配置验证 ==========
@@ -237,8 +310,10 @@ async def validate_config():
         "details": {}
     }
     
+    configs = _config_snapshot("feishu", "keywords")
+    
     # 检查飞书配置
-    feishu = load_yaml(CONFIG_DIR / "feishu.yaml")
+    feishu = configs["feishu"]
     if feishu.get("app_id") and feishu.get("app_secret"):
         results["feishu"] = True
         results["details"]["feishu"] = "配置完整"
@@ -254,7 +329,7 @@ async def validate_config():
         results["details"]["llm"] = "缺少 API Key"
     
     # 检查关键词配置
-    keywords = load_yaml(CONFIG_DIR / "keywords.yaml")
+    keywords = configs["keywords"]
     if keywords.get("keywords"):
         results["keywords"] = True
         results["details"]["keywords"] = f"已配置 {len(keywords['keywords'])} 个关键词"
@@ -5,14 +5,16 @@
 import asyncio
 import json
 import os
-from datetime import datetime
+from collections import Counter
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import threading
 
-import yaml
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 # 导入核心模块
@@ -22,46 +24,100 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from crawlers import SogouWechatCrawler, Article
 from processors import DedupProcessor, SentimentAnalyzer, RelevanceFilter, TimeFilter
-from storage.feishu_client import FeishuClient
+from storage.feishu_client import get_feishu_client
 from reporters.daily_report import DailyReporter
+from utils import fast_json
+from utils.runtime_dir import get_runtime_data_dir
+from utils.yaml_cache import load_yaml
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # 配置路径
 CONFIG_DIR = PROJECT_ROOT / "config"
-def _runtime_data_dir() -> Path:
-    env_dir = os.environ.get("RUNTIME_DATA_DIR")
-    if env_dir:
-        p = Path(env_dir)
-        p.mkdir(parents=True, exist_ok=True)
-        return p
-    default = PROJECT_ROOT / "data"
-    try:
-        default.mkdir(parents=True, exist_ok=True)
-        return default
-    except Exception:
-        tmp = Path("/tmp/monolith_data")
-        tmp.mkdir(parents=True, exist_ok=True)
-        return tmp
-DATA_DIR = _runtime_data_dir()
-
-# 任务状态存储
+DATA_DIR = get_runtime_data_dir()
+
+# 任务状态存储（采集线程写、接口读，统一经 _tasks_lock 访问；按创建顺序排列）
 tasks_status: Dict[str, Dict] = {}
+_tasks_lock = threading.Lock()
+# 已结束任务的保留时长与最多保留的任务数，超出时在创建新任务时清理最早结束的任务（进行中的任务不清理）
+TASK_TTL = timedelta(hours=24)
+MAX_TASK_HISTORY = 200
+FINISHED_STATUSES = frozenset({"completed", "failed"})
+# SSE 无变化时发送心跳的间隔（秒）
+SSE_KEEPALIVE_INTERVAL = 15
+
+# 任务状态变化通知：任务ID -> asyncio.Event。状态每次变化时在事件循环线程中换上新的 Event 并 set 旧的，唤醒所有等待者
+_task_events: Dict[str, asyncio.Event] = {}
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# 采集流程整体是阻塞的（requests / Playwright 同步API），每个任务放在线程池的一个线程中执行，
+# 并限制同时进行的采集数，超出的任务保持 pending 排队等待
+MAX_CONCURRENT_CRAWLS = 3
+_crawl_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_CRAWLS, thread_name_prefix="crawl")
+# 任务ID -> 事件循环上等待采集完成的 asyncio.Task（任务结束后移除）
+_crawl_tasks: Dict[str, asyncio.Task] = {}
+
+# 最近一次采集结果的持久化文件，服务重启后各页面仍能展示上次的结果
+LATEST_RESULT_FILE = DATA_DIR / "latest_crawl.json"
+
+
+def _load_latest_result() -> Optional[Dict[str, Any]]:
+    """读取上次保存的采集结果，文件不存在或已损坏时返回 None"""
+    try:
+        data = fast_json.loads(LATEST_RESULT_FILE.read_bytes())
+        data["_article_objects"] = [Article.from_dict(item) for item in data.pop("article_objects", [])]
+        return data
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"加载上次采集结果失败: {e}")
+        return None
+
+
+def _save_latest_result(result: Dict[str, Any]):
+    """保存采集结果（先写临时文件再替换，避免中途中断损坏；失败时只记录日志）"""
+    data = {key: value for key, value in result.items() if key != "_article_objects"}
+    data["article_objects"] = [article.to_dict() for article in result.get("_article_objects", [])]
+    tmp_path = LATEST_RESULT_FILE.with_suffix(LATEST_RESULT_FILE.suffix + ".tmp")
+    try:
+        tmp_path.write_bytes(fast_json.dumps(data))
+        os.replace(tmp_path, LATEST_RESULT_FILE)
+    except Exception as e:
+        logger.warning(f"保存采集结果失败: {e}")
 
-# 全局采集结果存储（供各页面共享）
-_latest_crawl_result: Dict[str, Any] = {
+
+# 全局采集结果存储（供各页面共享；文章预览由 _article_objects 按需生成，不另外保存）
+_latest_crawl_result: Dict[str, Any] = _load_latest_result() or {
     "total": 0,
-    "articles": [],
     "sentiment_stats": {},
     "keyword_stats": {},
     "crawled_at": None,
     "task_id": None,
 }
 
+def get_latest_crawl_result() -> Dict[str, Any]:
+    """
+    获取最近一次采集结果（供其他模块使用）
+
+    采集完成时整体替换该字典，需要读取多个字段时先取一次再读，保证各字段来自同一次采集；
+    不要直接导入 _latest_crawl_result，导入的名字不会随替换更新
+    """
+    return _latest_crawl_result
+
+
 def get_latest_articles() -> List[Article]:
     """获取最近采集的文章对象列表（供其他模块使用）"""
-    return _latest_crawl_result.get("_article_objects", [])
+    return get_latest_crawl_result().get("_article_objects", [])
+
+
+def _publish_latest_result(result: Dict[str, Any]):
+    """
+    发布新的采集结果：整体替换而不是逐项修改，读取方总能拿到完整的一份；随后写入文件（阻塞，不要在事件循环中直接调用）
+    """
+    global _latest_crawl_result
+    _latest_crawl_result = result
+    _save_latest_result(result)
 
 
 class CrawlRequest(BaseModel):
@@ -85,31 +141,138 @@ class TaskStatus(BaseModel):
     completed_at: Optional[str] = None
 
 
-def load_config() -> Dict:
-    """加载配置"""
-    keywords_path = CONFIG_DIR / "keywords.yaml"
-    platforms_path = CONFIG_DIR / "platforms.yaml"
+def _update_task(task_id: str, **fields):
+    """更新任务状态字段并通知等待者（线程安全，采集线程中调用；任务记录已被删除时忽略）"""
+    with _tasks_lock:
+        status = tasks_status.get(task_id)
+        if status is None:
+            return
+        status.update(fields)
     
-    config = {}
+    loop = _event_loop
+    if loop is not None and not loop.is_closed():
+        loop.call_soon_threadsafe(_wake_task_waiters, task_id)
+
+
+def _wake_task_waiters(task_id: str):
+    """唤醒等待该任务状态变化的请求（在事件循环线程中执行）"""
+    event = _task_events.get(task_id)
+    if event is not None:
+        _task_events[task_id] = asyncio.Event()
+        event.set()
+
+
+def _remove_task_events(task_ids: List[str]):
+    """任务记录已删除：唤醒并移除其等待者，SSE 连接随之关闭（在事件循环线程中调用）"""
+    for task_id in task_ids:
+        event = _task_events.pop(task_id, None)
+        if event is not None:
+            event.set()
+
+
+def _prune_tasks(now: datetime) -> List[str]:
+    """清理过期的已结束任务，并为即将创建的任务腾出数量上限内的位置，返回被清理的任务ID（调用方需持有 _tasks_lock）"""
+    expire_before = (now - TASK_TTL).isoformat()
+    overflow = len(tasks_status) + 1 - MAX_TASK_HISTORY
+    removed = []
+    for task_id, status in list(tasks_status.items()):
+        if status["status"] not in FINISHED_STATUSES:
+            continue
+        if overflow > 0 or status["created_at"] < expire_before:
+            del tasks_status[task_id]
+            removed.append(task_id)
+            overflow -= 1
+    return removed
+
+
+def _get_task(task_id: str) -> Optional[Dict]:
+    """读取任务当前状态的副本，任务不存在返回 None"""
+    with _tasks_lock:
+        status = tasks_status.get(task_id)
+        return dict(status) if status is not None else None
+
+
+def _task_snapshot(task_id: str) -> Dict:
+    """读取任务当前状态的副本，任务不存在时返回404"""
+    status = _get_task(task_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="任务不存在")
+    return status
+
+
+async def _task_event_stream(task_id: str):
+    """SSE：每次状态变化推送一帧，任务结束或记录被删除后关闭"""
+    last = None
+    while True:
+        # 先取 Event 再读状态，避免读取后、等待前发生的变化被漏掉
+        event = _task_events.get(task_id)
+        status = _get_task(task_id)
+        if status is None:
+            return
+        if status != last:
+            last = status
+            yield b"data: " + fast_json.dumps(status) + b"\n\n"
+            if status["status"] in FINISHED_STATUSES:
+                return
+        if event is None:
+            return
+        
+        try:
+            await asyncio.wait_for(event.wait(), timeout=SSE_KEEPALIVE_INTERVAL)
+        except asyncio.TimeoutError:
+            yield b": keepalive\n\n"
+
+
+def json_response(data: Any) -> Response:
+    """
+    直接序列化为 JSON 响应（orjson 可用时使用 orjson），跳过 FastAPI 的 jsonable_encoder 与 Pydantic 校验
     
-    if keywords_path.exists():
-        with open(keywords_path, 'r', encoding='utf-8') as f:
-            config["keywords"] = yaml.safe_load(f) or {}
+    只用于内容全是 JSON 原生类型的返回值：任务状态字典由本模块按 TaskStatus 的字段构造，
+    采集结果与报告数据由字符串、数字和列表/字典组成；路由上的 response_model 仍保留用于生成接口文档
+    """
+    return Response(content=fast_json.dumps(data), media_type="application/json")
+
+
+def _sentiment_stats(articles: List[Article]) -> Dict[str, int]:
+    """情感分布（三种情感始终列出，未做情感分析的文章不计入）"""
+    stats = Counter({"积极": 0, "消极": 0, "中立": 0})
+    stats.update(article.sentiment for article in articles if article.sentiment)
+    return dict(stats)
+
+
+def preview_articles(articles: List[Article], limit: int = 20) -> List[Dict]:
+    """前 limit 篇文章的预览信息（任务结果、/latest、/quick 与报告数据接口共用）"""
+    return [
+        {
+            "title": a.title,
+            "author": a.author,
+            "platform": a.platform,
+            "keyword": a.keyword,
+            "sentiment": a.sentiment,
+            "url": a.url,
+        }
+        for a in articles[:limit]
+    ]
+
+
+def load_config() -> Dict:
+    """加载配置（文件未修改时直接返回缓存的解析结果，调用方不要修改返回值）"""
+    config = {}
     
-    if platforms_path.exists():
-        with open(platforms_path, 'r', encoding='utf-8') as f:
-            config["platforms"] = yaml.safe_load(f) or {}
+    for key in ("keywords", "platforms"):
+        # load_yaml 内部已 stat 一次，文件不存在时直接捕获，不再单独检查 exists()
+        try:
+            config[key] = load_yaml(CONFIG_DIR / f"{key}.yaml") or {}
+        except FileNotFoundError:
+            pass
     
     return config
 
 
 def run_crawl_task(task_id: str, request: CrawlRequest):
-    """执行采集任务（后台线程）"""
-    global tasks_status
-    
+    """执行采集任务（在采集线程池中执行）"""
     try:
-        tasks_status[task_id]["status"] = "running"
-        tasks_status[task_id]["message"] = "正在初始化..."
+        _update_task(task_id, status="running", message="正在初始化...")
         
         config = load_config()
         keywords_config = config.get("keywords", {})
@@ -118,8 +281,7 @@ def run_crawl_task(task_id: str, request: CrawlRequest):
         # 获取关键词
         keywords = request.keywords or keywords_config.get("keywords", [])
         if not keywords:
-            tasks_status[task_id]["status"] = "failed"
-            tasks_status[task_id]["message"] = "未配置关键词"
+            _update_task(task_id, status="failed", message="未配置关键词")
             return
         
         search_config = keywords_config.get("search", {})
@@ -130,8 +292,7 @@ def run_crawl_task(task_id: str, request: CrawlRequest):
         
         # 采集微信公众号
         if "wechat" in request.platforms or "all" in request.platforms:
-            tasks_status[task_id]["message"] = "正在采集微信公众号..."
-            tasks_status[task_id]["progress"] = 10
+            _update_task(task_id, message="正在采集微信公众号...", progress=10)
             
             wechat_config = platforms_config.get("wechat", {})
             method = wechat_config.get("method", "sogou")
@@ -151,8 +312,7 @@ def run_crawl_task(task_id: str, request: CrawlRequest):
         
         # 采集小红书
         if "xhs" in request.platforms or "all" in request.platforms:
-            tasks_status[task_id]["message"] = "正在采集小红书..."
-            tasks_status[task_id]["progress"] = 40
+            _update_task(task_id, message="正在采集小红书...", progress=40)
             
             xhs_config = platforms_config.get("xiaohongshu", {})
             if xhs_config.get("enabled", True):
@@ -165,14 +325,14 @@ def run_crawl_task(task_id: str, request: CrawlRequest):
                 sort = xhs_config.get("sort", "time_descending")
                 filter_hours = xhs_config.get("filter_hours", 48)
                 
-                xhs_articles = crawler.search_multiple(
+                xhs_articles = crawler.search_many(
                     keywords, 
                     max_pages=2,
                 )
                 all_articles.extend(xhs_articles)
                 logger.info(f"小红书采集完成: {len(xhs_articles)} 条")
         
-        tasks_status[task_id]["progress"] = 60
+        _update_task(task_id, progress=60)
         
         # 时间过滤
         filter_hours = platforms_config.get("xiaohongshu", {}).get("filter_hours", 48)
@@ -182,7 +342,7 @@ def run_crawl_task(task_id: str, request: CrawlRequest):
         
         # 关键词过滤
         if request.filter_enabled:
-            tasks_status[task_id]["message"] = "正在过滤不相关内容..."
+            _update_task(task_id, message="正在过滤不相关内容...")
             relevance_filter = RelevanceFilter()
             all_articles = relevance_filter.filter_articles(all_articles)
         
@@ -190,54 +350,47 @@ def run_crawl_task(task_id: str, request: CrawlRequest):
         dedup = DedupProcessor()
         unique_articles = dedup.deduplicate(all_articles)
         
-        tasks_status[task_id]["progress"] = 70
+        _update_task(task_id, progress=70)
         
         # 情感分析
         if request.analyze_sentiment:
-            tasks_status[task_id]["message"] = "正在进行情感分析..."
+            _update_task(task_id, message="正在进行情感分析...")
             analyzer = SentimentAnalyzer()
             unique_articles = analyzer.analyze_articles(unique_articles)
         
-        tasks_status[task_id]["progress"] = 80
-        
-        # 保存到飞书
-        feishu_result = {"success": 0, "failed": 0, "skipped": 0}
-        if request.save_to_feishu:
-            tasks_status[task_id]["message"] = "正在保存到飞书..."
-            feishu = FeishuClient()
-            if feishu.is_configured():
-                feishu_result = feishu.add_new_articles(unique_articles)
+        _update_task(task_id, progress=80)
         
-        tasks_status[task_id]["progress"] = 90
+        # 保存到飞书与生成简报互不依赖：在辅助线程中保存的同时，在当前线程生成并发送简报
+        feishu = get_feishu_client()
+        save_to_feishu = request.save_to_feishu and feishu.is_configured()
+        if save_to_feishu and request.generate_briefing:
+            _update_task(task_id, message="正在保存到飞书并生成舆情简报...")
+        elif save_to_feishu:
+            _update_task(task_id, message="正在保存到飞书...")
+        elif request.generate_briefing:
+            _update_task(task_id, message="正在生成舆情简报...")
         
-        # 生成简报
-        briefing = None
-        if request.generate_briefing:
-            tasks_status[task_id]["message"] = "正在生成舆情简报..."
-            reporter = DailyReporter(use_llm=True)
-            briefing = reporter.generate_llm_briefing(unique_articles)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="feishu-save") as save_executor:
+            save_future = save_executor.submit(feishu.add_new_articles, unique_articles) if save_to_feishu else None
             
-            # 发送到飞书
-            feishu = FeishuClient()
-            if feishu.webhook_url and briefing:
-                full_report = reporter.generate_full_report(unique_articles)
-                feishu.send_webhook_message(full_report)
-        
-        # 统计结果
-        sentiment_stats = {"积极": 0, "消极": 0, "中立": 0}
-        for article in unique_articles:
-            if article.sentiment:
-                sentiment_stats[article.sentiment] = sentiment_stats.get(article.sentiment, 0) + 1
+            # 生成简报
+            briefing = None
+            if request.generate_briefing:
+                reporter = DailyReporter(use_llm=True)
+                briefing = reporter.generate_llm_briefing(unique_articles)
+                
+                # 发送到飞书
+                if feishu.webhook_url and briefing:
+                    full_report = reporter.generate_full_report(unique_articles)
+                    feishu.send_webhook_message(full_report)
+            
+            feishu_result = save_future.result() if save_future else {"success": 0, "failed": 0, "skipped": 0}
         
-        keyword_stats = {}
-        for article in unique_articles:
-            keyword_stats[article.keyword] = keyword_stats.get(article.keyword, 0) + 1
+        _update_task(task_id, progress=90)
         
-        # 完成
-        tasks_status[task_id]["status"] = "completed"
-        tasks_status[task_id]["progress"] = 100
-        tasks_status[task_id]["message"] = "采集完成"
-        tasks_status[task_id]["completed_at"] = datetime.now().isoformat()
+        # 统计结果
+        sentiment_stats = _sentiment_stats(unique_articles)
+        keyword_stats = dict(Counter(article.keyword for article in unique_articles))
         
         result_data = {
             "total_articles": len(unique_articles),
@@ -245,93 +398,133 @@ def run_crawl_task(task_id: str, request: CrawlRequest):
             "keyword_stats": keyword_stats,
             "feishu_result": feishu_result,
             "briefing": briefing[:500] if briefing else None,
-            "articles_preview": [
-                {
-                    "title": a.title,
-                    "author": a.author,
-                    "platform": a.platform,
-                    "keyword": a.keyword,
-                    "sentiment": a.sentiment,
-                    "url": a.url,
-                }
-                for a in unique_articles[:20]
-            ]
+            "articles_preview": preview_articles(unique_articles)
         }
-        tasks_status[task_id]["result"] = result_data
+        
+        # 采集完成时间只取一次，全局结果与任务状态中的时间一致
+        finished_at = datetime.now().isoformat()
         
         # 更新全局采集结果（供各页面共享）
-        global _latest_crawl_result
-        _latest_crawl_result = {
+        _publish_latest_result({
             "total": len(unique_articles),
-            "articles": result_data["articles_preview"],
             "sentiment_stats": sentiment_stats,
             "keyword_stats": keyword_stats,
             "feishu_result": feishu_result,
-            "crawled_at": datetime.now().isoformat(),
+            "crawled_at": finished_at,
             "task_id": task_id,
             "_article_objects": unique_articles,  # 存储原始Article对象供日报生成使用
-        }
+        })
+        
+        # 完成（状态与结果一次写入，查询到 completed 时结果必定已就绪）
+        _update_task(
+            task_id,
+            status="completed",
+            progress=100,
+            message="采集完成",
+            completed_at=finished_at,
+            result=result_data,
+        )
         
     except Exception as e:
         logger.error(f"采集任务失败: {e}")
-        tasks_status[task_id]["status"] = "failed"
-        tasks_status[task_id]["message"] = str(e)
+        _update_task(task_id, status="failed", message=str(e))
+    finally:
+        # 任务结束，关闭该线程内共享的浏览器（线程随后由线程池复用，执行其他任务时按需重新启动）
+        if "playwright" in sys.modules:
+            from crawlers._browser_pool import release_browsers
+            release_browsers()
+
+
+async def _run_crawl(task_id: str, request: CrawlRequest):
+    """在采集线程池中执行阻塞的采集流程"""
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(_crawl_executor, run_crawl_task, task_id, request)
+    finally:
+        _crawl_tasks.pop(task_id, None)
 
 
 @router.post("/start", response_model=TaskStatus)
 async def start_crawl(request: CrawlRequest, background_tasks: BackgroundTasks):
     """启动采集任务"""
-    task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    # 任务ID与创建时间取自同一时刻
+    now = datetime.now()
+    task_id = f"task_{now:%Y%m%d_%H%M%S}"
     
-    tasks_status[task_id] = {
+    status = {
         "task_id": task_id,
         "status": "pending",
         "progress": 0,
         "message": "任务已创建，等待执行",
         "result": None,
-        "created_at": datetime.now().isoformat(),
+        "created_at": now.isoformat(),
         "completed_at": None,
     }
+    global _event_loop
+    _event_loop = asyncio.get_running_loop()
+    with _tasks_lock:
+        removed = _prune_tasks(now)
+        tasks_status[task_id] = status
+        response = dict(status)
+    _remove_task_events(removed)
+    _task_events[task_id] = asyncio.Event()
     
-    # 在后台线程执行
-    thread = Thread(target=run_crawl_task, args=(task_id, request))
-    thread.start()
+    # 提交到采集线程池，任务句柄保存下来供删除任务时取消
+    _crawl_tasks[task_id] = asyncio.create_task(_run_crawl(task_id, request))
     
-    return TaskStatus(**tasks_status[task_id])
+    return json_response(response)
 
 
 @router.get("/status/{task_id}", response_model=TaskStatus)
 async def get_task_status(task_id: str):
     """获取任务状态"""
-    if task_id not in tasks_status:
-        raise HTTPException(status_code=404, detail="任务不存在")
-    
-    return TaskStatus(**tasks_status[task_id])
+    return json_response(_task_snapshot(task_id))
+
+
+@router.get("/stream/{task_id}")
+async def stream_task_status(task_id: str):
+    """订阅任务状态（SSE，状态变化时推送 TaskStatus，任务结束后关闭）"""
+    _task_snapshot(task_id)
+    return StreamingResponse(
+        _task_event_stream(task_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 @router.get("/tasks", response_model=List[TaskStatus])
 async def list_tasks():
     """列出所有任务"""
-    return [TaskStatus(**status) for status in tasks_status.values()]
+    with _tasks_lock:
+        statuses = [dict(status) for status in tasks_status.values()]
+    return json_response(statuses)
 
 
 @router.delete("/tasks/{task_id}")
 async def delete_task(task_id: str):
-    """删除任务记录"""
-    if task_id not in tasks_status:
-        raise HTTPException(status_code=404, detail="任务不存在")
+    """删除任务记录（仍在排队的任务会被取消，已开始执行的线程无法中断）"""
+    with _tasks_lock:
+        if tasks_status.pop(task_id, None) is None:
+            raise HTTPException(status_code=404, detail="任务不存在")
     
-    del tasks_status[task_id]
+    _remove_task_events([task_id])
+    task = _crawl_tasks.pop(task_id, None)
+    if task is not None:
+        task.cancel()
     return {"status": "success", "message": "任务已删除"}
 
 
+def _quick_search_wechat(keywords: List[str]) -> List[Article]:
+    """快速采集微信公众号（每个关键词只搜1页）"""
+    crawler = SogouWechatCrawler(request_delay=2)
+    return crawler.search_multiple(keywords, max_pages=1)
+
+
 @router.post("/quick")
 async def quick_crawl(platforms: List[str] = ["wechat"]):
     """
     快速采集（同步执行，适合少量数据）
     """
-    global _latest_crawl_result
-    
     config = load_config()
     keywords_config = config.get("keywords", {})
     keywords = keywords_config.get("keywords", [])[:2]  # 只用前2个关键词
@@ -342,9 +535,8 @@ async def quick_crawl(platforms: List[str] = ["wechat"]):
     articles = []
     
     if "wechat" in platforms:
-        crawler = SogouWechatCrawler(request_delay=2)
-        for kw in keywords:
-            articles.extend(crawler.search(kw, max_pages=1))
+        # 初始化与搜索都是阻塞的网络请求，放到线程中执行；关键词由 search_multiple 并发搜索
+        articles.extend(await asyncio.to_thread(_quick_search_wechat, keywords))
     
     # 去重
     dedup = DedupProcessor()
@@ -355,37 +547,21 @@ async def quick_crawl(platforms: List[str] = ["wechat"]):
     unique = analyzer.analyze_articles(unique)
     
     # 统计
-    sentiment_stats = {"积极": 0, "消极": 0, "中立": 0}
-    for article in unique:
-        if article.sentiment:
-            sentiment_stats[article.sentiment] = sentiment_stats.get(article.sentiment, 0) + 1
-    
-    articles_data = [
-        {
-            "title": a.title,
-            "author": a.author,
-            "platform": a.platform,
-            "keyword": a.keyword,
-            "sentiment": a.sentiment,
-            "url": a.url,
-        }
-        for a in unique[:20]
-    ]
+    sentiment_stats = _sentiment_stats(unique)
     
     # 更新全局结果
-    _latest_crawl_result = {
+    await asyncio.to_thread(_publish_latest_result, {
         "total": len(unique),
-        "articles": articles_data,
         "sentiment_stats": sentiment_stats,
         "keyword_stats": {},
         "crawled_at": datetime.now().isoformat(),
         "task_id": None,
         "_article_objects": unique,
-    }
+    })
     
     return {
         "total": len(unique),
-        "articles": articles_data[:10],
+        "articles": preview_articles(unique, limit=10),
         "sentiment_stats": sentiment_stats,
     }
 
@@ -393,14 +569,15 @@ async def quick_crawl(platforms: List[str] = ["wechat"]):
 @router.get("/latest")
 async def get_latest_crawl():
     """获取最近一次采集结果（供首页和日报页面使用）"""
-    if _latest_crawl_result["total"] == 0:
-        return {"total": 0, "articles": [], "sentiment_stats": {}, "crawled_at": None}
+    result = get_latest_crawl_result()
+    if result["total"] == 0:
+        return json_response({"total": 0, "articles": [], "sentiment_stats": {}, "crawled_at": None})
     
-    return {
-        "total": _latest_crawl_result["total"],
-        "articles": _latest_crawl_result["articles"],
-        "sentiment_stats": _latest_crawl_result["sentiment_stats"],
-        "keyword_stats": _latest_crawl_result.get("keyword_stats", {}),
-        "crawled_at": _latest_crawl_result["crawled_at"],
-        "task_id": _latest_crawl_result.get("task_id"),
-    }
+    return json_response({
+        "total": result["total"],
+        "articles": preview_articles(result.get("_article_objects", [])),
+        "sentiment_stats": result["sentiment_stats"],
+        "keyword_stats": result.get("keyword_stats", {}),
+        "crawled_at": result["crawled_at"],
+        "task_id": result.get("task_id"),
+    })
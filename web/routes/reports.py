@@ -17,9 +17,9 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from crawlers import Article
 from reporters.daily_report import DailyReporter
-from utils.llm_client import LLMClient
-from storage.feishu_client import FeishuClient
-from web.routes.crawl import get_latest_articles, _latest_crawl_result
+from utils.llm_client import get_llm_client
+from storage.feishu_client import get_feishu_client
+from web.routes.crawl import get_latest_crawl_result, json_response, preview_articles
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -34,8 +34,9 @@ class ReportResponse(BaseModel):
 
 def _get_articles_and_stats() -> tuple:
     """获取最近采集的文章和统计数据"""
-    articles = get_latest_articles()
-    crawl_result = _latest_crawl_result
+    # 文章与统计取自同一份采集结果
+    crawl_result = get_latest_crawl_result()
+    articles = crawl_result.get("_article_objects", [])
     
     stats = {
         "total": crawl_result.get("total", 0),
@@ -53,28 +54,18 @@ async def get_report_data():
     articles, stats = _get_articles_and_stats()
     
     if not articles:
-        return {
+        return json_response({
             "has_data": False,
             "message": "暂无采集数据，请先在采集任务页面执行采集。",
             "stats": {"total": 0},
             "articles": [],
-        }
+        })
     
-    return {
+    return json_response({
         "has_data": True,
         "stats": stats,
-        "articles": [
-            {
-                "title": a.title,
-                "author": a.author,
-                "platform": a.platform,
-                "keyword": a.keyword,
-                "sentiment": a.sentiment,
-                "url": a.url,
-            }
-            for a in articles[:20]
-        ],
-    }
+        "articles": preview_articles(articles),
+    })
 
 
 @router.post("/generate")
@@ -131,7 +122,7 @@ async def generate_briefing():
         }
     
     try:
-        llm = LLMClient()
+        llm = get_llm_client()
         
         if not llm.is_configured():
             raise HTTPException(
@@ -169,7 +160,7 @@ async def send_report_to_feishu(report_content: str = None):
     articles, stats = _get_articles_and_stats()
     
     try:
-        feishu = FeishuClient()
+        feishu = get_feishu_client()
         
         if not feishu.webhook_url:
             raise HTTPException(